@@ -0,0 +1,117 @@
+"""
+Benchmark the authentication path: authenticated-request throughput and event-loop stalls during logins.
+
+Usage:
+    python benchmarks/auth_throughput.py [--requests 5000] [--concurrency 50] [--logins 20]
+
+Requests go through the real auth dependencies over an in-process ASGI transport. "before"
+disables the verified-token cache and checks passwords on the event loop, as the service did
+previously; "after" uses the token cache and the bcrypt worker pool. Event-loop lag is how late
+a 5 ms timer fires while logins are in flight, i.e. how long every other request is stalled.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.security import OAuth2PasswordRequestForm
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from auth import auth_router, get_current_active_user  # noqa: E402
+from auth import utils as auth_utils  # noqa: E402
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/protected")
+    async def protected(user=Depends(get_current_active_user)):
+        return {"username": user.username}
+
+    @app.post("/login-blocking")
+    async def login_blocking(form_data: OAuth2PasswordRequestForm = Depends()):
+        # Previous behaviour: bcrypt on the event loop
+        user = auth_utils.get_user(form_data.username)
+        return {"ok": bool(user and auth_utils.verify_password(form_data.password, user.hashed_password))}
+
+    return app
+
+async def throughput(client: httpx.AsyncClient, token: str, total: int, concurrency: int) -> float:
+    """Return authenticated requests per second against /protected."""
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get("/protected", headers=headers)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+async def loop_lag_during_logins(client: httpx.AsyncClient, login_path: str, logins: int) -> dict:
+    """Fire concurrent logins and measure how late a 5 ms ticker on the same event loop wakes up."""
+    form = {"username": "testuser", "password": "testpass"}
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append((time.perf_counter() - start - 0.005) * 1e3)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(client.post(login_path, data=form) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return {
+        "logins_per_s": logins / elapsed,
+        "lag_p50_ms": statistics.median(lags),
+        "lag_max_ms": max(lags),
+    }
+
+async def run(args) -> None:
+    app = build_app()
+    token = auth_utils.create_access_token({"sub": "testuser"})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/ping")
+
+        rows = []
+        for label, ttl, login_path in (("before", 0.0, "/login-blocking"), ("after", 60.0, "/auth/token")):
+            auth_utils.token_cache.clear()
+            auth_utils.token_cache.ttl_seconds = ttl
+            await throughput(client, token, args.concurrency, args.concurrency)  # warm-up
+            rps = await throughput(client, token, args.requests, args.concurrency)
+            stalls = await loop_lag_during_logins(client, login_path, args.logins)
+            rows.append((label, rps, stalls))
+
+    print(f"{'mode':<8} {'auth req/s':>11} {'logins/s':>9} {'loop lag p50 ms':>16} {'loop lag max ms':>16}")
+    for label, rps, stalls in rows:
+        print(
+            f"{label:<8} {rps:>11.0f} {stalls['logins_per_s']:>9.1f} "
+            f"{stalls['lag_p50_ms']:>16.2f} {stalls['lag_max_ms']:>16.2f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
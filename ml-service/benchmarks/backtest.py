@@ -0,0 +1,94 @@
+"""
+Backtest speed: per-window predict calls versus the vectorized engine, plus a walk-forward run.
+
+Usage:
+    python benchmarks/backtest.py [--periods 8760] [--loop-samples 200] [--folds 4] [--processes 2]
+
+A small model is trained on mock hourly candles, then every origin of the series is backtested.
+The per-window baseline (``BitcoinLSTMModel.predict`` once per origin and horizon) is timed on
+``--loop-samples`` origins and extrapolated to the whole series. ``--folds 0`` skips the
+walk-forward run.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config.constants import VALID_TIMEFRAMES  # noqa: E402
+from services.backtest import BacktestEngine  # noqa: E402
+from utils.test_data_generator import generate_mock_bitcoin_data  # noqa: E402
+
+SEQUENCE_LENGTH = 60
+
+def _print_metrics(label: str, metrics: dict) -> None:
+    print(f"\n{label}")
+    print(f"{'horizon':>8} {'count':>7} {'MAE':>10} {'RMSE':>10} {'MAPE %':>8} {'direction':>10}")
+    for horizon, row in metrics.items():
+        print(
+            f"{horizon:>8} {row['count']:>7} {row['mae']:>10.2f} {row['rmse']:>10.2f} "
+            f"{row['mape']:>8.2f} {row['directional_accuracy']:>10.3f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--periods", type=int, default=365 * 24, help="Hourly candles to backtest")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--loop-samples", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--folds", type=int, default=4, help="Walk-forward folds (0 to skip)")
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    from models.lstm_model import BitcoinLSTMModel
+
+    horizons = tuple(VALID_TIMEFRAMES.values())
+    prices = generate_mock_bitcoin_data(periods=args.periods)["close"].to_numpy()
+    model = BitcoinLSTMModel(SEQUENCE_LENGTH, horizons=horizons)
+    model.train(prices, epochs=args.epochs, streaming=True, verbose=0)
+
+    engine = BacktestEngine(batch_size=args.batch_size)
+    engine.run(model, prices[:SEQUENCE_LENGTH + max(horizons) + 10])  # warm-up
+    result = engine.run(model, prices)
+    n_origins = len(result.origins)
+
+    origins = np.linspace(SEQUENCE_LENGTH - 1, len(prices) - max(horizons) - 1, args.loop_samples).astype(int)
+    looped = np.empty((len(origins), len(horizons)))
+    start = time.perf_counter()
+    for i, origin in enumerate(origins):
+        history = prices[:origin + 1]
+        for j, horizon in enumerate(horizons):
+            looped[i, j] = model.predict(history, horizon)
+    loop_seconds = (time.perf_counter() - start) / len(origins) * n_origins
+    vectorized = result.predictions[origins - result.origins[0]]
+
+    print(f"{n_origins:,} origins x {len(horizons)} horizons")
+    print(f"per-window predict (extrapolated): {loop_seconds:>10.1f} s")
+    print(f"vectorized engine:                 {result.elapsed_seconds:>10.2f} s "
+          f"({n_origins / result.elapsed_seconds:,.0f} origins/s, {loop_seconds / result.elapsed_seconds:,.0f}x)")
+    print(f"max relative difference on sampled origins: {np.max(np.abs(vectorized / looped - 1)):.2e}")
+    _print_metrics("fixed model, all origins", result.metrics())
+
+    if args.folds:
+        # The first half of the series trains the first model; the rest is split into --folds folds
+        train_periods = len(prices) // 2
+        retrain_every = -(-(len(prices) - max(horizons) - train_periods + 1) // args.folds)
+        walk = BacktestEngine(batch_size=args.batch_size, processes=args.processes).walk_forward(
+            prices,
+            train_periods=train_periods,
+            retrain_every=retrain_every,
+            sequence_length=SEQUENCE_LENGTH,
+            horizons=horizons,
+            epochs=args.epochs,
+        )
+        print(f"\nwalk-forward: {len(walk.folds)} folds on {args.processes} processes in {walk.elapsed_seconds:.1f} s")
+        for fold in walk.folds:
+            print(f"  fold {fold.index}: train {fold.train_start}-{fold.train_stop}, "
+                  f"test {fold.test_start}-{fold.test_stop}, {fold.elapsed_seconds:.1f} s")
+        _print_metrics("walk-forward, all folds", walk.metrics())
+
+if __name__ == "__main__":
+    main()
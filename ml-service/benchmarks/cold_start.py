@@ -0,0 +1,125 @@
+"""
+Measure cold-start cost: module import times and server boot-to-live/boot-to-ready latency.
+
+Usage:
+    python benchmarks/cold_start.py [--repeat 5] [--skip-boot] [--max-import-ms 1500] [--json]
+
+Each import is timed in a fresh interpreter. The boot measurement starts uvicorn and polls
+``/health`` (process is live) and ``/ready`` (model loaded and pipeline warm). With
+``--max-import-ms`` the script exits non-zero when importing the app exceeds the budget, so it
+can guard against heavy dependencies creeping back into the import path.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC_DIR = os.path.join(SERVICE_DIR, "src")
+
+MODULES = ("src.main", "services.prediction_service", "tensorflow", "pandas_ta", "nltk")
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    env.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    return env
+
+def import_time_ms(module: str) -> float:
+    """Import ``module`` in a fresh interpreter and return the wall time in milliseconds."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - start) * 1e3)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SERVICE_DIR, env=_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_for(url: str, process: subprocess.Popen, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before {url} answered")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return time.monotonic()
+        except urllib.error.HTTPError as e:
+            body = json.loads(e.read() or b"{}")
+            if body.get("status") == "failed":
+                raise RuntimeError(f"Service warm-up failed: {body.get('error')}")
+            time.sleep(0.05)
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.05)
+    raise TimeoutError(f"{url} did not answer 200 in time")
+
+def boot_times(timeout: float) -> dict:
+    """Start the app under uvicorn and time how long it takes to become live and ready."""
+    port = _free_port()
+    start = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        live = _wait_for(f"http://127.0.0.1:{port}/health", process, deadline)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", process, deadline)
+        return {"live_ms": (live - start) * 1e3, "ready_ms": (ready - start) * 1e3}
+    finally:
+        process.terminate()
+        process.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--skip-boot", action="store_true", help="Only measure import times")
+    parser.add_argument("--boot-timeout", type=float, default=300.0)
+    parser.add_argument("--max-import-ms", type=float, help="Fail if importing src.main takes longer")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {"imports_ms": {}}
+    for module in MODULES:
+        try:
+            samples = [import_time_ms(module) for _ in range(args.repeat)]
+            results["imports_ms"][module] = statistics.median(samples)
+        except RuntimeError as e:
+            results["imports_ms"][module] = None
+            print(f"could not import {module}: {e}", file=sys.stderr)
+    if not args.skip_boot:
+        results["boot"] = boot_times(args.boot_timeout)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<30} {'import ms (median)':>18}")
+        for module, elapsed in results["imports_ms"].items():
+            print(f"{module:<30} {elapsed if elapsed is None else round(elapsed, 1)!s:>18}")
+        if "boot" in results:
+            print(f"\nboot to /health: {results['boot']['live_ms']:.0f} ms")
+            print(f"boot to /ready:  {results['boot']['ready_ms']:.0f} ms")
+
+    app_import = results["imports_ms"].get("src.main")
+    if args.max_import_ms is not None and (app_import is None or app_import > args.max_import_ms):
+        print(f"src.main import exceeds the {args.max_import_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
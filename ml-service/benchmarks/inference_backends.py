@@ -0,0 +1,110 @@
+"""
+Compare Keras and TFLite inference backends: accuracy drift, latency and peak memory.
+
+Usage:
+    python benchmarks/inference_backends.py [--model PATH] [--quantization none int8 float16] [--calls 200]
+
+Without --model a small model is trained on mock data first. Peak RSS is measured in a fresh
+process per backend; the TFLite figure only excludes TensorFlow when the standalone
+``tflite_runtime`` package is installed.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+HORIZONS = (24, 168, 720)
+SEQUENCE_LENGTH = 60
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _latency_ms(forward, X: np.ndarray, calls: int) -> float:
+    forward(X)  # warm-up
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        forward(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e3)
+
+def _serve(backend: str, path: str, X: np.ndarray, calls: int, results) -> None:
+    """Child process: load one backend only and report its latency and peak RSS."""
+    sys.path.insert(0, SRC_DIR)
+    if backend == "keras":
+        import tensorflow as tf
+
+        model = tf.keras.models.load_model(path)
+        forward = lambda batch: model(batch, training=False).numpy()
+    else:
+        from models.tflite_runtime import TFLiteBackend
+
+        forward = TFLiteBackend(path)
+
+    results.put({
+        "latency_b1_ms": _latency_ms(forward, X[:1], calls),
+        "latency_b32_ms": _latency_ms(forward, X[:32], max(calls // 10, 1)),
+        "peak_rss_mb": _peak_rss_mb(),
+    })
+
+def _measure_in_child(backend: str, path: str, X: np.ndarray, calls: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_serve, args=(backend, path, X, calls, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", help="Saved Keras model to benchmark (trained on mock data if omitted)")
+    parser.add_argument("--quantization", nargs="+", default=["none", "int8", "float16"])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    from models.lstm_model import BitcoinLSTMModel
+    from utils.test_data_generator import generate_mock_bitcoin_data
+
+    prices = generate_mock_bitcoin_data(periods=3000)["close"].values
+    model = BitcoinLSTMModel(sequence_length=SEQUENCE_LENGTH, horizons=HORIZONS)
+    workdir = tempfile.mkdtemp(prefix="inference-backends-")
+    keras_path = args.model or os.path.join(workdir, "lstm_model")
+    if args.model:
+        model.load_model(args.model)
+        model.scaler.fit(prices.reshape(-1, 1))
+    else:
+        model.train(prices, epochs=2, streaming=True)
+        model.save_model(keras_path)
+
+    X = np.ascontiguousarray(model.representative_windows(prices, count=100), dtype=np.float32)
+
+    rows = [("keras", "-", None, _measure_in_child("keras", keras_path, X, args.calls))]
+    for mode in args.quantization:
+        quantization = None if mode == "none" else mode
+        tflite_path = os.path.join(workdir, f"lstm_{mode}.tflite")
+        size = model.export_tflite(tflite_path, quantization=quantization, representative_data=prices)
+        model.load_tflite(tflite_path)
+        drift = model.check_drift(prices)
+        model.runtime = None
+        rows.append((f"tflite/{mode}", f"{size / 1024:.0f} KiB", drift, _measure_in_child("tflite", tflite_path, X, args.calls)))
+
+    print(f"{'backend':<16} {'size':>9} {'max rel drift':>14} {'b=1 ms':>9} {'b=32 ms':>9} {'peak RSS MB':>12}")
+    for name, size, drift, stats in rows:
+        drift_label = f"{drift['max_rel_error']:.2e}" if drift else "-"
+        print(
+            f"{name:<16} {size:>9} {drift_label:>14} {stats['latency_b1_ms']:>9.3f} "
+            f"{stats['latency_b32_ms']:>9.3f} {stats['peak_rss_mb']:>12.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
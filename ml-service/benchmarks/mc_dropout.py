@@ -0,0 +1,58 @@
+"""
+Monte Carlo dropout cost: N sequential stochastic passes versus one replicated batch.
+
+Usage:
+    python benchmarks/mc_dropout.py [--samples 8 32 128] [--windows 1 16] [--repeat 5]
+
+Uses an untrained model (timings do not depend on the weights). The batched figure is
+``BitcoinLSTMModel.predict_with_uncertainty``, which also includes the deterministic pass.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config.constants import VALID_TIMEFRAMES  # noqa: E402
+from models.lstm_model import BitcoinLSTMModel  # noqa: E402
+
+SEQUENCE_LENGTH = 60
+
+def _best_ms(fn, repeat: int) -> float:
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", nargs="+", type=int, default=[8, 32, 128])
+    parser.add_argument("--windows", nargs="+", type=int, default=[1, 16])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    model = BitcoinLSTMModel(SEQUENCE_LENGTH, horizons=VALID_TIMEFRAMES.values())
+    model.build_model((SEQUENCE_LENGTH, 1))
+    model.scaler.fit(np.array([[20000.0], [80000.0]]))
+
+    print(f"{'windows':>8} {'samples':>8} {'sequential ms':>14} {'batched ms':>11} {'speedup':>8}")
+    for n_windows in args.windows:
+        X = np.random.uniform(0, 1, (n_windows, SEQUENCE_LENGTH, 1)).astype(np.float32)
+        for samples in args.samples:
+            def sequential():
+                draws = [model.model(X, training=True).numpy() for _ in range(samples)]
+                return model.predict_batch(X), np.stack(draws, axis=1)
+
+            sequential_ms = _best_ms(sequential, args.repeat)
+            batched_ms = _best_ms(lambda: model.predict_with_uncertainty(X, samples=samples), args.repeat)
+            print(f"{n_windows:>8} {samples:>8} {sequential_ms:>14.1f} {batched_ms:>11.1f} "
+                  f"{sequential_ms / batched_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the OHLCV store on years of 1-minute candles: ingestion, tail and range reads, memory.
+
+Usage:
+    python benchmarks/ohlcv_store.py [--years 3] [--dir PATH]
+
+Candles are ingested one day at a time, as a live feed would; reads report wall time and the
+process' peak RSS, which stays far below the size of the stored data thanks to memory mapping.
+"""
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.ohlcv_store import OHLCVStore  # noqa: E402
+
+MINUTES_PER_DAY = 24 * 60
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _minute_candles(start: pd.Timestamp, rows: int, start_price: float) -> pd.DataFrame:
+    close = start_price * np.exp(np.cumsum(np.random.normal(0, 0.0005, rows)))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start=start, periods=rows, freq="min"),
+        "open": open_,
+        "high": np.maximum(open_, close) * 1.0002,
+        "low": np.minimum(open_, close) * 0.9998,
+        "close": close,
+        "volume": np.abs(np.random.normal(10, 2, rows)),
+    })
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1e3:>10.2f} ms  rows={len(result)}")
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--dir", help="Store directory (a temporary one is used and removed by default)")
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="ohlcv-store-")
+    store = OHLCVStore(root)
+    days = int(args.years * 365)
+
+    start = time.perf_counter()
+    day_start, price = pd.Timestamp("2021-01-01"), 30000.0
+    for _ in range(days):
+        candles = _minute_candles(day_start, MINUTES_PER_DAY, price)
+        store.append(candles)
+        day_start += pd.Timedelta(days=1)
+        price = candles["close"].iloc[-1]
+    ingest_s = time.perf_counter() - start
+    total_rows = len(store)
+    size_mb = sum(
+        os.path.getsize(os.path.join(dirpath, name)) for dirpath, _, names in os.walk(root) for name in names
+    ) / 2**20
+    print(f"ingested {total_rows:,} candles ({size_mb:.0f} MiB) in {ingest_s:.1f}s "
+          f"({total_rows / ingest_s:,.0f} rows/s)")
+    rss_before = _peak_rss_mb()
+
+    last = store.last_timestamp()
+    _timed("tail(100)", lambda: store.tail(100))
+    _timed("tail(60 * 24 * 7)", lambda: store.tail(MINUTES_PER_DAY * 7))
+    _timed("read(last 30 days)", lambda: store.read(start=last - pd.Timedelta(days=30)))
+    _timed("read(one mid-range day)", lambda: store.read(
+        start=pd.Timestamp("2022-06-01"), end=pd.Timestamp("2022-06-02")
+    ))
+    _timed("read(last year, close only)", lambda: store.read(
+        start=last - pd.Timedelta(days=365), columns=["close"]
+    ))
+    print(f"peak RSS: {rss_before:.0f} MB after ingestion, {_peak_rss_mb():.0f} MB after reads")
+
+    if not args.dir:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""
+Benchmark every stage of the prediction pipeline and the end-to-end routes, offline.
+
+Usage:
+    python benchmarks/pipeline.py [--stages ...] [--rows 1000 ... 10000000] [--output results.json]
+                                  [--compare baseline.json] [--compact]
+
+Stages and what their size means:
+
+    market_data         rows    OHLCVStore.tail, as done by get_bitcoin_data
+    indicators          rows    TechnicalIndicators.calculate_indicators
+    sentiment           rows    scoring stub articles with a cold cache, then adding them to the frame
+    preprocess          rows    DataPreprocessor.scale_data + prepare_sequences (strided view)
+    preprocess_batches  rows    materializing every batch with DataPreprocessor.iter_sequence_batches
+    features            rows    store tail -> indicators -> sentiment -> scaled sequences, end to end
+    predict             windows BitcoinLSTMModel.scale_windows + predict_batch (untrained weights)
+    route_predict       clients GET /predictions/predict/<default timeframe>, warm caches
+    route_indicators    clients GET /predictions/indicators/current, warm caches
+    route_predict_cold  clients the same route with every service cache dropped before each request
+
+Candles come from ``generate_mock_bitcoin_data`` at 1-minute resolution and news from a stub, so
+no network is used. Every (stage, size) case runs in a fresh process, which isolates its peak RSS;
+peak allocation is traced with tracemalloc in one extra, untimed run (it does not see TensorFlow's
+own allocator). Results are written as JSON with the commit they were measured on, and
+``--compare`` prints the median latency change against an earlier results file.
+
+``--compact`` runs every stage the way ``PIPELINE_COMPACT=true`` runs the service: float32 columns
+from the store onwards, sentiment kept in ``DataFrame.attrs`` and scaling done in place. Compare
+the alloc/RSS columns of a ``features`` run with and without it to see the memory saved per stage.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC_DIR = os.path.join(SERVICE_DIR, "src")
+sys.path.insert(0, SRC_DIR)
+
+SEQUENCE_LENGTH = 60
+BATCH_SIZE = 1024
+FEATURE_COLUMNS = ["open", "high", "low", "volume"]
+
+ROW_STAGES = ("market_data", "indicators", "sentiment", "preprocess", "preprocess_batches", "features")
+ROUTE_STAGES = ("route_predict", "route_indicators", "route_predict_cold")
+STAGES = ROW_STAGES + ("predict",) + ROUTE_STAGES
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _dtype(args) -> Optional[np.dtype]:
+    return np.float32 if args.compact else None
+
+def _candles(rows: int, dtype: Optional[np.dtype] = None):
+    from utils.test_data_generator import generate_mock_bitcoin_data
+
+    # Minute candles keep 10M rows inside pandas' timestamp range
+    return generate_mock_bitcoin_data(
+        periods=rows, end_date=datetime(2024, 1, 1), freq="min", dtype=dtype or np.float64
+    )
+
+def _filled_store(rows: int, stack: contextlib.ExitStack, chunk_rows: int = 1_000_000):
+    """A temporary OHLCVStore holding ``rows`` minute candles, written in chunks to keep setup RSS low."""
+    from utils.ohlcv_store import OHLCVStore
+    from utils.test_data_generator import generate_mock_bitcoin_data
+
+    store = OHLCVStore(stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-ohlcv-")))
+    end, price = datetime(2024, 1, 1), 45000.0
+    for remaining in range(rows, 0, -chunk_rows):
+        periods = min(chunk_rows, remaining)
+        chunk = generate_mock_bitcoin_data(
+            periods=periods, start_price=price, end_date=end - (remaining - periods) * timedelta(minutes=1), freq="min"
+        )
+        store.append(chunk)
+        price = float(chunk["close"].iloc[-1])
+    return store
+
+def _stub_articles(count: int) -> List[Dict[str, Any]]:
+    """Mock articles with distinct texts, so none of them is answered by the sentiment cache."""
+    from utils.test_data_generator import generate_mock_news_data
+
+    articles = generate_mock_news_data(count)
+    for i, article in enumerate(articles):
+        article["description"] = f"Article {i} from {article['source']} on the Bitcoin market"
+        article["published_at"] = article["published_at"].isoformat()
+    return articles
+
+# Row and batch stages: each builds its input, then returns (prepare, run). prepare() makes a
+# fresh input for one run outside the timed region, run(state) is the measured operation.
+
+def _market_data_case(rows: int, args, stack: contextlib.ExitStack):
+    store = _filled_store(rows, stack)
+    return lambda: None, lambda _: store.tail(rows, dtype=_dtype(args))
+
+def _indicators_case(rows: int, args, stack: contextlib.ExitStack):
+    from utils.technical_indicators import TechnicalIndicators
+
+    # The first pandas_ta pass pays one-off import and registration costs
+    TechnicalIndicators.calculate_indicators(_candles(500))
+    df = _candles(rows, _dtype(args))
+    # calculate_indicators adds columns in place, as it does on the frame read from the store
+    return df.copy, lambda frame: TechnicalIndicators.calculate_indicators(frame, _dtype(args))
+
+def _sentiment_case(rows: int, args, stack: contextlib.ExitStack):
+    from utils.sentiment_analysis import NewsAnalyzer, SentimentCache
+
+    analyzer = NewsAnalyzer()
+    analyzer.cache = SentimentCache(path=None)
+    stack.callback(analyzer.close)
+    articles = _stub_articles(args.articles)
+    df = _candles(rows, _dtype(args))
+
+    def prepare():
+        analyzer.cache = SentimentCache(path=None)
+        return df.copy(), [dict(article) for article in articles]
+
+    def run(state):
+        frame, batch = state
+        sentiment = analyzer.get_aggregated_sentiment(analyzer.score_articles(batch))
+        _add_sentiment(frame, sentiment, args)
+
+    return prepare, run
+
+def _add_sentiment(frame, sentiment: Dict[str, float], args) -> None:
+    # Mirrors PredictionService.prepare_features
+    from config.constants import SENTIMENT_FEATURES
+
+    if args.compact:
+        frame.attrs["sentiment"] = {col: float(sentiment.get(col, 0.0)) for col in SENTIMENT_FEATURES}
+    else:
+        for col in SENTIMENT_FEATURES:
+            frame[f"sentiment_{col}"] = sentiment.get(col, 0.0)
+
+def _preprocess_case(rows: int, args, stack: contextlib.ExitStack):
+    from utils.data_preprocessor import DataPreprocessor
+
+    df = _candles(rows, _dtype(args)).drop(columns=["timestamp"])
+
+    def run(frame):
+        preprocessor = DataPreprocessor(_dtype(args))
+        scaled = preprocessor.scale_data(frame, copy=not args.compact)
+        return preprocessor.prepare_sequences(scaled, SEQUENCE_LENGTH, feature_columns=FEATURE_COLUMNS)
+
+    # In-place scaling needs a fresh frame per run
+    return (df.copy if args.compact else lambda: df), run
+
+def _preprocess_batches_case(rows: int, args, stack: contextlib.ExitStack):
+    from utils.data_preprocessor import DataPreprocessor
+
+    df = _candles(rows, _dtype(args)).drop(columns=["timestamp"])
+
+    def run(_):
+        for _ in DataPreprocessor(_dtype(args)).iter_sequence_batches(df, SEQUENCE_LENGTH, BATCH_SIZE, feature_columns=FEATURE_COLUMNS):
+            pass
+
+    return lambda: None, run
+
+def _features_case(rows: int, args, stack: contextlib.ExitStack):
+    from utils.data_preprocessor import DataPreprocessor
+    from utils.technical_indicators import TechnicalIndicators
+
+    TechnicalIndicators.calculate_indicators(_candles(500))
+    store = _filled_store(rows, stack)
+    sentiment = {"compound": 0.2, "positive": 0.3, "negative": 0.1, "neutral": 0.6}
+    dtype = _dtype(args)
+
+    def run(_):
+        df = TechnicalIndicators.calculate_indicators(store.tail(rows, dtype=dtype), dtype)
+        _add_sentiment(df, sentiment, args)
+        preprocessor = DataPreprocessor(dtype)
+        columns = [column for column in df.columns if column != "timestamp"]
+        scaled = preprocessor.scale_data(df, columns, copy=not args.compact)
+        return preprocessor.prepare_sequences(scaled, SEQUENCE_LENGTH, feature_columns=FEATURE_COLUMNS)
+
+    return lambda: None, run
+
+def _predict_case(batch_size: int, args, stack: contextlib.ExitStack):
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    from config.constants import VALID_TIMEFRAMES
+    from models.lstm_model import BitcoinLSTMModel
+
+    model = BitcoinLSTMModel(SEQUENCE_LENGTH, horizons=VALID_TIMEFRAMES.values())
+    model.build_model((SEQUENCE_LENGTH, 1))
+    prices = _candles(batch_size + SEQUENCE_LENGTH)["close"].to_numpy()
+    model.scaler.fit(prices.reshape(-1, 1))
+    windows = np.lib.stride_tricks.sliding_window_view(prices, SEQUENCE_LENGTH)[:batch_size]
+    model.predict_batch(model.scale_windows(windows))  # warm-up run, excluded from the timings
+    return lambda: None, lambda _: model.predict_batch(model.scale_windows(windows))
+
+CASES: Dict[str, Callable] = {
+    "market_data": _market_data_case,
+    "indicators": _indicators_case,
+    "sentiment": _sentiment_case,
+    "preprocess": _preprocess_case,
+    "preprocess_batches": _preprocess_batches_case,
+    "features": _features_case,
+    "predict": _predict_case,
+}
+
+def _measure(prepare: Callable[[], Any], run: Callable[[Any], Any], repeat: int, budget_seconds: float):
+    """Time ``run`` up to ``repeat`` times (at least once) within the budget, then trace one run."""
+    samples = []
+    deadline = time.perf_counter() + budget_seconds
+    while len(samples) < repeat and (not samples or time.perf_counter() < deadline):
+        state = prepare()
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+
+    state = prepare()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak / 2**20
+
+# Route stages: the real app served in-process over an ASGI transport, with stub news and an
+# untrained model published to a temporary registry.
+
+async def _stub_fetch_articles(self, days: int = 1) -> List[Dict[str, Any]]:
+    return _stub_articles(50)
+
+def _publish_untrained_model(registry_dir: str, work_dir: str) -> None:
+    from config.constants import VALID_TIMEFRAMES
+    from models.lstm_model import BitcoinLSTMModel
+    from models.registry import ModelRegistry
+
+    model = BitcoinLSTMModel(SEQUENCE_LENGTH, horizons=VALID_TIMEFRAMES.values())
+    model.build_model((SEQUENCE_LENGTH, 1))
+    model.scaler.fit(_candles(1000)["close"].to_numpy().reshape(-1, 1))
+    path = os.path.join(work_dir, "lstm_model")
+    model.save_model(path)
+    ModelRegistry(registry_dir).publish("benchmark", path)
+
+async def _route_samples(stage: str, concurrency: int, args, work_dir: str) -> Tuple[List[float], float]:
+    import httpx
+    from loguru import logger
+
+    sys.path.insert(0, SERVICE_DIR)
+    from src.main import app
+    from src.auth import utils as auth_utils
+    from src.routes.predictions import lifecycle
+    from config.constants import DEFAULT_PREDICTION_TIMEFRAME
+    from utils.news_client import AsyncNewsClient
+
+    # Per-request log lines would dominate the measurement
+    logger.remove()
+    AsyncNewsClient.fetch_articles = _stub_fetch_articles
+    _publish_untrained_model(os.environ["MODEL_REGISTRY_DIR"], work_dir)
+
+    lifecycle.start()
+    while lifecycle.state == "starting":
+        await asyncio.sleep(0.05)
+    if not lifecycle.ready:
+        raise RuntimeError(f"Service warm-up failed: {lifecycle.error}")
+    service = lifecycle.service
+
+    path = "/predictions/indicators/current" if stage == "route_indicators" else (
+        f"/predictions/predict/{DEFAULT_PREDICTION_TIMEFRAME}"
+    )
+    headers = {"Authorization": f"Bearer {auth_utils.create_access_token({'sub': 'testuser'})}"}
+    cold = stage == "route_predict_cold"
+    samples: List[float] = []
+    remaining = iter(range(args.requests))
+
+    async def client_loop(client: httpx.AsyncClient):
+        for _ in remaining:
+            if cold:
+                service.feature_cache.invalidate()
+                service.inference_cache.invalidate()
+                service.prediction_cache.invalidate()
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get(path, headers=headers)).raise_for_status()
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+    finally:
+        await lifecycle.shutdown()
+    return samples, elapsed
+
+def _run_route_case(stage: str, concurrency: int, args, stack: contextlib.ExitStack) -> Dict[str, Any]:
+    work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-service-"))
+    os.environ.update({
+        "MARKET_DATA_DIR": os.path.join(work_dir, "ohlcv"),
+        "MARKET_DATA_BOOTSTRAP_PERIODS": "2000",
+        "MODEL_REGISTRY_DIR": os.path.join(work_dir, "registry"),
+        "MODEL_WATCH_INTERVAL_SECONDS": "0",
+        "TRAINING_JOBS_DIR": os.path.join(work_dir, "jobs"),
+        "REDIS_HOST": "",
+        "NEWS_API_KEY": "benchmark",
+        "TF_CPP_MIN_LOG_LEVEL": "3",
+        "PIPELINE_COMPACT": "true" if args.compact else "false",
+    })
+    os.environ.pop("SENTIMENT_CACHE_PATH", None)
+    # The app writes its log file relative to the working directory
+    os.chdir(work_dir)
+
+    samples, elapsed = asyncio.run(_route_samples(stage, concurrency, args, work_dir))
+    return {"samples": samples, "throughput_per_s": len(samples) / elapsed, "peak_alloc_mb": None}
+
+def run_case(stage: str, size: int, args) -> Dict[str, Any]:
+    """Run one (stage, size) case; meant to be called in a fresh process."""
+    with contextlib.ExitStack() as stack:
+        if stage in ROUTE_STAGES:
+            result = _run_route_case(stage, size, args, stack)
+        else:
+            prepare, run = CASES[stage](size, args, stack)
+            samples, peak_alloc_mb = _measure(prepare, run, args.repeat, args.budget_seconds)
+            result = {
+                "samples": samples,
+                "throughput_per_s": size / float(np.median(samples)),
+                "peak_alloc_mb": peak_alloc_mb,
+            }
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+def _summarize(stage: str, size: int, unit: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    samples_ms = np.array(result.pop("samples")) * 1e3
+    return {
+        "stage": stage,
+        "size": size,
+        "unit": unit,
+        "runs": len(samples_ms),
+        "latency_ms": {
+            "mean": float(samples_ms.mean()),
+            "min": float(samples_ms.min()),
+            "p50": float(np.percentile(samples_ms, 50)),
+            "p90": float(np.percentile(samples_ms, 90)),
+            "p99": float(np.percentile(samples_ms, 99)),
+            "max": float(samples_ms.max()),
+        },
+        **result,
+    }
+
+def _cases(args) -> List[Tuple[str, int, str]]:
+    cases = []
+    for stage in args.stages:
+        if stage in ROW_STAGES:
+            cases += [(stage, rows, "rows") for rows in args.rows]
+        elif stage == "predict":
+            cases += [(stage, batch, "windows") for batch in args.batch_sizes]
+        elif stage == "route_predict_cold":
+            # Concurrent cold requests would share one computation; sequential requests measure it
+            cases.append((stage, 1, "clients"))
+        else:
+            cases += [(stage, clients, "clients") for clients in args.concurrency]
+    return cases
+
+def _git(*command: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *command], cwd=SERVICE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _environment() -> Dict[str, Any]:
+    versions = {}
+    for package in ("numpy", "pandas", "pandas_ta", "scikit-learn", "tensorflow", "fastapi"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    status = _git("status", "--porcelain")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+def _print_results(results: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'stage':<20} {'size':>10} {'unit':<8} {'runs':>5} {'p50 ms':>10} {'p90 ms':>10} "
+        f"{'p99 ms':>10} {'per s':>12} {'alloc MB':>9} {'RSS MB':>8}"
+    )
+    for row in results:
+        if "error" in row:
+            print(f"{row['stage']:<20} {row['size']:>10} {row['unit']:<8} failed: {row['error']}")
+            continue
+        latency = row["latency_ms"]
+        alloc = "-" if row["peak_alloc_mb"] is None else f"{row['peak_alloc_mb']:.1f}"
+        print(
+            f"{row['stage']:<20} {row['size']:>10} {row['unit']:<8} {row['runs']:>5} "
+            f"{latency['p50']:>10.2f} {latency['p90']:>10.2f} {latency['p99']:>10.2f} "
+            f"{row['throughput_per_s']:>12,.0f} {alloc:>9} {row['peak_rss_mb']:>8.0f}"
+        )
+
+def _print_comparison(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(row["stage"], row["size"]): row for row in baseline["results"] if "error" not in row}
+    commit = (baseline["environment"].get("commit") or "?")[:10]
+    print(f"\nmedian latency versus {baseline_path} ({commit}):")
+    for row in results:
+        before = previous.get((row["stage"], row["size"]))
+        if before is None or "error" in row:
+            continue
+        old, new = before["latency_ms"]["p50"], row["latency_ms"]["p50"]
+        print(f"{row['stage']:<20} {row['size']:>10} {old:>10.2f} -> {new:>10.2f} ms ({(new / old - 1) * 100:+.1f}%)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--rows", nargs="+", type=int, default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16, 64, 256])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route case")
+    parser.add_argument("--articles", type=int, default=100, help="Stub articles scored by the sentiment stage")
+    parser.add_argument("--repeat", type=int, default=20, help="Maximum timed runs per case")
+    parser.add_argument("--budget-seconds", type=float, default=10.0, help="Stop repeating a case after this long")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--compact", action="store_true", help="Run the float32 pipeline of PIPELINE_COMPACT=true")
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for stage, size, unit in _cases(args):
+        print(f"running {stage} ({size:,} {unit})...", file=sys.stderr)
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_case, stage, size, args).result()
+            results.append(_summarize(stage, size, unit, result))
+        except BrokenProcessPool:
+            results.append({"stage": stage, "size": size, "unit": unit, "error": "worker died (out of memory?)"})
+        except Exception as e:
+            results.append({"stage": stage, "size": size, "unit": unit, "error": str(e)})
+
+    _print_results(results)
+    if args.compare:
+        _print_comparison(results, args.compare)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": _environment(), "args": vars(args), "results": results}, f, indent=2)
+        print(f"\nresults written to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare the vectorized DataPreprocessor.prepare_sequences with the original per-window loop.
+
+Usage:
+    python benchmarks/prepare_sequences.py [--rows 10000 100000 1000000] [--loop-max-rows 100000]
+
+The original loop materializes an (n, L, features) float64 tensor, so it is skipped above
+``--loop-max-rows`` to keep the run within memory; pass a larger value to force it.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.data_preprocessor import DataPreprocessor  # noqa: E402
+from utils.test_data_generator import generate_mock_bitcoin_data  # noqa: E402
+
+SEQUENCE_LENGTH = 60
+BATCH_SIZE = 1024
+
+def loop_prepare_sequences(data: pd.DataFrame, sequence_length: int, feature_columns: List[str]):
+    """The original implementation, kept here as the baseline."""
+    X, y = [], []
+    for i in range(len(data) - sequence_length):
+        X.append(data.iloc[i : (i + sequence_length)][feature_columns].values)
+        y.append(data.iloc[i + sequence_length]["close"])
+    return np.array(X), np.array(y)
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run(rows: int, loop_max_rows: int) -> None:
+    df = generate_mock_bitcoin_data(periods=rows).drop(columns="timestamp")
+    feature_columns = [col for col in df.columns if col != "close"]
+    preprocessor = DataPreprocessor()
+
+    view_time = timed(lambda: preprocessor.prepare_sequences(df, SEQUENCE_LENGTH, feature_columns=feature_columns))
+
+    def consume_batches():
+        for X, _ in preprocessor.iter_sequence_batches(df, SEQUENCE_LENGTH, BATCH_SIZE, feature_columns=feature_columns):
+            X.sum()
+
+    batch_time = timed(consume_batches)
+
+    loop_time: Optional[float] = None
+    if rows <= loop_max_rows:
+        loop_time = timed(lambda: loop_prepare_sequences(df, SEQUENCE_LENGTH, feature_columns))
+
+    loop_label = f"{loop_time:10.3f} s" if loop_time is not None else "   skipped  "
+    speedup = f"{loop_time / view_time:10.0f}x" if loop_time is not None else ""
+    print(
+        f"{rows:>9,} rows | loop {loop_label} | view {view_time * 1e3:9.3f} ms "
+        f"| batched ({BATCH_SIZE}) {batch_time:8.3f} s | {speedup}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--loop-max-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.loop_max_rows)
+
+if __name__ == "__main__":
+    main()
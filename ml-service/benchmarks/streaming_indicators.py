@@ -0,0 +1,84 @@
+"""
+Parity check and per-tick cost of the streaming indicator engine versus pandas_ta.
+
+Usage:
+    python benchmarks/streaming_indicators.py [--periods 5000] [--ticks 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.constants import TECHNICAL_FEATURES  # noqa: E402
+from utils.streaming_indicators import StreamingIndicators  # noqa: E402
+from utils.test_data_generator import generate_mock_bitcoin_data  # noqa: E402
+
+def reference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the technical features with the pandas_ta functions the batch path relies on."""
+    close, volume = df["close"], df["volume"]
+    macd = ta.macd(close, fast=12, slow=26, signal=9)
+    bbands = ta.bbands(close, length=20)
+    out = pd.DataFrame(index=df.index)
+    out["rsi"] = ta.rsi(close, length=14)
+    out["MACD_12_26_9"] = macd["MACD_12_26_9"]
+    out["MACDs_12_26_9"] = macd["MACDs_12_26_9"]
+    out["MACDh_12_26_9"] = macd["MACDh_12_26_9"]
+    for length in (9, 21, 50, 200):
+        out[f"EMA_{length}"] = ta.ema(close, length=length)
+    out["bb_upper"] = bbands["BBU_20_2.0"]
+    out["bb_middle"] = bbands["BBM_20_2.0"]
+    out["bb_lower"] = bbands["BBL_20_2.0"]
+    out["OBV"] = ta.obv(close, volume)
+    out["MOM_10"] = ta.mom(close, length=10)
+    return out[TECHNICAL_FEATURES]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--periods", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=500)
+    args = parser.parse_args()
+
+    df = generate_mock_bitcoin_data(periods=args.periods + args.ticks)
+    history, ticks = df.iloc[: args.periods], df.iloc[args.periods :]
+
+    # Parity: stream every candle and compare against pandas_ta once warmed up
+    engine = StreamingIndicators()
+    streamed = engine.append(df)
+    reference = reference_indicators(df)
+    warm = slice(engine.warmup_periods, None)
+    errors = ((streamed.iloc[warm] - reference.iloc[warm]).abs() / reference.iloc[warm].abs().clip(lower=1e-9)).max()
+    print("max relative error per feature:")
+    for col, err in errors.items():
+        print(f"  {col:<15} {err:.2e}")
+    parity_ok = bool((errors < 1e-6).all())
+
+    # Per-tick cost: full batch recomputation versus one O(1) streaming update
+    batch_times = []
+    frame = history.copy()
+    for _, candle in ticks.iloc[:50].iterrows():
+        frame = pd.concat([frame, candle.to_frame().T], ignore_index=True)
+        start = time.perf_counter()
+        reference_indicators(frame.astype({"close": float, "volume": float}))
+        batch_times.append(time.perf_counter() - start)
+
+    engine = StreamingIndicators()
+    engine.seed(history)
+    stream_times = []
+    for close, volume in zip(ticks["close"].tolist(), ticks["volume"].tolist()):
+        start = time.perf_counter()
+        engine.update(close, volume)
+        stream_times.append(time.perf_counter() - start)
+
+    print(f"batch recompute per tick:  {np.median(batch_times) * 1e3:9.3f} ms (history={args.periods})")
+    print(f"streaming update per tick: {np.median(stream_times) * 1e3:9.3f} ms")
+    print("parity:", "OK" if parity_ok else "FAILED")
+    return 0 if parity_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,9 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -8,6 +12,8 @@ import os
 from dotenv import load_dotenv
 from loguru import logger
 
+from utils.metrics import track_stage
+
 from .models import TokenData, User, UserInDB
 
 # Load environment variables
@@ -18,8 +24,15 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "a-default-secret-key-for-development-o
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Password checks run bcrypt in a small dedicated pool (it releases the GIL) so logins never block the event loop
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+# Verified tokens are reused for at most this long, and never past their own expiry (0 disables)
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_hash_executor: Optional[ThreadPoolExecutor] = None
 
 # OAuth2 scheme for token handling
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
@@ -32,6 +45,54 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=AUTH_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _hash_executor
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the bcrypt worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), verify_password, plain_password, hashed_password)
+
+class TokenCache:
+    """LRU cache of verified access tokens, each entry expiring no later than its token."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[User]:
+        entry = self._entries.get(token)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, token: str, user: User, token_expires_at: Optional[float]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        self._entries[token] = (user, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+token_cache = TokenCache(TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_MAX_ENTRIES)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a new JWT access token."""
     to_encode = data.copy()
@@ -41,12 +102,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """Get the current user from the token."""
+    with track_stage("auth"):
+        return _user_from_token(token)
+
+def _user_from_token(token: str) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: Optional[str] = payload.get("sub")
@@ -59,6 +128,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     user = get_user(token_data.username)
     if not user:
         raise credentials_exception
+    token_cache.set(token, user, payload.get("exp"))
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -74,7 +144,8 @@ mock_users = {
         username="testuser",
         email="test@example.com",
         full_name="Test User",
-        hashed_password=get_password_hash("testpass"),
+        # Precomputed bcrypt hash of "testpass", so importing this module costs no hashing
+        hashed_password="$2b$12$q6RV.qeI/PPMx6vR/DecOeeYKLKzRe/yV93iVx5yx7SRf8pGiKGYu",
         is_active=True
     )
 }
@@ -83,10 +154,10 @@ def get_user(username: str) -> Optional[UserInDB]:
     """Get user from database (mock implementation)."""
     return mock_users.get(username)
 
-async def authenticate_user(db, username: str, password: str) -> Optional[User]:
+async def authenticate_user(username: str, password: str) -> Optional[User]:
     """Authenticate a user."""
     user = get_user(username)
-    if user and verify_password(password, user.hashed_password):
+    if user and await verify_password_async(password, user.hashed_password):
         return user
     return None
 
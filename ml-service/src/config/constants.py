@@ -14,15 +14,35 @@ TECHNICAL_FEATURES = [
 # Model related constants
 SEQUENCE_LENGTH = 60  # Number of time steps to use for LSTM input
 TRAIN_TEST_SPLIT = 0.8  # Ratio for train/test split
+# "full" trains new weights; "incremental" fine-tunes the active model on the candles it has not seen
+TRAINING_MODES = ["full", "incremental"]
+# Config sampling of the hyperparameter search; "halving" prunes a random sample by successive halving
+SEARCH_STRATEGIES = ["grid", "random", "halving"]
+
+# Confidence reported for predictions without a Monte Carlo dropout interval
+DEFAULT_CONFIDENCE = 0.8
 
 # API related constants
 DEFAULT_PREDICTION_TIMEFRAME = "24h"
+# Symbol the model is trained on and the single-asset routes serve
+DEFAULT_SYMBOL = "BTC"
 VALID_TIMEFRAMES = {
     "24h": 24,
     "7d": 168,
     "30d": 720
 }
 
+# Candle resolutions maintained by the resampler, in minutes (each divides the next)
+CANDLE_RESOLUTIONS = {
+    "1m": 1,
+    "5m": 5,
+    "1h": 60,
+    "4h": 240,
+    "1d": 1440
+}
+# Interval of the candles ingested into the market data store
+MARKET_DATA_RESOLUTION = "1h"
+
 # Technical indicators parameters
 TECHNICAL_INDICATORS_CONFIG = {
     "rsi": {"length": 14},
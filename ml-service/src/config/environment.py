@@ -5,6 +5,8 @@ import os
 from dotenv import load_dotenv, find_dotenv
 from loguru import logger
 
+from config.model_config import ModelConfig
+
 def load_environment():
     """Load environment variables from .env file."""
     env_path = find_dotenv()
@@ -30,8 +32,98 @@ def get_optional_env(key: str, default: str) -> str:
 
 # Model related environment variables
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "../models/saved/lstm_model")
+# Version label given to a model found at MODEL_PATH when it is imported into an empty registry
 MODEL_VERSION = get_optional_env("MODEL_VERSION", "v1.0.0")
 
+# Versioned model registry; the manifest is polled for a new current version (0 disables watching)
+MODEL_REGISTRY_DIR = get_optional_env("MODEL_REGISTRY_DIR", os.path.join(os.path.dirname(MODEL_PATH), "registry"))
+MODEL_REGISTRY_KEEP = int(get_optional_env("MODEL_REGISTRY_KEEP", "10"))
+MODEL_WATCH_INTERVAL_SECONDS = float(get_optional_env("MODEL_WATCH_INTERVAL_SECONDS", "30"))
+
+# Market data store: hourly OHLCV candles, seeded with BOOTSTRAP_PERIODS candles when empty
+MARKET_DATA_DIR = get_optional_env("MARKET_DATA_DIR", os.path.join(os.path.dirname(__file__), "../../data/ohlcv"))
+MARKET_DATA_BOOTSTRAP_PERIODS = int(get_optional_env("MARKET_DATA_BOOTSTRAP_PERIODS", str(2 * 365 * 24)))
+MARKET_DATA_WINDOW_PERIODS = int(get_optional_env("MARKET_DATA_WINDOW_PERIODS", "100"))
+# Symbols with market data (comma-separated); each one but the default is stored under MARKET_DATA_DIR/<symbol>
+MARKET_SYMBOLS = [
+    symbol.strip().upper() for symbol in get_optional_env("MARKET_SYMBOLS", "BTC").split(",") if symbol.strip()
+]
+PREDICTION_MAX_SYMBOLS = int(get_optional_env("PREDICTION_MAX_SYMBOLS", "50"))
+# Bars kept in memory per resolution (4h, 1d, ...) aggregated from the stored candles
+RESAMPLE_MAX_BARS = int(get_optional_env("RESAMPLE_MAX_BARS", "1000"))
+
+# Memory-lean pipeline: float32 candles and features, with the news sentiment kept in the
+# feature frame's attrs instead of as constant per-row columns
+PIPELINE_COMPACT = get_optional_env("PIPELINE_COMPACT", "false").lower() == "true"
+
+# Inference backend: "keras" or "tflite" (falls back to keras when no TFLite artifact exists).
+# The TFLite graph has no dropout, so Monte Carlo sampling (PREDICTION_MC_SAMPLES) still runs the
+# Keras model on samples x batch rows per uncached prediction; set it to 0 to serve from TFLite alone
+INFERENCE_BACKEND = get_optional_env("INFERENCE_BACKEND", "keras").lower()
+TFLITE_MODEL_PATH = get_optional_env("TFLITE_MODEL_PATH", MODEL_PATH + ".tflite")
+TFLITE_QUANTIZATION = get_optional_env("TFLITE_QUANTIZATION", "") or None  # "", "float16" or "int8"
+TFLITE_NUM_THREADS = int(get_optional_env("TFLITE_NUM_THREADS", "1"))
+TFLITE_MAX_REL_DRIFT = float(get_optional_env("TFLITE_MAX_REL_DRIFT", "0.01"))
+
+# Feature snapshot cache configuration
+FEATURE_CACHE_TTL_SECONDS = float(get_optional_env("FEATURE_CACHE_TTL_SECONDS", "300"))
+FEATURE_CACHE_MAX_ENTRIES = int(get_optional_env("FEATURE_CACHE_MAX_ENTRIES", "4"))
+
+# Inference micro-batching configuration
+INFERENCE_MAX_BATCH_SIZE = int(get_optional_env("INFERENCE_MAX_BATCH_SIZE", "64"))
+INFERENCE_MAX_WAIT_MS = float(get_optional_env("INFERENCE_MAX_WAIT_MS", "5"))
+
+# Monte Carlo dropout: stochastic samples per prediction (more is slower but steadier; 0 or 1
+# disables the prediction interval) and the coverage of the reported interval
+PREDICTION_MC_SAMPLES = max(0, int(get_optional_env("PREDICTION_MC_SAMPLES", "32")))
+PREDICTION_INTERVAL = float(get_optional_env("PREDICTION_INTERVAL", "0.9"))
+
+# Prediction streaming: how often the latest candle is checked, pending messages kept per
+# client before the oldest is dropped, and keep-alive interval of idle connections
+STREAM_POLL_INTERVAL_SECONDS = float(get_optional_env("STREAM_POLL_INTERVAL_SECONDS", "5"))
+STREAM_CLIENT_QUEUE_SIZE = int(get_optional_env("STREAM_CLIENT_QUEUE_SIZE", "8"))
+STREAM_HEARTBEAT_SECONDS = float(get_optional_env("STREAM_HEARTBEAT_SECONDS", "15"))
+
+# News sentiment refresh configuration
+NEWS_API_URL = get_optional_env("NEWS_API_URL", "https://newsapi.org/v2/everything")
+NEWS_REFRESH_INTERVAL_SECONDS = float(get_optional_env("NEWS_REFRESH_INTERVAL_SECONDS", "300"))
+NEWS_HTTP_TIMEOUT_SECONDS = float(get_optional_env("NEWS_HTTP_TIMEOUT_SECONDS", "5"))
+NEWS_MAX_RETRIES = int(get_optional_env("NEWS_MAX_RETRIES", "3"))
+NEWS_MAX_CONNECTIONS = int(get_optional_env("NEWS_MAX_CONNECTIONS", "10"))
+NEWS_BREAKER_FAILURE_THRESHOLD = int(get_optional_env("NEWS_BREAKER_FAILURE_THRESHOLD", "5"))
+NEWS_BREAKER_RESET_SECONDS = float(get_optional_env("NEWS_BREAKER_RESET_SECONDS", "60"))
+
+# Shared prediction cache (Redis when REDIS_HOST is set, in-process otherwise)
+REDIS_HOST = get_optional_env("REDIS_HOST", "")
+REDIS_PORT = int(get_optional_env("REDIS_PORT", "6379"))
+REDIS_PASSWORD = get_optional_env("REDIS_PASSWORD", "")
+REDIS_DB = int(get_optional_env("REDIS_DB", "0"))
+PREDICTION_CACHE_TTL_SECONDS = float(get_optional_env("PREDICTION_CACHE_TTL_SECONDS", "3600"))
+PREDICTION_LOCK_TIMEOUT_SECONDS = float(get_optional_env("PREDICTION_LOCK_TIMEOUT_SECONDS", "30"))
+PREDICTION_LOCK_WAIT_SECONDS = float(get_optional_env("PREDICTION_LOCK_WAIT_SECONDS", "10"))
+
+# Training pipeline configuration (a prefetch of -1 lets tf.data autotune it)
+TRAIN_STREAMING = get_optional_env("TRAIN_STREAMING", "true").lower() == "true"
+TRAIN_SHUFFLE_BUFFER = int(get_optional_env("TRAIN_SHUFFLE_BUFFER", "10000"))
+TRAIN_PREFETCH = int(get_optional_env("TRAIN_PREFETCH", "-1"))
+
+# Training jobs run in a separate worker process with their own CPU budget
+TRAINING_JOBS_DIR = get_optional_env("TRAINING_JOBS_DIR", os.path.join(os.path.dirname(MODEL_PATH), "jobs"))
+TRAIN_WORKER_THREADS = int(get_optional_env("TRAIN_WORKER_THREADS", "2"))
+TRAIN_WORKER_NICE = int(get_optional_env("TRAIN_WORKER_NICE", "10"))
+TRAIN_CANCEL_GRACE_SECONDS = float(get_optional_env("TRAIN_CANCEL_GRACE_SECONDS", "10"))
+TRAIN_DEFAULT_EPOCHS = int(get_optional_env("TRAIN_DEFAULT_EPOCHS", "50"))
+# Early stopping patience in epochs (0 disables) and validation split, defaulting to ModelConfig
+TRAIN_EARLY_STOPPING_PATIENCE = int(
+    get_optional_env("TRAIN_EARLY_STOPPING_PATIENCE", str(ModelConfig.EARLY_STOPPING_PATIENCE))
+)
+TRAIN_VALIDATION_SPLIT = float(get_optional_env("TRAIN_VALIDATION_SPLIT", str(ModelConfig.VALIDATION_SPLIT)))
+# Incremental fine-tuning: older windows replayed (as a fraction of the new ones) and its learning rate
+TRAIN_REPLAY_FRACTION = float(get_optional_env("TRAIN_REPLAY_FRACTION", "0.2"))
+TRAIN_FINE_TUNE_LEARNING_RATE = float(
+    get_optional_env("TRAIN_FINE_TUNE_LEARNING_RATE", str(ModelConfig.LEARNING_RATE / 10))
+)
+
 # Service configuration
 ML_SERVICE_HOST = get_optional_env("ML_SERVICE_HOST", "0.0.0.0")
 ML_SERVICE_PORT = int(get_optional_env("ML_SERVICE_PORT", "8001"))
@@ -1,14 +1,17 @@
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from dotenv import load_dotenv, find_dotenv
 import uvicorn
 import os
 import traceback
+from contextlib import asynccontextmanager
 from loguru import logger
 
 from .auth import auth_router, get_current_active_user
-from .routes.predictions import router as predictions_router
+from .routes.predictions import router as predictions_router, lifecycle
+from .routes.streaming import router as streaming_router
+from utils.metrics import MetricsRoute, latest_metrics
 
 # Load environment variables early
 env_path = find_dotenv()
@@ -20,11 +23,21 @@ else:
 # Ensure logs directory exists
 os.makedirs("logs", exist_ok=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start warming up the prediction service in the background and shut it down on exit."""
+    logger.info("🚀 ML Service is starting...")
+    lifecycle.start()
+    yield
+    logger.info("🛑 ML Service is shutting down...")
+    await lifecycle.shutdown()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Bitcoin Price Prediction ML Service",
     description="A machine learning service for predicting Bitcoin prices.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure logging with Loguru
@@ -40,20 +53,35 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["Authorization", "Content-Type"],
 )
+# Per-route latency histograms and in-flight gauges, exposed at /metrics
+app.router.route_class = MetricsRoute
 
 # Include routers
 app.include_router(auth_router)
 app.include_router(
     predictions_router,
-    prefix="/predictions",
     dependencies=[Depends(get_current_active_user)]
 )
+# Streaming routes authenticate themselves (browsers cannot set headers on EventSource/WebSocket)
+app.include_router(streaming_router)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until the prediction service has finished warming up."""
+    status = lifecycle.status()
+    return JSONResponse(status_code=200 if lifecycle.ready else 503, content=status)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    content, content_type = latest_metrics()
+    return Response(content=content, media_type=content_type)
+
 # Global Exception Handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -78,15 +106,6 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Graceful shutdown handling
-@app.on_event("startup")
-async def startup_event():
-    logger.info("🚀 ML Service is starting...")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("🛑 ML Service is shutting down...")
-
 # Run the FastAPI app
 if __name__ == "__main__":
     host = os.getenv("ML_SERVICE_HOST", "0.0.0.0")
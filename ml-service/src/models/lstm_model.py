@@ -1,46 +1,205 @@
+import json
+import os
+from dataclasses import replace
 import tensorflow as tf
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
 import pandas as pd
 
+from config.model_config import ModelConfig
+from models.tflite_runtime import TFLiteBackend, export_tflite, measure_drift
+from utils.data_preprocessor import DataPreprocessor
+
 class BitcoinLSTMModel:
-    def __init__(self, sequence_length=60):
-        self.sequence_length = sequence_length
+    def __init__(self, sequence_length=None, horizons=None, config=None):
+        # Architecture and training defaults; an explicit sequence_length overrides the config's
+        config = config or ModelConfig()
+        if sequence_length is not None:
+            config = replace(config, SEQUENCE_LENGTH=sequence_length)
+        self.config = config
+        self.sequence_length = config.SEQUENCE_LENGTH
+        # Steps ahead predicted by the output head; one output unit per horizon
+        self.horizons = tuple(sorted(horizons)) if horizons else (1,)
         self.model = None
+        # Optional TFLite interpreter used instead of the Keras forward pass
+        self.runtime = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
+        # Normalization of other symbols served by the same network; ``scaler`` is the training one
+        self.symbol_scalers = {}
+        # How the weights were last trained (mode, data end, wall time, ...), saved with the model
+        self.training_info = None
         
     def build_model(self, input_shape):
-        """Build and compile the LSTM model"""
+        """
+        Build and compile the LSTM model from ``config``
+        
+        The output layer has one unit per horizon, so ``config.DENSE_UNITS`` is not used.
+        """
+        units, dropout = self.config.LSTM_UNITS, self.config.DROPOUT_RATE
         self.model = tf.keras.Sequential([
-            tf.keras.layers.LSTM(50, return_sequences=True, input_shape=input_shape),
-            tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.LSTM(50, return_sequences=False),
-            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.LSTM(units, return_sequences=True, input_shape=input_shape),
+            tf.keras.layers.Dropout(dropout),
+            tf.keras.layers.LSTM(units, return_sequences=False),
+            tf.keras.layers.Dropout(dropout),
             tf.keras.layers.Dense(25),
-            tf.keras.layers.Dense(1)
+            tf.keras.layers.Dense(len(self.horizons))
         ])
         
         self.model.compile(
-            optimizer='adam',
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.LEARNING_RATE),
             loss='mean_squared_error',
             metrics=['mae']
         )
         
     def prepare_data(self, data):
         """Prepare data for LSTM model"""
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(data.reshape(-1, 1))
-        
-        # Create sequences
-        X, y = [], []
-        for i in range(len(scaled_data) - self.sequence_length):
-            X.append(scaled_data[i:(i + self.sequence_length)])
-            y.append(scaled_data[i + self.sequence_length])
-            
-        return np.array(X), np.array(y)
+        # Scale the data; Keras trains in float32, so the windows are built in float32 directly
+        scaled_data = self.scaler.fit_transform(np.asarray(data).reshape(-1, 1)).astype(np.float32, copy=False)
+        n_windows = self._num_windows(len(scaled_data))
+        if n_windows <= 0:
+            raise ValueError(
+                f"Need more than {self.sequence_length + max(self.horizons) - 1} data points to train"
+            )
+        
+        # Create sequences with one target per horizon, copying each window once
+        X = np.ascontiguousarray(DataPreprocessor.make_windows(scaled_data, self.sequence_length)[:n_windows])
+        targets = np.arange(n_windows)[:, None] + self.sequence_length - 1 + np.asarray(self.horizons)[None, :]
+        y = scaled_data[targets, 0]
+        return X, y
+    
+    def _num_windows(self, n_points):
+        """Number of (window, targets) samples a series of ``n_points`` yields"""
+        return n_points - self.sequence_length - max(self.horizons) + 1
     
-    def train(self, data, epochs=50, batch_size=32, validation_split=0.2):
-        """Train the LSTM model"""
+    def horizon_index(self, steps):
+        """
+        Return the output column holding the prediction ``steps`` ahead
+        
+        Single-output models answer every horizon with their only output.
+        """
+        return self.horizon_column(self.horizons, steps)
+    
+    @staticmethod
+    def horizon_column(horizons, steps):
+        """``horizon_index`` for the outputs of a model with the given horizons"""
+        horizons = tuple(horizons)
+        if steps in horizons:
+            return horizons.index(steps)
+        if len(horizons) == 1:
+            return 0
+        raise ValueError(f"Model does not predict {steps} steps ahead (horizons: {list(horizons)})")
+    
+    def make_dataset(self, data, batch_size=32, validation_split=0.2, shuffle_buffer=10_000,
+                     prefetch=tf.data.AUTOTUNE, num_parallel_calls=tf.data.AUTOTUNE):
+        """
+        Build streaming training/validation pipelines over a price series.
+
+        Windows are gathered, scaled, shuffled and batched on the fly from the raw series,
+        so memory is bounded by the batch size instead of the number of windows.
+
+        Returns:
+            Tuple of (train_dataset, validation_dataset); the latter is None without a split
+        """
+        series = np.asarray(data, dtype=np.float32).reshape(-1)
+        n_windows = self._num_windows(len(series))
+        if n_windows <= 0:
+            raise ValueError(
+                f"Need more than {self.sequence_length + max(self.horizons) - 1} data points to train"
+            )
+
+        # One pass over the series to fit the scaler; the windows themselves are never materialized
+        self.scaler.fit(series.reshape(-1, 1))
+        scale = np.float32(self.scaler.scale_[0])
+        offset = np.float32(self.scaler.min_[0])
+
+        series_tensor = tf.constant(series)
+        # Input window positions followed by one target position per horizon
+        window_offsets = tf.constant(
+            list(range(self.sequence_length)) + [self.sequence_length - 1 + h for h in self.horizons],
+            dtype=tf.int64,
+        )
+
+        def to_batch(starts):
+            windows = tf.gather(series_tensor, starts[:, None] + window_offsets[None, :]) * scale + offset
+            return windows[:, :self.sequence_length, None], windows[:, self.sequence_length:]
+
+        def build(start, stop, shuffle):
+            dataset = tf.data.Dataset.range(start, stop)
+            if shuffle:
+                dataset = dataset.shuffle(shuffle_buffer, reshuffle_each_iteration=True)
+            return (
+                dataset.batch(batch_size)
+                .map(to_batch, num_parallel_calls=num_parallel_calls)
+                .prefetch(prefetch)
+            )
+
+        # Like Keras' validation_split, hold out the last windows for validation
+        n_val = int(n_windows * validation_split)
+        n_train = n_windows - n_val
+        train_dataset = build(0, n_train, shuffle=True)
+        val_dataset = build(n_train, n_windows, shuffle=False) if n_val else None
+        return train_dataset, val_dataset
+
+    @staticmethod
+    def fit_callbacks(callbacks=None, patience=None, checkpoint_dir=None, validation=True):
+        """
+        Extend ``callbacks`` with early stopping and crash-resume checkpointing
+        
+        Args:
+            callbacks: Callbacks passed by the caller
+            patience: Epochs without improvement before stopping (None or 0 disables early stopping);
+                the best weights are restored when it stops
+            checkpoint_dir: Directory backing up the training state after every epoch; a fit
+                interrupted by a crash resumes from the last completed epoch when run again,
+                and the backup is removed once the fit finishes
+            validation: Whether the fit has validation data to monitor instead of the training loss
+        """
+        callbacks = list(callbacks or [])
+        if patience:
+            callbacks.append(tf.keras.callbacks.EarlyStopping(
+                monitor="val_loss" if validation else "loss",
+                patience=patience,
+                restore_best_weights=True,
+            ))
+        if checkpoint_dir:
+            callbacks.append(tf.keras.callbacks.BackupAndRestore(checkpoint_dir))
+        return callbacks
+
+    def train(self, data, epochs=50, batch_size=None, validation_split=None, streaming=False,
+              shuffle_buffer=10_000, prefetch=tf.data.AUTOTUNE, callbacks=None, verbose=1,
+              patience=None, checkpoint_dir=None):
+        """
+        Train the LSTM model
+
+        With ``streaming=True`` the model is fed from a tf.data pipeline (see ``make_dataset``)
+        instead of a fully materialized window tensor. ``callbacks`` and ``verbose`` are passed
+        on to ``fit``; ``patience`` and ``checkpoint_dir`` are described in ``fit_callbacks``.
+        ``batch_size`` and ``validation_split`` default to the config.
+        """
+        batch_size = batch_size or self.config.BATCH_SIZE
+        validation_split = self.config.VALIDATION_SPLIT if validation_split is None else validation_split
+        callbacks = self.fit_callbacks(callbacks, patience, checkpoint_dir, validation=validation_split > 0)
+        if streaming:
+            train_dataset, val_dataset = self.make_dataset(
+                data,
+                batch_size=batch_size,
+                validation_split=validation_split,
+                shuffle_buffer=shuffle_buffer,
+                prefetch=prefetch,
+                num_parallel_calls=prefetch,
+            )
+
+            if self.model is None:
+                self.build_model((self.sequence_length, 1))
+
+            return self.model.fit(
+                train_dataset,
+                validation_data=val_dataset,
+                epochs=epochs,
+                callbacks=callbacks,
+                verbose=verbose
+            )
+
         # Prepare training data
         X, y = self.prepare_data(data)
         
@@ -54,36 +213,301 @@ class BitcoinLSTMModel:
             epochs=epochs,
             batch_size=batch_size,
             validation_split=validation_split,
-            verbose=1
+            callbacks=callbacks,
+            verbose=verbose
         )
         
         return history
     
-    def predict(self, data):
-        """Make predictions using the trained model"""
+    def fine_tune(self, data, new_from, epochs=10, batch_size=None, validation_split=0.2, replay_fraction=0.2,
+                  learning_rate=None, callbacks=None, verbose=1, patience=None, checkpoint_dir=None, seed=None):
+        """
+        Continue training the current weights on the newest part of a price series
+        
+        Only windows whose targets reach into ``data[new_from:]`` are trained on, plus a random
+        replay sample of the older windows so the model does not forget the earlier regime. The
+        scaler is kept as it is, since the weights were learned in its units. The most recent new
+        windows are held out for validation.
+        
+        Args:
+            data: Price series ending with the new data
+            new_from: Index of the first point the model has not been trained on
+            replay_fraction: Older windows replayed, as a fraction of the new training windows
+            learning_rate: Optimizer learning rate for the fine-tuning (default: keep the current one)
+            seed: Seed of the replay sample
+            
+        Returns:
+            Tuple of (history, window counts keyed "new", "replay", "validation" and "total")
+            
+        Raises:
+            ValueError: If there is no model or no window with new data
+        """
         if self.model is None:
             raise ValueError("Model needs to be trained first")
         
-        # Scale the input data
-        scaled_data = self.scaler.transform(data.reshape(-1, 1))
+        batch_size = batch_size or self.config.BATCH_SIZE
+        scaled = self.scaler.transform(np.asarray(data).reshape(-1, 1)).astype(np.float32, copy=False)
+        n_windows = self._num_windows(len(scaled))
+        # Window i reads targets up to i + sequence_length - 1 + max(horizons)
+        first_new = max(0, new_from - self.sequence_length + 1 - max(self.horizons))
+        if n_windows <= 0 or first_new >= n_windows:
+            raise ValueError("No new data to fine-tune on")
         
-        # Prepare sequence for prediction
-        X = np.array([scaled_data[-self.sequence_length:]])
+        new_windows = np.arange(first_new, n_windows)
+        n_val = int(len(new_windows) * validation_split)
+        train_windows, val_windows = new_windows[:len(new_windows) - n_val], new_windows[len(new_windows) - n_val:]
+        n_replay = min(first_new, int(np.ceil(replay_fraction * len(train_windows))))
+        replay = np.random.default_rng(seed).choice(first_new, size=n_replay, replace=False)
+        
+        windows = DataPreprocessor.make_windows(scaled, self.sequence_length)
+        target_offsets = self.sequence_length - 1 + np.asarray(self.horizons)
+        def gather(indices):
+            return windows[indices], scaled[indices[:, None] + target_offsets[None, :], 0]
+        
+        if learning_rate is not None:
+            tf.keras.backend.set_value(self.model.optimizer.learning_rate, learning_rate)
+        history = self.model.fit(
+            *gather(np.concatenate([np.sort(replay), train_windows])),
+            validation_data=gather(val_windows) if n_val else None,
+            epochs=epochs,
+            batch_size=batch_size,
+            shuffle=True,
+            callbacks=self.fit_callbacks(callbacks, patience, checkpoint_dir, validation=n_val > 0),
+            verbose=verbose
+        )
+        counts = {"new": len(train_windows), "replay": n_replay, "validation": n_val, "total": n_windows}
+        return history, counts
+    
+    def prepare_input(self, data):
+        """Scale a price series and return its latest window, shaped (sequence_length, 1)"""
+        if len(data) < self.sequence_length:
+            raise ValueError(f"Need at least {self.sequence_length} data points to predict")
+        
+        scaled_data = self.scaler.transform(np.asarray(data).reshape(-1, 1))
+        return scaled_data[-self.sequence_length:]
+    
+    def scaler_for(self, symbol=None):
+        """Return the scaler of a symbol, or the training scaler for symbols without their own"""
+        return self.symbol_scalers.get(symbol, self.scaler)
+    
+    def fit_symbol_scaler(self, symbol, data):
+        """Fit the normalization of a symbol on its price history"""
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaler.fit(np.asarray(data, dtype=np.float64).reshape(-1, 1))
+        self.symbol_scalers[symbol] = scaler
+        return scaler
+    
+    def _row_transform(self, symbols):
+        """Per-row (scale, offset) of the MinMax transform, shaped to broadcast over (batch, ...)"""
+        scalers = [self.scaler_for(symbol) for symbol in symbols]
+        scale = np.array([scaler.scale_[0] for scaler in scalers])
+        offset = np.array([scaler.min_[0] for scaler in scalers])
+        return scale, offset
+    
+    def _inverse_rows(self, scaled, symbols=None):
+        """Map scaled outputs of shape (batch, ...) back to prices, row by row for ``symbols``"""
+        if symbols is None:
+            return self.scaler.inverse_transform(scaled.reshape(-1, 1)).reshape(scaled.shape)
+        scale, offset = self._row_transform(symbols)
+        shape = (-1,) + (1,) * (scaled.ndim - 1)
+        return (scaled - offset.reshape(shape)) / scale.reshape(shape)
+    
+    def scale_windows(self, windows, symbols=None):
+        """
+        Scale raw price windows of shape (batch, >= sequence_length) into model inputs
         
-        # Make prediction
-        scaled_prediction = self.model.predict(X)
+        Args:
+            windows: Raw price windows
+            symbols: Symbol of each window, to scale rows of different assets in one batch
+                (defaults to the training scaler for every row)
+        """
+        windows = np.asarray(windows, dtype=np.float64)[:, -self.sequence_length:]
+        if windows.shape[1] < self.sequence_length:
+            raise ValueError(f"Need at least {self.sequence_length} data points to predict")
         
-        # Inverse transform the prediction
-        prediction = self.scaler.inverse_transform(scaled_prediction)
+        if symbols is not None:
+            scale, offset = self._row_transform(symbols)
+            return (windows * scale[:, None] + offset[:, None])[:, :, None]
+        scaled = self.scaler.transform(windows.reshape(-1, 1))
+        return scaled.reshape(len(windows), self.sequence_length, 1)
+    
+    def predict_batch(self, X, symbols=None):
+        """
+        Run a single forward pass over a batch of scaled windows
         
-        return prediction[0][0]
+        Args:
+            X: Array of shape (batch, sequence_length, 1) as produced by ``prepare_input``
+            symbols: Symbol of each window, as passed to ``scale_windows``
+            
+        Returns:
+            Array of shape (batch, len(horizons)) with the predicted prices for every horizon
+        """
+        return self._inverse_rows(self._forward(X), symbols)
+    
+    def predict_with_uncertainty(self, X, samples=32, interval=0.9, symbols=None):
+        """
+        Predict a batch of scaled windows with Monte Carlo dropout intervals
+        
+        The ``samples`` stochastic passes are a single forward pass: every window is repeated
+        ``samples`` times along the batch axis and the network runs with its Dropout layers active.
+        
+        Args:
+            X: Array of shape (batch, sequence_length, 1) as produced by ``prepare_input``
+            samples: Dropout samples per window (fewer than 2 disables the estimate)
+            interval: Coverage of the returned prediction interval
+            symbols: Symbol of each window, as passed to ``scale_windows``
+            
+        Returns:
+            Dict of (batch, len(horizons)) arrays: the deterministic "prediction" and, unless
+            disabled or only the TFLite runtime is loaded, the sample "mean", "std" and the
+            interval's "lower" and "upper" bounds
+        """
+        X = np.asarray(X, dtype=np.float32)
+        estimate = {"prediction": self.predict_batch(X, symbols)}
+        if samples < 2 or self.model is None:
+            return estimate
+        
+        # The TFLite graph has no dropout, so sampling always runs on the Keras model
+        replicated = np.repeat(X, samples, axis=0)
+        scaled = self.model(replicated, training=True).numpy().reshape(len(X), samples, -1)
+        draws = self._inverse_rows(scaled, symbols)
+        
+        tail = (1 - interval) / 2
+        estimate.update({
+            "mean": draws.mean(axis=1),
+            "std": draws.std(axis=1),
+            "lower": np.quantile(draws, tail, axis=1),
+            "upper": np.quantile(draws, 1 - tail, axis=1),
+        })
+        return estimate
+    
+    def _forward(self, X):
+        """Run the network on scaled windows with the active backend"""
+        X = np.asarray(X, dtype=np.float32)
+        if self.runtime is not None:
+            return self.runtime(X)
+        if self.model is None:
+            raise ValueError("Model needs to be trained first")
+        
+        # Calling the model directly avoids model.predict's per-call setup overhead
+        return self.model(X, training=False).numpy()
+    
+    def predict(self, data, horizon=None):
+        """Make predictions using the trained model"""
+        if self.model is None and self.runtime is None:
+            raise ValueError("Model needs to be trained first")
+        
+        # Prepare sequence for prediction
+        X = np.array([self.prepare_input(data)])
+        
+        column = self.horizon_index(horizon) if horizon is not None else 0
+        return self.predict_batch(X)[0][column]
     
     def save_model(self, path):
-        """Save the model to disk"""
+        """Save the model to disk, with its scaler, horizons and config in a metadata sidecar"""
         if self.model is None:
             raise ValueError("No model to save")
         self.model.save(path)
         
+        fitted = hasattr(self.scaler, "data_min_")
+        metadata = {
+            "sequence_length": self.sequence_length,
+            "horizons": list(self.horizons),
+            "scaler": {
+                "data_min": self.scaler.data_min_.tolist(),
+                "data_max": self.scaler.data_max_.tolist(),
+            } if fitted else None,
+            "symbol_scalers": {
+                symbol: {"data_min": scaler.data_min_.tolist(), "data_max": scaler.data_max_.tolist()}
+                for symbol, scaler in self.symbol_scalers.items()
+            },
+            "training": self.training_info,
+            "config": self.config.to_dict(),
+        }
+        with open(self.metadata_path(path), "w") as f:
+            json.dump(metadata, f)
+        
     def load_model(self, path):
-        """Load the model from disk"""
-        self.model = tf.keras.models.load_model(path)
\ No newline at end of file
+        """Load the model (and its metadata sidecar, if present) from disk"""
+        self.model = tf.keras.models.load_model(path)
+        
+        metadata_path = self.metadata_path(path)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+            self.sequence_length = metadata["sequence_length"]
+            self.horizons = tuple(metadata["horizons"])
+            if metadata.get("scaler"):
+                # Refitting on the recorded extremes restores the exact same transform
+                self.scaler.fit(np.array([metadata["scaler"]["data_min"], metadata["scaler"]["data_max"]]))
+            for symbol, extremes in metadata.get("symbol_scalers", {}).items():
+                self.fit_symbol_scaler(symbol, np.array([extremes["data_min"], extremes["data_max"]]))
+            self.training_info = metadata.get("training")
+            if metadata.get("config"):
+                self.config = ModelConfig.from_dict(metadata["config"])
+            self.config = replace(self.config, SEQUENCE_LENGTH=self.sequence_length)
+        
+        # Models saved before the multi-horizon head have a single one-step output
+        n_outputs = self.model.output_shape[-1]
+        if n_outputs != len(self.horizons):
+            if n_outputs != 1:
+                raise ValueError(
+                    f"Saved model has {n_outputs} outputs but {len(self.horizons)} horizons are configured"
+                )
+            self.horizons = (1,)
+    
+    @staticmethod
+    def metadata_path(path):
+        """Location of the metadata sidecar of a saved model"""
+        return f"{str(path).rstrip(os.sep)}.meta.json"
+    
+    def representative_windows(self, data, count=100):
+        """Return up to ``count`` of the latest scaled input windows of a price series"""
+        tail = np.asarray(data)[-(self.sequence_length + count - 1):]
+        scaled = self.scaler.transform(tail.reshape(-1, 1))
+        return DataPreprocessor.make_windows(scaled, self.sequence_length)
+    
+    def export_tflite(self, path, quantization=None, representative_data=None):
+        """
+        Export the Keras model as a TFLite artifact
+        
+        Args:
+            path: Destination of the .tflite file
+            quantization: None, "float16" or "int8"
+            representative_data: Price series used to calibrate int8 quantization
+            
+        Returns:
+            Size of the artifact in bytes
+        """
+        if self.model is None:
+            raise ValueError("No model to export")
+        
+        windows = self.representative_windows(representative_data) if representative_data is not None else None
+        return export_tflite(self.model, path, quantization=quantization, representative_data=windows)
+    
+    def load_tflite(self, path, num_threads=None):
+        """Serve predictions from a TFLite artifact instead of the Keras model"""
+        runtime = TFLiteBackend(path, num_threads=num_threads)
+        if runtime.output_size != len(self.horizons):
+            if runtime.output_size != 1:
+                raise ValueError(
+                    f"TFLite model has {runtime.output_size} outputs but {len(self.horizons)} horizons are configured"
+                )
+            self.horizons = (1,)
+        self.runtime = runtime
+    
+    def check_drift(self, data, count=100):
+        """
+        Compare TFLite and Keras predictions (in price units) on the latest windows of a series
+        
+        Returns:
+            Drift metrics as returned by ``measure_drift``
+        """
+        if self.model is None or self.runtime is None:
+            raise ValueError("Both a Keras model and a TFLite runtime are required to measure drift")
+        
+        X = self.representative_windows(data, count)
+        expected = self.model(np.asarray(X, dtype=np.float32), training=False).numpy()
+        actual = self.runtime(X)
+        to_prices = lambda scaled: self.scaler.inverse_transform(scaled.reshape(-1, 1))
+        return measure_drift(to_prices(expected), to_prices(actual))
@@ -0,0 +1,144 @@
+"""
+On-disk registry of versioned model artifacts.
+
+Layout::
+
+    <root>/manifest.json              {"current": "<version>", "versions": [...]}
+    <root>/<version>/lstm_model       Keras model
+    <root>/<version>/lstm_model.meta.json
+    <root>/<version>/lstm_model.tflite (optional)
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "lstm_model"
+
+class ModelRegistry:
+    """
+    Versioned model artifacts plus a manifest naming the current version.
+
+    Versions are staged in a temporary directory and renamed into place, and the manifest
+    is replaced atomically, so readers never observe a partially written version.
+    """
+
+    def __init__(self, root: str, keep_versions: int = 10):
+        self.root = root
+        self.keep_versions = keep_versions
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def manifest(self) -> Dict[str, Any]:
+        """Return the manifest, or an empty one if the registry has not been written yet."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"current": None, "versions": []}
+
+    def manifest_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def versions(self) -> List[Dict[str, Any]]:
+        return self.manifest()["versions"]
+
+    def current_version(self) -> Optional[str]:
+        return self.manifest()["current"]
+
+    def model_path(self, version: str) -> str:
+        return os.path.join(self.root, version, MODEL_FILE)
+
+    def tflite_path(self, version: str) -> str:
+        return self.model_path(version) + ".tflite"
+
+    def has_version(self, version: str) -> bool:
+        return any(entry["version"] == version for entry in self.versions())
+
+    def publish(
+        self,
+        version: str,
+        model_path: str,
+        tflite_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        activate: bool = True,
+    ) -> str:
+        """
+        Copy a saved model (and its sidecars) into the registry as ``version``
+
+        Args:
+            version: Version label, unique within the registry
+            model_path: Path the model was saved to with ``BitcoinLSTMModel.save_model``
+            tflite_path: Optional TFLite artifact exported from the same model
+            metadata: Extra information recorded in the manifest (metrics, training job, ...)
+            activate: Make this the current version
+
+        Returns:
+            Path of the registered Keras model
+        """
+        if self.has_version(version):
+            raise ValueError(f"Model version {version} already exists")
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f".staging-{version}")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        target = os.path.join(staging, MODEL_FILE)
+        if os.path.isdir(model_path):
+            shutil.copytree(model_path, target)
+        else:
+            shutil.copyfile(model_path, target)
+        metadata_path = f"{model_path.rstrip(os.sep)}.meta.json"
+        if os.path.exists(metadata_path):
+            shutil.copyfile(metadata_path, target + ".meta.json")
+        if tflite_path and os.path.exists(tflite_path):
+            shutil.copyfile(tflite_path, target + ".tflite")
+
+        os.rename(staging, os.path.join(self.root, version))
+
+        manifest = self.manifest()
+        manifest["versions"].append({
+            "version": version,
+            "created_at": datetime.utcnow().isoformat(),
+            "metadata": metadata or {},
+        })
+        if activate:
+            manifest["current"] = version
+        self._write_manifest(manifest)
+        self._prune()
+        return self.model_path(version)
+
+    def set_current(self, version: str) -> None:
+        """Point the manifest at an already registered version."""
+        if not self.has_version(version):
+            raise ValueError(f"Unknown model version {version}")
+        manifest = self.manifest()
+        manifest["current"] = version
+        self._write_manifest(manifest)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _prune(self) -> None:
+        """Delete the oldest versions beyond ``keep_versions``, never the current one."""
+        manifest = self.manifest()
+        stale = manifest["versions"][:-self.keep_versions] if self.keep_versions else []
+        stale = [entry for entry in stale if entry["version"] != manifest["current"]]
+        if not stale:
+            return
+        stale_versions = {entry["version"] for entry in stale}
+        manifest["versions"] = [entry for entry in manifest["versions"] if entry["version"] not in stale_versions]
+        self._write_manifest(manifest)
+        for version in stale_versions:
+            shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
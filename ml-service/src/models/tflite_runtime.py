@@ -0,0 +1,132 @@
+"""
+TensorFlow Lite export and inference backend for the LSTM model.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+QUANTIZATION_MODES = (None, "float16", "int8")
+
+def _interpreter_class():
+    """Prefer the standalone tflite_runtime package, which avoids loading full TensorFlow."""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+def export_tflite(
+    keras_model,
+    path: str,
+    quantization: Optional[str] = None,
+    representative_data: Optional[np.ndarray] = None,
+    batch_size: int = 1,
+) -> int:
+    """
+    Convert a Keras model into a TFLite flatbuffer.
+
+    Args:
+        keras_model: Trained Keras model
+        path: Destination of the .tflite file
+        quantization: None (float32), "float16" or "int8" (weights and activations calibrated on ``representative_data``)
+        representative_data: Scaled input windows of shape (n, sequence_length, features), required for "int8"
+        batch_size: Static batch dimension of the exported graph
+
+    Returns:
+        Size of the written artifact in bytes
+    """
+    import tensorflow as tf
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization '{quantization}'. Must be one of: {QUANTIZATION_MODES}")
+    if quantization == "int8" and representative_data is None:
+        raise ValueError("int8 quantization requires representative data")
+
+    # The fused TFLite LSTM kernel sizes its state by batch, so the batch dimension must be static
+    input_shape = (batch_size,) + tuple(keras_model.input_shape[1:])
+
+    def forward(x):
+        return keras_model(x, training=False)
+
+    concrete_fn = tf.function(forward, autograph=False).get_concrete_function(
+        tf.TensorSpec(input_shape, tf.float32)
+    )
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete_fn], keras_model)
+
+    if quantization is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == "int8":
+        samples = np.asarray(representative_data, dtype=np.float32)
+
+        def representative_dataset():
+            for start in range(0, len(samples) - batch_size + 1, batch_size):
+                yield [samples[start:start + batch_size]]
+
+        converter.representative_dataset = representative_dataset
+
+    content = converter.convert()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return len(content)
+
+class TFLiteBackend:
+    """
+    Callable forward pass backed by a TFLite interpreter.
+
+    Accepts any batch size: inputs are padded and run in chunks of the artifact's static batch.
+    """
+
+    def __init__(self, path: str, num_threads: Optional[int] = None):
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self._input_index = input_details["index"]
+        self._output_index = output_details["index"]
+        self.batch_size = int(input_details["shape"][0])
+        self.input_shape = tuple(int(dim) for dim in input_details["shape"][1:])
+        self.output_size = int(output_details["shape"][-1])
+
+        # The interpreter holds mutable tensors and is not safe to invoke concurrently
+        self._lock = threading.Lock()
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        n_samples = len(X)
+        padding = -n_samples % self.batch_size
+        if padding:
+            X = np.concatenate([X, np.zeros((padding,) + X.shape[1:], dtype=np.float32)])
+
+        outputs = []
+        with self._lock:
+            for start in range(0, len(X), self.batch_size):
+                self.interpreter.set_tensor(self._input_index, X[start:start + self.batch_size])
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self._output_index).copy())
+        return np.concatenate(outputs)[:n_samples]
+
+def measure_drift(expected: np.ndarray, actual: np.ndarray) -> Dict[str, float]:
+    """
+    Compare two sets of predictions (e.g. Keras versus TFLite).
+
+    Returns:
+        Dictionary with max/mean absolute error and max relative error
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    abs_error = np.abs(actual - expected)
+    return {
+        "max_abs_error": float(abs_error.max()),
+        "mean_abs_error": float(abs_error.mean()),
+        "max_rel_error": float((abs_error / np.maximum(np.abs(expected), 1e-12)).max()),
+    }
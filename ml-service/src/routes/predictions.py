@@ -1,76 +1,297 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
-from services.prediction_service import PredictionService
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Any, List, Optional
+from services.lifecycle import ServiceLifecycle
+from services.training_jobs import TrainingJobConflict
+from config.constants import (
+    CANDLE_RESOLUTIONS,
+    DEFAULT_SYMBOL,
+    MARKET_DATA_RESOLUTION,
+    TRAINING_MODES,
+    VALID_TIMEFRAMES,
+)
+from config.environment import MARKET_SYMBOLS, PREDICTION_MAX_SYMBOLS, TRAIN_DEFAULT_EPOCHS
+from utils.metrics import MetricsRoute
 
-router = APIRouter()
-prediction_service = PredictionService()
+router = APIRouter(prefix="/predictions", route_class=MetricsRoute)
+# The prediction service (and TensorFlow with it) is built by a background warm-up task
+lifecycle = ServiceLifecycle()
 
-@router.post("/train")
-async def train_model(days: int = 30) -> Dict[str, Any]:
+def get_prediction_service():
+    """Return the prediction service, or answer 503 while it is still warming up"""
+    if lifecycle.service is None:
+        raise HTTPException(status_code=503, detail=f"Service is {lifecycle.state}, retry shortly")
+    return lifecycle.service
+
+@router.post("/train", status_code=202)
+async def train_model(
+    days: int = 30,
+    epochs: int = TRAIN_DEFAULT_EPOCHS,
+    mode: str = "full",
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
     """
-    Train the LSTM model with recent data
+    Start training the LSTM model with recent data in a background worker process
     
     Args:
         days: Number of days of historical data to use for training
+        epochs: Maximum number of training epochs (training stops early when validation loss plateaus)
+        mode: "full" to train from scratch, "incremental" to fine-tune the active model on newer data
         
     Returns:
-        Training results and metrics
+        The training job; an identical request made while it runs returns the same job.
+        Its result reports the epochs run, wall time and, for incremental jobs, the time
+        saved against a full retraining
     """
+    if mode not in TRAINING_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid training mode. Must be one of: {', '.join(TRAINING_MODES)}"
+        )
+    
     try:
-        result = await prediction_service.train_model(days)
-        return result
+        return await prediction_service.train_model(days, epochs, mode)
+    except TrainingJobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/train/{job_id}")
+async def get_training_job(
+    job_id: str,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
+    """
+    Get the status and progress of a training job
+    
+    Args:
+        job_id: Identifier returned when the job was submitted
+        
+    Returns:
+        Job status, current epoch, loss/val_loss and per-epoch history
+    """
+    job = prediction_service.training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+    return job.to_dict()
+
+@router.delete("/train/{job_id}")
+async def cancel_training_job(
+    job_id: str,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
+    """
+    Cancel a training job
+    
+    Args:
+        job_id: Identifier returned when the job was submitted
+        
+    Returns:
+        The job, which stops after its current batch
+    """
+    job = await prediction_service.training_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+    return job.to_dict()
+
+@router.get("/model")
+async def get_model_info(prediction_service=Depends(get_prediction_service)) -> Dict[str, Any]:
+    """
+    Get the active model version and the registry manifest
+    
+    Returns:
+        Active and previous versions, inference backend and registered versions
+    """
+    return prediction_service.model_info()
+
+@router.post("/model/reload")
+async def reload_model(
+    version: Optional[str] = None,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
+    """
+    Load a model version from the registry, warm it up and swap it in
+    
+    Args:
+        version: Version to activate (defaults to the manifest's current version)
+        
+    Returns:
+        The active model after the swap
+    """
+    try:
+        return await prediction_service.reload_model(version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/model/rollback")
+async def rollback_model(prediction_service=Depends(get_prediction_service)) -> Dict[str, Any]:
+    """
+    Swap back to the previously active model version
+    
+    Returns:
+        The active model after the rollback
+    """
+    try:
+        return await prediction_service.rollback_model()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+def _parse_symbols(symbols: str) -> List[str]:
+    """Split a comma-separated symbol list, answering 400 for unknown symbols or too many of them"""
+    parsed = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(parsed) > PREDICTION_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {PREDICTION_MAX_SYMBOLS} symbols per request")
+    unknown = [symbol for symbol in parsed if symbol not in MARKET_SYMBOLS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown symbols: {', '.join(unknown)}. Must be among: {', '.join(MARKET_SYMBOLS)}"
+        )
+    return parsed
+
 @router.get("/predict/{timeframe}")
-async def get_prediction(timeframe: str = "24h") -> Dict[str, Any]:
+async def get_prediction(
+    timeframe: str = "24h",
+    symbols: Optional[str] = None,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
     """
-    Get Bitcoin price prediction
+    Get Bitcoin price prediction, or predictions for several symbols
     
     Args:
-        timeframe: Prediction timeframe (e.g., "24h", "7d")
+        timeframe: Prediction timeframe (one of VALID_TIMEFRAMES, e.g., "24h", "7d")
+        symbols: Comma-separated symbols (e.g., "BTC,ETH") to predict in one batched forward pass
         
     Returns:
-        Prediction results including price, confidence, and supporting metrics
+        Prediction results including price, confidence, and supporting metrics; with
+        ``symbols``, price predictions keyed by symbol (without indicators or sentiment)
     """
-    valid_timeframes = ["1h", "4h", "24h", "7d"]
-    if timeframe not in valid_timeframes:
+    if timeframe not in VALID_TIMEFRAMES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid timeframe. Must be one of: {', '.join(valid_timeframes)}"
+            detail=f"Invalid timeframe. Must be one of: {', '.join(VALID_TIMEFRAMES)}"
         )
     
     try:
+        if symbols is not None:
+            return await prediction_service.predict_symbols(timeframe, _parse_symbols(symbols))
         prediction = await prediction_service.predict(timeframe)
         return prediction
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _check_resolution(resolution: str) -> str:
+    """Answer 400 for resolutions finer than the stored candles or not maintained at all"""
+    supported = [
+        name for name, minutes in CANDLE_RESOLUTIONS.items()
+        if minutes >= CANDLE_RESOLUTIONS[MARKET_DATA_RESOLUTION]
+    ]
+    if resolution not in supported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid resolution. Must be one of: {', '.join(supported)}"
+        )
+    return resolution
+
+@router.get("/candles/{resolution}")
+async def get_candles(
+    resolution: str,
+    periods: int = 100,
+    symbol: str = DEFAULT_SYMBOL,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
+    """
+    Get the latest OHLCV bars of a resolution
+    
+    Args:
+        resolution: Bar interval (e.g. "1h", "4h", "1d"), aggregated incrementally from the stored candles
+        periods: Number of bars to return; the newest one may still be filling
+        symbol: Symbol whose bars to return
+        
+    Returns:
+        Bars with timestamp (bar start), open, high, low, close and volume
+    """
+    _check_resolution(resolution)
+    symbol = symbol.strip().upper()
+    if symbol not in MARKET_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown symbol {symbol}. Must be one of: {', '.join(MARKET_SYMBOLS)}"
+        )
+    if periods < 1:
+        raise HTTPException(status_code=400, detail="periods must be positive")
+    try:
+        df = await prediction_service.get_candles(resolution, periods, symbol)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "symbol": symbol,
+        "resolution": resolution,
+        "candles": [
+            {**row, "timestamp": row["timestamp"].isoformat()} for row in df.to_dict(orient="records")
+        ],
+    }
 
 @router.get("/indicators/current")
-async def get_current_indicators() -> Dict[str, Any]:
+async def get_current_indicators(
+    resolution: str = MARKET_DATA_RESOLUTION,
+    prediction_service=Depends(get_prediction_service),
+) -> Dict[str, Any]:
     """
     Get current technical indicators and sentiment analysis
     
+    Args:
+        resolution: Bar interval the indicators are computed on (e.g. "4h", "1d")
+        
     Returns:
         Current technical indicators and sentiment metrics
     """
+    _check_resolution(resolution)
     try:
-        df = await prediction_service.get_bitcoin_data()
-        df = await prediction_service.prepare_features(df)
-        
-        # Get the most recent values
-        latest = df.iloc[-1]
-        
-        return {
-            'timestamp': latest['timestamp'].isoformat(),
-            'technical_indicators': {
-                col: float(latest[col])
-                for col in prediction_service.technical_indicators.get_feature_columns()
-            },
-            'sentiment': {
-                col: float(latest[f'sentiment_{col}'])
-                for col in ['compound', 'positive', 'negative', 'neutral']
-            }
-        }
+        indicators = await prediction_service.current_indicators(resolution)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    if indicators is None:
+        raise HTTPException(status_code=503, detail="No Bitcoin data available")
+    return indicators
+
+@router.get("/cache/stats")
+async def get_cache_stats(prediction_service=Depends(get_prediction_service)) -> Dict[str, Any]:
+    """
+    Get cache statistics
+    
+    Returns:
+        Hit/miss counters of the feature snapshot, inference and shared prediction caches
+    """
+    return {
+        "features": prediction_service.feature_cache.stats(),
+        "inference": prediction_service.inference_cache.stats(),
+        "predictions": prediction_service.prediction_cache.stats(),
+    }
+
+@router.get("/inference/stats")
+async def get_inference_stats(prediction_service=Depends(get_prediction_service)) -> Dict[str, Any]:
+    """
+    Get inference micro-batching statistics
+    
+    Returns:
+        Request/batch counters and queue depth of the inference dispatcher
+    """
+    return prediction_service.inference_batcher.stats()
+
+@router.get("/stream/stats")
+async def get_stream_stats(prediction_service=Depends(get_prediction_service)) -> Dict[str, Any]:
+    """
+    Get prediction stream statistics
+    
+    Returns:
+        Connected clients per transport, updates computed and messages delivered/dropped
+    """
+    return prediction_service.stream.stats()
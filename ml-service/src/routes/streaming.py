@@ -0,0 +1,121 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from starlette.requests import HTTPConnection
+
+from config.environment import STREAM_HEARTBEAT_SECONDS
+from services.prediction_stream import Subscription
+from utils.metrics import MetricsRoute
+from ..auth import User, get_current_user
+from .predictions import get_prediction_service, lifecycle
+
+# Browsers cannot set headers on EventSource/WebSocket connections, so these routes accept the
+# access token as a ``token`` query parameter as well and authenticate themselves
+router = APIRouter(prefix="/predictions", route_class=MetricsRoute)
+
+async def _authenticate(connection: HTTPConnection, token: Optional[str]) -> User:
+    """Resolve the user from the Authorization header or the ``token`` query parameter"""
+    scheme, _, credentials = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        token = credentials
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await get_current_user(token)
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+def _encode_event(message: Dict[str, Any]) -> str:
+    return f"event: {message['type']}\ndata: {json.dumps(message.get('data'), default=str)}\n\n"
+
+@router.get("/stream")
+async def stream_predictions(request: Request, token: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream prediction updates as Server-Sent Events
+
+    Every new candle (or model version) produces one ``prediction`` event with all
+    timeframes and the current indicators; the latest one is sent on connect.
+
+    Args:
+        token: Access token, for clients that cannot send an Authorization header
+
+    Returns:
+        A ``text/event-stream`` response, with comment keep-alives while idle
+    """
+    await _authenticate(request, token)
+    prediction_service = get_prediction_service()
+
+    async def events() -> AsyncIterator[str]:
+        subscription = prediction_service.stream.subscribe("sse")
+        try:
+            # Ends when StreamingResponse cancels the generator on client disconnect
+            while True:
+                message = await subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                yield ": keep-alive\n\n" if message is None else _encode_event(message)
+        finally:
+            prediction_service.stream.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _send_updates(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        message = await subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+        await websocket.send_json(message if message is not None else {"type": "heartbeat"})
+
+async def _receive_pings(websocket: WebSocket, subscription: Subscription) -> None:
+    # Replies go through the subscription queue so only one task ever sends on the socket
+    while True:
+        message = await websocket.receive_json()
+        if isinstance(message, dict) and message.get("type") == "ping":
+            subscription.offer({"type": "pong"})
+
+@router.websocket("/ws")
+async def prediction_websocket(websocket: WebSocket, token: Optional[str] = None) -> None:
+    """
+    Push prediction updates over a WebSocket
+
+    Messages have the ``{"type": ..., "data": ...}`` shape: ``prediction`` updates,
+    ``heartbeat`` while idle and ``pong`` in reply to a ``{"type": "ping"}`` message.
+
+    Args:
+        token: Access token, for clients that cannot send an Authorization header
+    """
+    try:
+        await _authenticate(websocket, token)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    if lifecycle.service is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=f"Service is {lifecycle.state}")
+        return
+
+    prediction_service = lifecycle.service
+    await websocket.accept()
+    subscription = prediction_service.stream.subscribe("websocket")
+    tasks = [
+        asyncio.create_task(_send_updates(websocket, subscription)),
+        asyncio.create_task(_receive_pings(websocket, subscription)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = None if task.cancelled() else task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.warning("Prediction stream connection closed: {}", str(error))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        prediction_service.stream.unsubscribe(subscription)
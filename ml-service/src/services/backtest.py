@@ -0,0 +1,287 @@
+"""
+Vectorized backtesting of the LSTM model, with optional walk-forward retraining.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from utils.data_preprocessor import DataPreprocessor
+from utils.tensorflow_threads import limit_tensorflow_threads
+
+def horizon_metrics(predicted: np.ndarray, actual: np.ndarray, current: np.ndarray) -> Dict[str, float]:
+    """
+    Error metrics of the predictions for one horizon
+
+    Args:
+        predicted: Predicted prices
+        actual: Realized prices at the horizon
+        current: Last known price when each prediction was made
+
+    Returns:
+        MAE, RMSE, MAPE (%), bias (mean signed error) and directional accuracy
+    """
+    error = predicted - actual
+    return {
+        "count": int(len(error)),
+        "mae": float(np.mean(np.abs(error))),
+        "rmse": float(np.sqrt(np.mean(error ** 2))),
+        "mape": float(np.mean(np.abs(error) / np.abs(actual)) * 100),
+        "bias": float(np.mean(error)),
+        "directional_accuracy": float(np.mean(np.sign(predicted - current) == np.sign(actual - current))),
+    }
+
+def predict_origins(model, prices: np.ndarray, start: int, stop: int, batch_size: int = 4096) -> np.ndarray:
+    """
+    Predict every horizon from each origin ``t`` in ``[start, stop)``, using the window ending at ``t``
+
+    The series is scaled once and sliced into windows as a strided view; only one chunk of
+    ``batch_size`` windows is materialized (as the model input) at a time.
+
+    Returns:
+        Array of shape (stop - start, len(model.horizons)) with predicted prices
+    """
+    sequence_length = model.sequence_length
+    if start < sequence_length - 1:
+        raise ValueError(f"The first origin needs {sequence_length - 1} earlier data points")
+
+    segment = np.asarray(prices, dtype=np.float64)[start - sequence_length + 1:stop]
+    scaled = model.scaler.transform(segment.reshape(-1, 1))
+    windows = DataPreprocessor.make_windows(scaled, sequence_length)
+
+    predictions = np.empty((len(windows), len(model.horizons)))
+    for lo in range(0, len(windows), batch_size):
+        predictions[lo:lo + batch_size] = model.predict_batch(windows[lo:lo + batch_size])
+    return predictions
+
+@dataclass
+class BacktestFold:
+    """One walk-forward step: train on ``[train_start, train_stop)``, predict origins in ``[test_start, test_stop)``."""
+
+    index: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+    elapsed_seconds: Optional[float] = None
+    metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "train": [self.train_start, self.train_stop],
+            "test": [self.test_start, self.test_stop],
+            "elapsed_seconds": self.elapsed_seconds,
+            "metrics": self.metrics,
+        }
+
+@dataclass
+class BacktestResult:
+    """Predictions made from every origin of a backtest, with the realized prices."""
+
+    horizons: Sequence[int]
+    origins: np.ndarray
+    predictions: np.ndarray
+    actual: np.ndarray
+    current: np.ndarray
+    elapsed_seconds: float
+    folds: List[BacktestFold] = field(default_factory=list)
+
+    def metrics(self, mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """Error metrics per horizon (keyed by the number of steps ahead), optionally for a subset of origins."""
+        mask = slice(None) if mask is None else mask
+        return {
+            str(horizon): horizon_metrics(self.predictions[mask, i], self.actual[mask, i], self.current[mask])
+            for i, horizon in enumerate(self.horizons)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "horizons": list(self.horizons),
+            "origins": int(len(self.origins)),
+            "first_origin": int(self.origins[0]) if len(self.origins) else None,
+            "last_origin": int(self.origins[-1]) if len(self.origins) else None,
+            "elapsed_seconds": self.elapsed_seconds,
+            "metrics": self.metrics(),
+            "folds": [fold.to_dict() for fold in self.folds],
+        }
+
+def _run_fold(
+    train_prices: np.ndarray,
+    test_prices: np.ndarray,
+    sequence_length: int,
+    horizons: Sequence[int],
+    train_params: Dict[str, Any],
+    batch_size: int,
+) -> Tuple[np.ndarray, float]:
+    """
+    Worker entry point: train a fresh model, then predict every origin of the test segment.
+
+    ``test_prices`` starts ``sequence_length - 1`` points before the first test origin.
+
+    Returns:
+        The predictions and the time the fold took
+    """
+    from models.lstm_model import BitcoinLSTMModel
+
+    started = time.perf_counter()
+    model = BitcoinLSTMModel(sequence_length=sequence_length, horizons=horizons)
+    model.train(train_prices, **train_params)
+    predictions = predict_origins(model, test_prices, sequence_length - 1, len(test_prices), batch_size)
+    return predictions, time.perf_counter() - started
+
+class BacktestEngine:
+    """
+    Evaluates models over every rolling window of a price series.
+
+    ``run`` backtests one trained model with batched inference. ``walk_forward`` retrains a
+    fresh model every ``retrain_every`` steps on the data known at that point and uses it
+    for the following origins; folds are independent and trained in parallel processes.
+    """
+
+    def __init__(self, batch_size: int = 4096, processes: int = 1, threads_per_process: Optional[int] = None):
+        self.batch_size = batch_size
+        self.processes = max(1, processes)
+        # Split the machine between the workers instead of letting each one claim every core
+        self.threads_per_process = threads_per_process or max(1, (os.cpu_count() or 1) // self.processes)
+
+    @staticmethod
+    def _result_arrays(prices: np.ndarray, origins: np.ndarray, horizons: Sequence[int]):
+        actual = prices[origins[:, None] + np.asarray(horizons)[None, :]]
+        return actual, prices[origins]
+
+    def run(self, model, prices: np.ndarray, start: Optional[int] = None) -> BacktestResult:
+        """
+        Backtest a trained model from every origin that has a full window and all targets
+
+        Args:
+            model: Trained BitcoinLSTMModel (Keras or TFLite backend)
+            prices: Price series, oldest first
+            start: First origin (defaults to the first one with a full input window)
+
+        Returns:
+            Predictions, realized prices and per-horizon metrics
+        """
+        started = time.perf_counter()
+        prices = np.asarray(prices, dtype=np.float64)
+        start = model.sequence_length - 1 if start is None else start
+        stop = len(prices) - max(model.horizons)
+        if stop <= start:
+            raise ValueError("Price series is too short to backtest")
+
+        predictions = predict_origins(model, prices, start, stop, self.batch_size)
+        origins = np.arange(start, stop)
+        actual, current = self._result_arrays(prices, origins, model.horizons)
+        return BacktestResult(
+            model.horizons, origins, predictions, actual, current, time.perf_counter() - started
+        )
+
+    @staticmethod
+    def walk_forward_folds(
+        n_points: int,
+        train_periods: int,
+        retrain_every: int,
+        max_horizon: int,
+        expanding: bool = False,
+    ) -> List[BacktestFold]:
+        """
+        Split a series into walk-forward folds
+
+        The first model is trained on the first ``train_periods`` points; each fold predicts
+        ``retrain_every`` origins, and the next model is trained on the data known at its first
+        origin (the latest ``train_periods`` points, or all of them with ``expanding``).
+        """
+        if retrain_every <= 0:
+            raise ValueError("retrain_every must be positive")
+
+        folds = []
+        last_origin = n_points - max_horizon  # exclusive: later origins have no realized target
+        test_start = train_periods - 1
+        while test_start < last_origin:
+            train_stop = test_start + 1
+            folds.append(BacktestFold(
+                index=len(folds),
+                train_start=0 if expanding else train_stop - train_periods,
+                train_stop=train_stop,
+                test_start=test_start,
+                test_stop=min(test_start + retrain_every, last_origin),
+            ))
+            test_start += retrain_every
+        return folds
+
+    def walk_forward(
+        self,
+        prices: np.ndarray,
+        train_periods: int,
+        retrain_every: int,
+        sequence_length: int = 60,
+        horizons: Sequence[int] = (1,),
+        expanding: bool = False,
+        epochs: int = 5,
+        train_params: Optional[Dict[str, Any]] = None,
+    ) -> BacktestResult:
+        """
+        Walk-forward backtest with a model retrained every ``retrain_every`` steps
+
+        Args:
+            prices: Price series, oldest first
+            train_periods: Points each model is trained on (the initial history with ``expanding``)
+            retrain_every: Origins predicted by each model before it is retrained
+            sequence_length: Input window of the trained models
+            horizons: Steps ahead predicted by the trained models
+            expanding: Train on all data known so far instead of a rolling window
+            epochs: Training epochs per fold
+            train_params: Extra arguments for ``BitcoinLSTMModel.train``
+
+        Returns:
+            Predictions over every fold, with overall and per-fold metrics
+        """
+        started = time.perf_counter()
+        prices = np.asarray(prices, dtype=np.float64)
+        horizons = tuple(sorted(horizons))
+        if train_periods < sequence_length + max(horizons):
+            raise ValueError(f"train_periods must be at least {sequence_length + max(horizons)}")
+        folds = self.walk_forward_folds(len(prices), train_periods, retrain_every, max(horizons), expanding)
+        if not folds:
+            raise ValueError("Price series is too short for a single walk-forward fold")
+
+        train_params = {"epochs": epochs, "streaming": True, "validation_split": 0.0, "verbose": 0,
+                        **(train_params or {})}
+        logger.info("Walk-forward backtest: {} folds on {} processes", len(folds), self.processes)
+
+        fold_predictions: Dict[int, np.ndarray] = {}
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(self.processes, len(folds)),
+            mp_context=context,
+            initializer=limit_tensorflow_threads,
+            initargs=(self.threads_per_process,),
+        ) as executor:
+            futures = {
+                fold.index: executor.submit(
+                    _run_fold,
+                    prices[fold.train_start:fold.train_stop],
+                    prices[fold.test_start - sequence_length + 1:fold.test_stop],
+                    sequence_length,
+                    horizons,
+                    train_params,
+                    self.batch_size,
+                )
+                for fold in folds
+            }
+            for fold in folds:
+                fold_predictions[fold.index], fold.elapsed_seconds = futures[fold.index].result()
+                logger.info("Walk-forward fold {}/{} done", fold.index + 1, len(folds))
+
+        origins = np.concatenate([np.arange(fold.test_start, fold.test_stop) for fold in folds])
+        predictions = np.concatenate([fold_predictions[fold.index] for fold in folds])
+        actual, current = self._result_arrays(prices, origins, horizons)
+        result = BacktestResult(horizons, origins, predictions, actual, current, time.perf_counter() - started, folds)
+        for fold in folds:
+            fold.metrics = result.metrics((origins >= fold.test_start) & (origins < fold.test_stop))
+        return result
@@ -0,0 +1,380 @@
+"""
+Parallel hyperparameter search over ModelConfig fields.
+
+The price series is scaled and windowed once, at the longest sequence length searched, into
+``.npy`` files that every worker opens memory-mapped: the pages are shared through the OS page
+cache instead of being pickled to each process, and a trial with a shorter sequence length
+reads the tail of each window, so all trials are scored on the same validation targets.
+
+Trials run in spawned worker processes that each get a TensorFlow thread budget. With the
+"halving" strategy, trials are trained in rungs of growing epoch budgets and only the best
+1/eta of them are resumed after each rung (successive halving), so poor configs are pruned
+after a few epochs.
+"""
+import itertools
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+from sklearn.preprocessing import MinMaxScaler
+
+from config.constants import SEARCH_STRATEGIES
+from config.model_config import ModelConfig
+from utils.data_preprocessor import DataPreprocessor
+from utils.tensorflow_threads import limit_tensorflow_threads
+
+# ModelConfig fields a search may vary
+SEARCHABLE_FIELDS = ("SEQUENCE_LENGTH", "LSTM_UNITS", "DROPOUT_RATE", "BATCH_SIZE", "LEARNING_RATE")
+
+def grid_configs(space: Dict[str, Sequence[Any]], base: Optional[ModelConfig] = None) -> List[ModelConfig]:
+    """Return one config per combination of the values in ``space``, in a fixed order."""
+    base = base or ModelConfig()
+    names = list(space)
+    return [replace(base, **dict(zip(names, values))) for values in itertools.product(*space.values())]
+
+def random_configs(
+    space: Dict[str, Sequence[Any]],
+    count: int,
+    base: Optional[ModelConfig] = None,
+    seed: Optional[int] = None,
+) -> List[ModelConfig]:
+    """Return up to ``count`` distinct configs drawn uniformly from the grid spanned by ``space``."""
+    grid = grid_configs(space, base)
+    rng = np.random.default_rng(seed)
+    return [grid[i] for i in rng.choice(len(grid), size=min(count, len(grid)), replace=False)]
+
+def halving_rungs(max_epochs: int, min_epochs: int, eta: int) -> List[int]:
+    """Cumulative epoch budgets of the successive-halving rungs, e.g. 1, 3, 9 for eta=3 and max_epochs=9."""
+    if min_epochs <= 0 or eta < 2:
+        raise ValueError("min_epochs must be positive and eta at least 2")
+    rungs = [min(min_epochs, max_epochs)]
+    while rungs[-1] < max_epochs:
+        rungs.append(min(rungs[-1] * eta, max_epochs))
+    return rungs
+
+@dataclass
+class SearchTrial:
+    """One config of a search, with the validation loss after each rung it was trained in."""
+
+    index: int
+    config: ModelConfig
+    epochs: int = 0
+    val_loss: Optional[float] = None
+    pruned: bool = False
+    elapsed_seconds: float = 0.0
+    history: List[Dict[str, float]] = field(default_factory=list)
+
+    def params(self) -> Dict[str, Any]:
+        """Values of the searchable fields for this trial."""
+        return {name: getattr(self.config, name) for name in SEARCHABLE_FIELDS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "params": self.params(),
+            "epochs": self.epochs,
+            "val_loss": self.val_loss,
+            "pruned": self.pruned,
+            "elapsed_seconds": self.elapsed_seconds,
+            "history": self.history,
+        }
+
+@dataclass
+class SearchResult:
+    """Trials of a search, best first."""
+
+    strategy: str
+    trials: List[SearchTrial]
+    elapsed_seconds: float
+
+    @property
+    def best(self) -> SearchTrial:
+        return self.trials[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "elapsed_seconds": self.elapsed_seconds,
+            "trial_epochs": sum(trial.epochs for trial in self.trials),
+            "best": self.best.to_dict(),
+            "trials": [trial.to_dict() for trial in self.trials],
+        }
+
+def _batches(X, y, indices, sequence_length: int, batch_size: int, shuffle: bool, seed: int):
+    """Keras Sequence gathering batches of memory-mapped windows, trimmed to ``sequence_length``."""
+    import tensorflow as tf
+
+    class WindowBatches(tf.keras.utils.Sequence):
+        def __init__(self):
+            super().__init__()
+            self.order = np.array(indices)
+            self.rng = np.random.default_rng(seed)
+            self.on_epoch_end()
+
+        def __len__(self):
+            return math.ceil(len(self.order) / batch_size)
+
+        def __getitem__(self, batch):
+            # Sorted indices keep the memory-mapped reads sequential; only this batch is copied
+            rows = np.sort(self.order[batch * batch_size:(batch + 1) * batch_size])
+            return X[rows, X.shape[1] - sequence_length:], y[rows]
+
+        def on_epoch_end(self):
+            if shuffle:
+                self.rng.shuffle(self.order)
+
+    return WindowBatches()
+
+def _run_trial(
+    data_dir: str,
+    config: Dict[str, Any],
+    horizons: Sequence[int],
+    n_train: int,
+    initial_epoch: int,
+    epochs: int,
+    patience: Optional[int],
+    state_path: Optional[str],
+    save: bool,
+    seed: int,
+) -> Dict[str, Any]:
+    """
+    Worker entry point: train a trial up to ``epochs`` on the shared windows
+
+    A trial resumed at ``initial_epoch > 0`` continues from the model saved at ``state_path``,
+    optimizer state included; with ``save`` the model is saved there when done.
+
+    Returns:
+        The best validation loss, the epochs trained, the per-epoch losses and the time taken
+    """
+    import tensorflow as tf
+
+    from models.lstm_model import BitcoinLSTMModel
+
+    started = time.perf_counter()
+    X = np.load(os.path.join(data_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"), mmap_mode="r")
+    model = BitcoinLSTMModel(horizons=horizons, config=ModelConfig.from_dict(config))
+    if initial_epoch:
+        model.load_model(state_path)
+    else:
+        tf.keras.utils.set_random_seed(seed)
+        model.build_model((model.sequence_length, 1))
+
+    batch_size = model.config.BATCH_SIZE
+    history = model.model.fit(
+        _batches(X, y, np.arange(n_train), model.sequence_length, batch_size, True, seed + initial_epoch),
+        validation_data=_batches(X, y, np.arange(n_train, len(X)), model.sequence_length, batch_size, False, seed),
+        initial_epoch=initial_epoch,
+        epochs=epochs,
+        callbacks=model.fit_callbacks(patience=patience),
+        verbose=0,
+    ).history
+    if save:
+        model.save_model(state_path)
+    return {
+        "val_loss": float(np.min(history["val_loss"])),
+        "epochs": initial_epoch + len(history["val_loss"]),
+        "history": [
+            {"loss": float(loss), "val_loss": float(val_loss)}
+            for loss, val_loss in zip(history["loss"], history["val_loss"])
+        ],
+        "elapsed_seconds": time.perf_counter() - started,
+    }
+
+class HyperparameterSearch:
+    """
+    Trains candidate ModelConfigs on one price series in parallel processes and ranks them
+    by validation loss.
+
+    "grid" trains every combination of the search space and "random" a sample of it, each for
+    the full epoch budget with early stopping; "halving" trains a random sample with
+    successive halving.
+    """
+
+    def __init__(
+        self,
+        processes: int = 1,
+        threads_per_process: Optional[int] = None,
+        work_dir: Optional[str] = None,
+    ):
+        self.processes = max(1, processes)
+        # Split the machine between the workers instead of letting each one claim every core
+        self.threads_per_process = threads_per_process or max(1, (os.cpu_count() or 1) // self.processes)
+        self.work_dir = work_dir
+
+    @staticmethod
+    def write_windows(
+        prices: np.ndarray,
+        sequence_length: int,
+        horizons: Sequence[int],
+        data_dir: str,
+        chunk_size: int = 65_536,
+    ) -> int:
+        """
+        Scale a price series and write its windows and targets as ``.npy`` files in ``data_dir``
+
+        The windows are streamed into the files chunk by chunk, so the full window tensor is
+        never held in memory.
+
+        Returns:
+            Number of windows written
+        """
+        horizons = np.asarray(sorted(horizons))
+        scaled = MinMaxScaler(feature_range=(0, 1)).fit_transform(
+            np.asarray(prices, dtype=np.float64).reshape(-1, 1)
+        ).astype(np.float32)
+        n_windows = len(scaled) - sequence_length - int(horizons[-1]) + 1
+        if n_windows <= 0:
+            raise ValueError(f"Need more than {sequence_length + int(horizons[-1]) - 1} data points to search")
+
+        windows = DataPreprocessor.make_windows(scaled, sequence_length)
+        X = np.lib.format.open_memmap(
+            os.path.join(data_dir, "X.npy"), mode="w+", dtype=np.float32, shape=(n_windows, sequence_length, 1)
+        )
+        for lo in range(0, n_windows, chunk_size):
+            X[lo:lo + chunk_size] = windows[lo:min(lo + chunk_size, n_windows)]
+        X.flush()
+        targets = np.arange(n_windows)[:, None] + sequence_length - 1 + horizons[None, :]
+        np.save(os.path.join(data_dir, "y.npy"), scaled[targets, 0])
+        return n_windows
+
+    def candidates(
+        self,
+        space: Dict[str, Sequence[Any]],
+        strategy: str = "grid",
+        trials: int = 10,
+        base: Optional[ModelConfig] = None,
+        seed: Optional[int] = None,
+    ) -> List[ModelConfig]:
+        """Configs evaluated by a search with ``strategy``"""
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Invalid strategy. Must be one of: {', '.join(SEARCH_STRATEGIES)}")
+        unsupported = [name for name in space if name not in SEARCHABLE_FIELDS]
+        if unsupported:
+            raise ValueError(
+                f"Cannot search {', '.join(unsupported)}. Searchable fields: {', '.join(SEARCHABLE_FIELDS)}"
+            )
+        if strategy == "grid":
+            return grid_configs(space, base)
+        return random_configs(space, trials, base, seed)
+
+    def run(
+        self,
+        prices: np.ndarray,
+        space: Dict[str, Sequence[Any]],
+        strategy: str = "grid",
+        trials: int = 10,
+        epochs: int = 9,
+        horizons: Sequence[int] = (1,),
+        validation_split: float = 0.2,
+        patience: Optional[int] = None,
+        min_epochs: int = 1,
+        eta: int = 3,
+        base: Optional[ModelConfig] = None,
+        seed: int = 0,
+    ) -> SearchResult:
+        """
+        Search the configs of ``space`` on a price series
+
+        Args:
+            prices: Price series, oldest first
+            space: Candidate values per ModelConfig field (see SEARCHABLE_FIELDS)
+            strategy: "grid", "random" or "halving"
+            trials: Configs sampled by the "random" and "halving" strategies
+            epochs: Epoch budget of a fully trained trial
+            horizons: Steps ahead predicted by the trained models
+            validation_split: Fraction of the latest windows scored as validation
+            patience: Early stopping patience of "grid" and "random" trials (defaults to the
+                config's EARLY_STOPPING_PATIENCE)
+            min_epochs: Epochs of the first "halving" rung
+            eta: Fraction (1/eta) of the "halving" trials kept after each rung
+            base: Config providing the fields not searched
+            seed: Seed of the sampling and of the weight initialization
+
+        Returns:
+            Every trial, best validation loss first (pruned trials rank after the survivors)
+        """
+        started = time.perf_counter()
+        base = base or ModelConfig()
+        configs = self.candidates(space, strategy, trials, base, seed)
+        horizons = tuple(sorted(horizons))
+        sequence_length = max(config.SEQUENCE_LENGTH for config in configs)
+        search_trials = [SearchTrial(index=i, config=config) for i, config in enumerate(configs)]
+
+        with tempfile.TemporaryDirectory(dir=self.work_dir, prefix="hpsearch-") as data_dir:
+            n_windows = self.write_windows(prices, sequence_length, horizons, data_dir)
+            n_train = n_windows - int(n_windows * validation_split)
+            if n_train <= 0 or n_train == n_windows:
+                raise ValueError("validation_split must leave both training and validation windows")
+            logger.info(
+                "Hyperparameter search: {} {} trials on {} windows, {} processes x {} threads",
+                len(search_trials), strategy, n_windows, self.processes, self.threads_per_process,
+            )
+
+            def run_rung(rung_trials: List[SearchTrial], rung_epochs: int, rung_patience: Optional[int], save: bool):
+                futures = {
+                    trial.index: executor.submit(
+                        _run_trial,
+                        data_dir,
+                        trial.config.to_dict(),
+                        horizons,
+                        n_train,
+                        trial.epochs,
+                        rung_epochs,
+                        rung_patience,
+                        os.path.join(data_dir, f"trial-{trial.index}.keras"),
+                        save,
+                        seed + trial.index,
+                    )
+                    for trial in rung_trials
+                }
+                for trial in rung_trials:
+                    outcome = futures[trial.index].result()
+                    trial.epochs = outcome["epochs"]
+                    trial.val_loss = outcome["val_loss"] if trial.val_loss is None else min(
+                        trial.val_loss, outcome["val_loss"]
+                    )
+                    trial.history.extend(outcome["history"])
+                    trial.elapsed_seconds += outcome["elapsed_seconds"]
+                    logger.info(
+                        "Trial {} ({}): val_loss {:.6f} after {} epochs",
+                        trial.index, trial.params(), trial.val_loss, trial.epochs,
+                    )
+
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=min(self.processes, len(search_trials)),
+                mp_context=context,
+                initializer=limit_tensorflow_threads,
+                initargs=(self.threads_per_process,),
+            ) as executor:
+                if strategy == "halving":
+                    survivors = search_trials
+                    rungs = halving_rungs(epochs, min_epochs, eta)
+                    for i, rung_epochs in enumerate(rungs):
+                        last = i == len(rungs) - 1
+                        run_rung(survivors, rung_epochs, None, save=not last)
+                        if last:
+                            break
+                        survivors = sorted(survivors, key=lambda trial: trial.val_loss)
+                        keep_count = max(1, len(survivors) // eta)
+                        for trial in survivors[keep_count:]:
+                            trial.pruned = True
+                        survivors = survivors[:keep_count]
+                        logger.info("Rung {} ({} epochs): kept {} trials", i + 1, rung_epochs, keep_count)
+                else:
+                    run_rung(search_trials, epochs, base.EARLY_STOPPING_PATIENCE if patience is None else patience,
+                             save=False)
+
+        # Pruned trials rank by how far they got, as their losses come from fewer epochs
+        ranked = sorted(
+            search_trials, key=lambda trial: (trial.pruned, -trial.epochs if trial.pruned else 0, trial.val_loss)
+        )
+        return SearchResult(strategy, ranked, time.perf_counter() - started)
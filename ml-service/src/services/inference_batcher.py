@@ -0,0 +1,125 @@
+"""
+Async micro-batching dispatcher for model inference.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+class InferenceBatcher:
+    """
+    Collects concurrent inference requests into a single forward pass.
+
+    Requests are queued; a background worker takes the first pending request, then keeps
+    collecting for up to ``max_wait_ms`` (or until ``max_batch_size`` requests are queued),
+    stacks the inputs along a new batch axis and runs ``predict_fn`` once in a worker thread.
+    Each awaiting coroutine receives its own row of the result.
+
+    Every request may carry a key (e.g. the symbol of the window); ``predict_fn`` receives the
+    keys of the batch rows alongside the stacked inputs.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray, Sequence[Optional[Hashable]]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.last_batch_size = 0
+
+    async def submit(self, inputs: np.ndarray, key: Optional[Hashable] = None) -> Any:
+        """
+        Queue one input (without batch axis) and wait for its prediction.
+
+        Args:
+            inputs: Model input for a single sample
+            key: Passed to ``predict_fn`` with this row
+
+        Returns:
+            The row of ``predict_fn``'s output corresponding to ``inputs``
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((inputs, key, future))
+        self.requests += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[np.ndarray, Optional[Hashable], asyncio.Future]]) -> None:
+        # Skip callers that gave up while waiting
+        batch = [request for request in batch if not request[2].done()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        try:
+            outputs = await asyncio.to_thread(
+                self.predict_fn,
+                np.stack([inputs for inputs, _, _ in batch]),
+                [key for _, key, _ in batch],
+            )
+        except Exception as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, _, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    async def close(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue-depth and batching metrics."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
@@ -0,0 +1,86 @@
+"""
+Background warm-up of the prediction service.
+"""
+import asyncio
+import importlib
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+from loguru import logger
+
+class ServiceLifecycle:
+    """
+    Builds the prediction service after the web server is already accepting connections.
+
+    Importing TensorFlow, pandas_ta and NLTK, constructing the service, loading the model and
+    priming the feature pipeline run in a background task started from the app lifespan, so
+    ``/health`` answers immediately and ``/ready`` reports when predictions can be served.
+    """
+
+    def __init__(self, module: str = "services.prediction_service"):
+        self.module = module
+        self.service: Optional[Any] = None
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+        self._started_at = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the warm-up task (idempotent)."""
+        if self._task is None:
+            self._started_at = time.monotonic()
+            self._task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        try:
+            module = await self._phase("import", asyncio.to_thread(importlib.import_module, self.module))
+            # Construction may download the NLTK lexicon, so it stays off the event loop too
+            service = await self._phase("construct", asyncio.to_thread(module.PredictionService))
+            await self._phase("model", service.startup())
+            self.service = service
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            logger.error("Service warm-up failed: {}", str(e))
+            return
+
+        try:
+            # The first indicator pass pays one-off pandas_ta costs; take them before serving traffic
+            await self._phase("features", service.get_feature_snapshot())
+        except Exception as e:
+            logger.warning("Feature pipeline warm-up failed: {}", str(e))
+
+        self.state = "ready"
+        logger.info("Service ready in {:.2f}s", time.monotonic() - self._started_at)
+
+    async def _phase(self, name: str, awaitable: Awaitable) -> Any:
+        start = time.perf_counter()
+        result = await awaitable
+        self.phases[name] = round(time.perf_counter() - start, 3)
+        logger.info("Warm-up phase '{}' took {:.2f}s", name, self.phases[name])
+        return result
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def status(self) -> Dict[str, Any]:
+        """Return the warm-up state, per-phase durations and the active model version."""
+        return {
+            "status": self.state,
+            "error": self.error,
+            "phases_seconds": dict(self.phases),
+            "model_version": getattr(self.service, "model_version", None),
+        }
+
+    async def shutdown(self) -> None:
+        """Abort a warm-up in progress and shut the service down."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self.service is not None:
+            await self.service.shutdown()
@@ -0,0 +1,234 @@
+"""
+Prediction cache shared by every worker through Redis, with an in-process fallback.
+"""
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from utils.news_client import CircuitBreaker
+
+# Deletes the lock only if it still holds our token, so an expired lock re-acquired by
+# another worker is never released by us
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class LocalBackend:
+    """In-process stand-in for the handful of Redis commands the cache uses."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Optional[float], str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[float] = None, px: Optional[int] = None,
+                  nx: bool = False) -> bool:
+        if nx and await self.get(key) is not None:
+            return False
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        if len(self._entries) > self.max_entries:
+            # Dicts keep insertion order: drop the oldest entry
+            del self._entries[next(iter(self._entries))]
+        return True
+
+    async def release(self, key: str, token: str) -> None:
+        if await self.get(key) == token:
+            del self._entries[key]
+
+class RedisBackend:
+    """Thin adapter over a ``redis.asyncio.Redis``-compatible client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ex: Optional[float] = None, px: Optional[int] = None,
+                  nx: bool = False) -> bool:
+        if ex is not None:
+            # Millisecond precision, so a sub-second TTL does not round down to "no expiry"
+            px = max(1, int(ex * 1000))
+        return bool(await self.client.set(key, value, px=px, nx=nx))
+
+    async def release(self, key: str, token: str) -> None:
+        await self.client.eval(_RELEASE_SCRIPT, 1, key, token)
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or self.client.close
+        await close()
+
+class PredictionCache:
+    """
+    Caches serialized prediction results under a string key (model version, timeframe, candle).
+
+    Within a worker, concurrent misses share one computation. Across workers, the first miss
+    takes a short-lived Redis lock and computes; the others poll for its result for up to
+    ``lock_wait_seconds`` before computing themselves. When Redis is unreachable the cache
+    degrades to its in-process backend instead of failing the request, and a circuit breaker
+    keeps it from paying a connection timeout on every call until Redis is back.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        namespace: str = "ml-service:prediction",
+        ttl_seconds: float = 3600.0,
+        lock_timeout_seconds: float = 30.0,
+        lock_wait_seconds: float = 10.0,
+        poll_interval_seconds: float = 0.05,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.local = LocalBackend()
+        self.remote = RedisBackend(client) if client is not None else None
+        self.breaker = breaker or CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.waited = 0
+        self.backend_errors = 0
+
+    async def _call(self, method: str, *args, **kwargs) -> Any:
+        """Run a backend command on Redis, falling back to the local backend if Redis fails."""
+        if self.remote is not None and self.breaker.allow():
+            try:
+                result = await getattr(self.remote, method)(*args, **kwargs)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                self.backend_errors += 1
+                self.breaker.record_failure()
+                logger.warning("Redis {} failed, using the in-process cache: {}", method, str(e))
+        return await getattr(self.local, method)(*args, **kwargs)
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return the cached result for ``key``, computing and storing it with ``factory`` on a miss
+
+        Args:
+            key: Cache key, e.g. "<model version>:<timeframe>:<candle timestamp>"
+            factory: Zero-argument coroutine function producing a JSON-serializable result
+
+        Returns:
+            The cached or freshly computed result
+        """
+        key = f"{self.namespace}:{key}"
+        cached = await self._call("get", key)
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, factory))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            lock_key, token = f"{key}:lock", uuid.uuid4().hex
+            if await self._call("set", lock_key, token, px=int(self.lock_timeout_seconds * 1000), nx=True):
+                try:
+                    # Another worker may have stored the result between our lookup and the lock
+                    cached = await self._call("get", key)
+                    if cached is not None:
+                        return json.loads(cached)
+                    return await self._compute_and_store(key, factory)
+                finally:
+                    await self._call("release", lock_key, token)
+
+            # Another worker holds the lock: wait for its result rather than recomputing
+            deadline = time.monotonic() + self.lock_wait_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval_seconds)
+                cached = await self._call("get", key)
+                if cached is not None:
+                    self.waited += 1
+                    return json.loads(cached)
+            logger.warning("Timed out waiting for another worker to compute {}", key)
+            return await self._compute_and_store(key, factory)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _compute_and_store(self, key: str, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        value = await factory()
+        await self._call("set", key, json.dumps(value), ex=self.ttl_seconds)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop the results held in process (entries in Redis expire after ``ttl_seconds``)."""
+        self.local = LocalBackend(self.local.max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the active backend."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": "redis" if self.remote is not None else "local",
+            "circuit_breaker": self.breaker.state if self.remote is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "waited_for_other_worker": self.waited,
+            "backend_errors": self.backend_errors,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        if self.remote is not None:
+            await self.remote.close()
+
+def create_prediction_cache(
+    host: Optional[str],
+    port: int = 6379,
+    password: Optional[str] = None,
+    db: int = 0,
+    **kwargs,
+) -> PredictionCache:
+    """
+    Build a PredictionCache on Redis when ``host`` is set and the redis package is installed,
+    otherwise on the in-process backend.
+    """
+    client = None
+    if host:
+        try:
+            import redis.asyncio as redis
+
+            client = redis.Redis(
+                host=host,
+                port=port,
+                password=password or None,
+                db=db,
+                socket_timeout=1.0,
+                socket_connect_timeout=1.0,
+            )
+        except ImportError:
+            logger.warning("redis package not installed, using the in-process prediction cache")
+    return PredictionCache(client, **kwargs)
@@ -2,135 +2,857 @@ import pandas as pd
 import numpy as np
 import os
 import asyncio
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 
 from models.lstm_model import BitcoinLSTMModel
+from models.registry import ModelRegistry
 from utils.technical_indicators import TechnicalIndicators
+from utils.streaming_indicators import StreamingIndicators
 from utils.sentiment_analysis import NewsAnalyzer
-from utils.test_data_generator import generate_mock_bitcoin_data
-from config.constants import SENTIMENT_FEATURES, TECHNICAL_FEATURES, VALID_TIMEFRAMES, DEFAULT_PREDICTION_TIMEFRAME
-from config.environment import MODEL_PATH
+from utils.ohlcv_store import OHLCVStore
+from utils.candle_resampler import CandleResampler
+from utils.test_data_generator import MOCK_START_PRICES, generate_mock_bitcoin_data
+from utils.metrics import track_stage
+from services.snapshot_cache import SnapshotCache
+from services.prediction_cache import create_prediction_cache
+from services.inference_batcher import InferenceBatcher
+from services.sentiment_refresher import SentimentRefresher
+from services.prediction_stream import PredictionBroadcaster
+from services.training_jobs import TrainingJob, TrainingJobManager
+from utils.news_client import AsyncNewsClient, CircuitBreaker
+from config.constants import (
+    CANDLE_RESOLUTIONS,
+    MARKET_DATA_RESOLUTION,
+    SENTIMENT_FEATURES,
+    TECHNICAL_FEATURES,
+    VALID_TIMEFRAMES,
+    DEFAULT_PREDICTION_TIMEFRAME,
+    DEFAULT_SYMBOL,
+    DEFAULT_CONFIDENCE,
+    TRAINING_MODES,
+)
+from config.environment import (
+    MARKET_DATA_DIR,
+    MARKET_DATA_BOOTSTRAP_PERIODS,
+    MARKET_DATA_WINDOW_PERIODS,
+    MARKET_SYMBOLS,
+    RESAMPLE_MAX_BARS,
+    MODEL_PATH,
+    MODEL_VERSION,
+    MODEL_REGISTRY_DIR,
+    MODEL_REGISTRY_KEEP,
+    MODEL_WATCH_INTERVAL_SECONDS,
+    PIPELINE_COMPACT,
+    INFERENCE_BACKEND,
+    TFLITE_MODEL_PATH,
+    TFLITE_QUANTIZATION,
+    TFLITE_NUM_THREADS,
+    TFLITE_MAX_REL_DRIFT,
+    FEATURE_CACHE_TTL_SECONDS,
+    FEATURE_CACHE_MAX_ENTRIES,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    PREDICTION_MC_SAMPLES,
+    PREDICTION_INTERVAL,
+    NEWS_API_URL,
+    NEWS_REFRESH_INTERVAL_SECONDS,
+    NEWS_HTTP_TIMEOUT_SECONDS,
+    NEWS_MAX_RETRIES,
+    NEWS_MAX_CONNECTIONS,
+    NEWS_BREAKER_FAILURE_THRESHOLD,
+    NEWS_BREAKER_RESET_SECONDS,
+    TRAIN_STREAMING,
+    TRAIN_EARLY_STOPPING_PATIENCE,
+    TRAIN_VALIDATION_SPLIT,
+    TRAIN_REPLAY_FRACTION,
+    TRAIN_FINE_TUNE_LEARNING_RATE,
+    TRAIN_SHUFFLE_BUFFER,
+    TRAIN_PREFETCH,
+    TRAINING_JOBS_DIR,
+    TRAIN_WORKER_THREADS,
+    TRAIN_WORKER_NICE,
+    TRAIN_CANCEL_GRACE_SECONDS,
+    TRAIN_DEFAULT_EPOCHS,
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_PASSWORD,
+    REDIS_DB,
+    PREDICTION_CACHE_TTL_SECONDS,
+    PREDICTION_LOCK_TIMEOUT_SECONDS,
+    PREDICTION_LOCK_WAIT_SECONDS,
+    STREAM_POLL_INTERVAL_SECONDS,
+    STREAM_CLIENT_QUEUE_SIZE,
+)
 
 class PredictionService:
     """Service for making Bitcoin price predictions."""
 
     def __init__(self):
-        self.lstm_model = BitcoinLSTMModel()
+        # One output per supported timeframe, expressed in hourly candles
+        self.lstm_model = BitcoinLSTMModel(horizons=VALID_TIMEFRAMES.values())
         self.technical_indicators = TechnicalIndicators()
+        # Hourly candles persisted locally; requests read only the tail they need
+        self.market_data = OHLCVStore(MARKET_DATA_DIR)
+        # Other symbols get a store each, next to the default symbol's partitions
+        self._symbol_stores: Dict[str, OHLCVStore] = {DEFAULT_SYMBOL: self.market_data}
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+        # Coarser bars of each symbol, folded incrementally from the candles as they are ingested
+        self._resamplers: Dict[str, CandleResampler] = {}
+        # Technical indicators of the default symbol's candles, advanced in O(1) per ingested candle.
+        # The history has room for candles ingested while a snapshot window is being read
+        self.indicators = StreamingIndicators(history_size=2 * MARKET_DATA_WINDOW_PERIODS)
+        # Compact mode keeps candles and indicators as float32 columns from the store onwards
+        self.feature_dtype = np.float32 if PIPELINE_COMPACT else None
         self.news_analyzer = NewsAnalyzer()
+        self.sentiment_refresher = SentimentRefresher(
+            self.news_analyzer,
+            AsyncNewsClient(
+                self.news_analyzer.news_api_key,
+                base_url=NEWS_API_URL,
+                timeout=NEWS_HTTP_TIMEOUT_SECONDS,
+                max_retries=NEWS_MAX_RETRIES,
+                max_connections=NEWS_MAX_CONNECTIONS,
+                breaker=CircuitBreaker(NEWS_BREAKER_FAILURE_THRESHOLD, NEWS_BREAKER_RESET_SECONDS),
+            ),
+            interval_seconds=NEWS_REFRESH_INTERVAL_SECONDS,
+        )
+        self.feature_cache = SnapshotCache(
+            ttl_seconds=FEATURE_CACHE_TTL_SECONDS,
+            max_entries=FEATURE_CACHE_MAX_ENTRIES,
+        )
+        self.inference_batcher = InferenceBatcher(
+            self._predict_windows,
+            max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=INFERENCE_MAX_WAIT_MS,
+        )
+        # All horizons come out of one forward pass, cached per (model version, symbol, candle) for every timeframe
+        self.inference_cache = SnapshotCache(
+            ttl_seconds=FEATURE_CACHE_TTL_SECONDS,
+            max_entries=max(FEATURE_CACHE_MAX_ENTRIES, 2 * len(MARKET_SYMBOLS)),
+        )
+        # Finished predictions shared by all workers through Redis (in-process without REDIS_HOST)
+        self.prediction_cache = create_prediction_cache(
+            REDIS_HOST,
+            port=REDIS_PORT,
+            password=REDIS_PASSWORD,
+            db=REDIS_DB,
+            ttl_seconds=PREDICTION_CACHE_TTL_SECONDS,
+            lock_timeout_seconds=PREDICTION_LOCK_TIMEOUT_SECONDS,
+            lock_wait_seconds=PREDICTION_LOCK_WAIT_SECONDS,
+        )
+        # Training runs in a worker process; finished models are swapped in by _deploy_trained_model
+        self.training_jobs = TrainingJobManager(
+            TRAINING_JOBS_DIR,
+            on_complete=self._deploy_trained_model,
+            num_threads=TRAIN_WORKER_THREADS,
+            niceness=TRAIN_WORKER_NICE,
+            cancel_grace_seconds=TRAIN_CANCEL_GRACE_SECONDS,
+        )
 
-        # Load model if it exists
-        if os.path.exists(MODEL_PATH):
-            self.lstm_model.load_model(MODEL_PATH)
-            logger.info("Model loaded successfully from {}", MODEL_PATH)
-        else:
-            logger.warning("No existing model found at {}", MODEL_PATH)
+        # Streaming clients share one update per candle, computed only while someone is subscribed
+        self.stream = PredictionBroadcaster(
+            self._stream_version,
+            self._stream_update,
+            poll_interval_seconds=STREAM_POLL_INTERVAL_SECONDS,
+            queue_size=STREAM_CLIENT_QUEUE_SIZE,
+        )
+
+        # Models are served from the registry and hot-swapped; the previous one stays in memory for rollback
+        self.registry = ModelRegistry(MODEL_REGISTRY_DIR, keep_versions=MODEL_REGISTRY_KEEP)
+        self.model_version: Optional[str] = None
+        self.previous_model: Optional[Tuple[str, BitcoinLSTMModel]] = None
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._registry_watcher: Optional[asyncio.Task] = None
+
+    async def startup(self) -> None:
+        """Load the current registry version and start watching the registry for new ones."""
+        await asyncio.to_thread(self._import_legacy_model)
+        try:
+            await self.reload_model()
+        except ValueError as e:
+            logger.warning("No model loaded: {}", str(e))
+        except Exception as e:
+            logger.error("Error loading model version {}: {}", self.registry.current_version(), str(e))
+
+        if MODEL_WATCH_INTERVAL_SECONDS > 0 and self._registry_watcher is None:
+            self._registry_watcher = asyncio.create_task(self._watch_registry())
+
+    def _import_legacy_model(self) -> None:
+        """Register a model saved at MODEL_PATH (by older releases) when the registry is empty."""
+        if self.registry.versions() or not os.path.exists(MODEL_PATH):
+            return
+        tflite_path = TFLITE_MODEL_PATH if os.path.exists(TFLITE_MODEL_PATH) else None
+        self.registry.publish(MODEL_VERSION, MODEL_PATH, tflite_path, metadata={"source": MODEL_PATH})
+        logger.info("Imported model at {} into the registry as {}", MODEL_PATH, MODEL_VERSION)
+
+    async def reload_model(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Load a registry version in the background, warm it up and swap it in.
+
+        Requests keep being served by the active model while the new one loads; the swap
+        itself is a single reference assignment, so no request is dropped.
+
+        Args:
+            version: Version to activate (defaults to the manifest's current version)
+
+        Returns:
+            Information about the active model
+
+        Raises:
+            ValueError: If the version is not registered
+        """
+        self._reload_lock = self._reload_lock or asyncio.Lock()
+        async with self._reload_lock:
+            version = version or self.registry.current_version()
+            if version is None:
+                raise ValueError(f"No model registered in {self.registry.root}")
+            if not self.registry.has_version(version):
+                raise ValueError(f"Unknown model version {version}")
+
+            if version != self.model_version:
+                model = await asyncio.to_thread(self._load_version, version)
+                self._activate(version, model)
+            if self.registry.current_version() != version:
+                await asyncio.to_thread(self.registry.set_current, version)
+            return self.model_info()
+
+    def _load_version(self, version: str) -> BitcoinLSTMModel:
+        """Load a registered version and run a dummy inference so its first request is not slow."""
+        model = BitcoinLSTMModel(horizons=VALID_TIMEFRAMES.values())
+        model.load_model(self.registry.model_path(version))
 
-    async def get_bitcoin_data(self) -> pd.DataFrame:
-        """Fetch Bitcoin price data from an API."""
+        if INFERENCE_BACKEND == "tflite":
+            tflite_path = self.registry.tflite_path(version)
+            if os.path.exists(tflite_path):
+                model.load_tflite(tflite_path, num_threads=TFLITE_NUM_THREADS)
+            else:
+                logger.warning("Model version {} has no TFLite artifact, using the Keras backend", version)
+
+        model.predict_batch(np.zeros((1, model.sequence_length, 1), dtype=np.float32))
+        return model
+
+    def _activate(self, version: str, model: BitcoinLSTMModel) -> None:
+        if self.model_version is not None:
+            self.previous_model = (self.model_version, self.lstm_model)
+        # Symbol scalers only depend on price history: keep them so that requests fitted against
+        # the outgoing model never reach the batch without one
+        for symbol, scaler in self.lstm_model.symbol_scalers.items():
+            model.symbol_scalers.setdefault(symbol, scaler)
+        self.lstm_model = model
+        self.model_version = version
+        self.inference_cache.invalidate()
+        logger.info("Model version {} is now serving predictions", version)
+
+    async def rollback_model(self) -> Dict[str, Any]:
+        """
+        Swap back to the previously active model, which is still held in memory.
+
+        Raises:
+            ValueError: If no previous model has been loaded
+        """
+        self._reload_lock = self._reload_lock or asyncio.Lock()
+        async with self._reload_lock:
+            if self.previous_model is None:
+                raise ValueError("No previous model version to roll back to")
+            version, model = self.previous_model
+            self._activate(version, model)
+            if self.registry.has_version(version):
+                await asyncio.to_thread(self.registry.set_current, version)
+            return self.model_info()
+
+    async def _watch_registry(self) -> None:
+        """Hot-swap whenever the manifest points at a version other than the active one."""
+        last_mtime = None
+        while True:
+            await asyncio.sleep(MODEL_WATCH_INTERVAL_SECONDS)
+            mtime = self.registry.manifest_mtime()
+            if mtime == last_mtime:
+                continue
+            last_mtime = mtime
+            current = self.registry.current_version()
+            if current is not None and current != self.model_version:
+                try:
+                    await self.reload_model(current)
+                except Exception as e:
+                    logger.error("Error hot-swapping to model version {}: {}", current, str(e))
+
+    def model_info(self) -> Dict[str, Any]:
+        """Describe the active model and the registered versions."""
+        return {
+            "version": self.model_version,
+            "previous_version": self.previous_model[0] if self.previous_model else None,
+            "backend": "tflite" if self.lstm_model.runtime is not None else "keras",
+            "horizons": list(self.lstm_model.horizons),
+            "registry": self.registry.manifest(),
+        }
+
+    def market_store(self, symbol: str = DEFAULT_SYMBOL) -> OHLCVStore:
+        """Return the candle store of a symbol."""
+        if symbol not in self._symbol_stores:
+            self._symbol_stores[symbol] = OHLCVStore(os.path.join(MARKET_DATA_DIR, symbol))
+        return self._symbol_stores[symbol]
+
+    async def get_bitcoin_data(
+        self,
+        periods: Optional[int] = None,
+        days: Optional[float] = None,
+        symbol: str = DEFAULT_SYMBOL,
+    ) -> pd.DataFrame:
+        """
+        Read Bitcoin candles (or another symbol's) from the local market data store.
+
+        Args:
+            periods: Number of latest hourly candles to return (default MARKET_DATA_WINDOW_PERIODS)
+            days: Return every candle of the last ``days`` days instead
+            symbol: Symbol whose candles to read
+        """
         try:
-            # TODO: Replace with actual API call
-            df = generate_mock_bitcoin_data()
-            logger.info("Bitcoin price data fetched successfully")
+            with track_stage("market_data"):
+                await self._sync_market_data(symbol)
+                store = self.market_store(symbol)
+                if days is not None:
+                    latest = store.last_timestamp()
+                    df = await asyncio.to_thread(
+                        store.read, start=latest - timedelta(days=days), dtype=self.feature_dtype
+                    )
+                else:
+                    df = await asyncio.to_thread(
+                        store.tail, periods or MARKET_DATA_WINDOW_PERIODS, dtype=self.feature_dtype
+                    )
+            logger.info("{} price data fetched successfully", symbol)
             return df
         except Exception as e:
-            logger.error("Error fetching Bitcoin data: {}", str(e))
+            logger.error("Error fetching {} data: {}", symbol, str(e))
             return pd.DataFrame()
 
-    async def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare features for model training and prediction."""
+    async def _sync_market_data(self, symbol: str = DEFAULT_SYMBOL) -> None:
+        """Ingest the candles missing up to the current hour (a no-op when the store is current)."""
+        # Align to the hour so the latest candle timestamp is stable within a candle
+        now = pd.Timestamp(datetime.utcnow()).floor("H")
+        store = self.market_store(symbol)
+        last = store.last_timestamp()
+        if last is not None and last >= now and self._derived_current(symbol, last):
+            return
+
+        if symbol not in self._sync_locks:
+            self._sync_locks[symbol] = asyncio.Lock()
+        async with self._sync_locks[symbol]:
+            last = store.last_timestamp()
+            if last is None or last < now:
+                await asyncio.to_thread(self._ingest_candles, last, now, symbol)
+            await asyncio.to_thread(self._update_bars, symbol)
+            if symbol == DEFAULT_SYMBOL:
+                await asyncio.to_thread(self._update_indicators)
+
+    def _derived_current(self, symbol: str, last: pd.Timestamp) -> bool:
+        """Whether the bars (and, for the default symbol, the indicators) have absorbed ``last``."""
+        resampler = self._resamplers.get(symbol)
+        if resampler is None or resampler.last_timestamp != last:
+            return False
+        return symbol != DEFAULT_SYMBOL or self.indicators.last_timestamp == last
+
+    def _update_bars(self, symbol: str = DEFAULT_SYMBOL) -> None:
+        """Fold the stored candles the symbol's resampler has not seen yet into its bars."""
+        store = self.market_store(symbol)
+        resampler = self._resamplers.get(symbol)
+        if resampler is None:
+            resampler = CandleResampler(MARKET_DATA_RESOLUTION, max_bars=RESAMPLE_MAX_BARS)
+            # Seed with enough history to fill the coarsest resolution
+            periods = RESAMPLE_MAX_BARS * max(CANDLE_RESOLUTIONS.values()) // CANDLE_RESOLUTIONS[MARKET_DATA_RESOLUTION]
+            resampler.append(store.tail(periods))
+            self._resamplers[symbol] = resampler
+        elif resampler.last_timestamp is not None:
+            resampler.append(store.read(start=resampler.last_timestamp + pd.Timedelta(1, "ns")))
+
+    def _update_indicators(self) -> None:
+        """Feed the default symbol's stored candles the indicator engine has not seen yet."""
+        # The first call streams the whole history, so every worker derives the same running
+        # state (OBV is a running sum) regardless of when it started
+        last = self.indicators.last_timestamp
+        start = None if last is None else last + pd.Timedelta(1, "ns")
+        rows = len(self.indicators.append(self.market_data.read(start=start, columns=["close", "volume"])))
+        if last is None:
+            logger.info("Streaming indicators seeded from {} candles", rows)
+
+    async def get_candles(
+        self, resolution: str, periods: Optional[int] = None, symbol: str = DEFAULT_SYMBOL
+    ) -> pd.DataFrame:
+        """
+        Return the latest OHLCV bars of a resolution, aggregated from the stored candles.
+
+        Args:
+            resolution: Bar interval, a key of CANDLE_RESOLUTIONS at or above MARKET_DATA_RESOLUTION
+            periods: Number of bars to return (default MARKET_DATA_WINDOW_PERIODS)
+            symbol: Symbol whose bars to read
+
+        Raises:
+            ValueError: If the resolution is not maintained
+        """
+        with track_stage("market_data"):
+            await self._sync_market_data(symbol)
+            return self._resamplers[symbol].bars(resolution, periods or MARKET_DATA_WINDOW_PERIODS)
+
+    def _ingest_candles(self, last: Optional[pd.Timestamp], now: pd.Timestamp, symbol: str = DEFAULT_SYMBOL) -> None:
+        # Candles come from the mock generator; an exchange feed would be fetched here instead.
+        # Other workers may append the same hours concurrently, and the store keeps whichever lands first
+        store = self.market_store(symbol)
+        if last is None:
+            df = generate_mock_bitcoin_data(
+                periods=MARKET_DATA_BOOTSTRAP_PERIODS, start_price=MOCK_START_PRICES.get(symbol, 100.0), end_date=now
+            )
+        else:
+            # Continue the series from the last stored close
+            last_close = store.tail(1, columns=["close"])["close"].iloc[-1]
+            periods = int((now - last) / timedelta(hours=1))
+            df = generate_mock_bitcoin_data(periods=periods, start_price=last_close, end_date=now)
+        rows = store.append(df)
+        logger.info("Ingested {} {} candles up to {}", rows, symbol, now)
+
+    async def prepare_features(self, df: pd.DataFrame, indicators: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Prepare features for model training and prediction.
+
+        Args:
+            df: Candles, oldest first
+            indicators: Technical feature rows for the candles of ``df`` (same index), as kept by
+                the streaming engine; computed in batch from ``df`` when omitted
+        """
         if df.empty:
             raise ValueError("Received empty DataFrame in prepare_features")
 
-        # Compute technical indicators asynchronously
-        df = await asyncio.to_thread(self.technical_indicators.calculate_indicators, df)
+        with track_stage("indicators"):
+            if indicators is None:
+                # Compute technical indicators asynchronously
+                df = await asyncio.to_thread(
+                    self.technical_indicators.calculate_indicators, df, self.feature_dtype
+                )
+            else:
+                # Warm-up gaps are filled like the batch path fills them
+                for column in TECHNICAL_FEATURES:
+                    values = indicators[column].ffill().bfill()
+                    df[column] = values if self.feature_dtype is None else values.astype(self.feature_dtype)
 
         # Fetch and aggregate sentiment data asynchronously
-        sentiment = await asyncio.to_thread(self._get_sentiment_scores)
+        with track_stage("sentiment"):
+            sentiment = await self._get_sentiment_scores()
 
-        # Add sentiment features to each row
-        for col in SENTIMENT_FEATURES:
-            df[f"sentiment_{col}"] = sentiment.get(col, 0.0)
+        if PIPELINE_COMPACT:
+            # The scores are the same for every row, so keep them once instead of as columns
+            df.attrs["sentiment"] = {col: float(sentiment.get(col, 0.0)) for col in SENTIMENT_FEATURES}
+        else:
+            # Add sentiment features to each row
+            for col in SENTIMENT_FEATURES:
+                df[f"sentiment_{col}"] = sentiment.get(col, 0.0)
 
         logger.info("Features prepared successfully")
         return df
 
-    async def _get_sentiment_scores(self) -> Dict[str, float]:
-        """Fetch sentiment scores for Bitcoin-related news."""
-        articles = await asyncio.to_thread(self.news_analyzer.get_crypto_news, days=1)
-        return await asyncio.to_thread(self.news_analyzer.get_aggregated_sentiment, articles)
+    async def get_feature_snapshot(self, resolution: str = MARKET_DATA_RESOLUTION) -> pd.DataFrame:
+        """
+        Return the prepared feature frame for the latest candle.
 
-    async def train_model(self, days: int = 30) -> Dict[str, Any]:
-        """Train the LSTM model using recent Bitcoin data."""
-        df = await self.get_bitcoin_data()
-        if df.empty:
-            return {"message": "Training aborted: No data available"}
+        Features are computed once per candle and shared by every caller; concurrent
+        requests for a candle that is not cached yet wait on a single computation.
+        The returned frame is shared and must be treated as read-only.
+
+        Args:
+            resolution: Bar interval of the frame; coarser ones are read pre-aggregated
+                from the resampler and cached per (resolution, latest candle)
+        """
+        if resolution == MARKET_DATA_RESOLUTION:
+            df = await self.get_bitcoin_data()
+            if df.empty:
+                return df
+            key = df["timestamp"].iloc[-1]
+        else:
+            df = await self.get_candles(resolution)
+            if df.empty:
+                return df
+            if self.feature_dtype is not None:
+                df = df.astype({col: self.feature_dtype for col in df.columns if col != "timestamp"})
+            # The newest coarse bar changes with every candle, so key on the latest candle
+            key = (resolution, self._resamplers[DEFAULT_SYMBOL].last_timestamp)
 
-        df = await self.prepare_features(df)
+        async def compute() -> pd.DataFrame:
+            # Base candles read the indicators the streaming engine advanced at ingestion;
+            # coarser bars change with every candle and are computed in batch
+            indicators = self._streamed_indicators(df) if resolution == MARKET_DATA_RESOLUTION else None
+            return await self.prepare_features(df, indicators)
 
-        # Prepare features and target
-        feature_columns = TECHNICAL_FEATURES + [f"sentiment_{f}" for f in SENTIMENT_FEATURES]
-        X = df[feature_columns].values
-        y = df["close"].values
+        return await self.feature_cache.get_or_compute(key, compute)
 
-        # Train model
-        history = await asyncio.to_thread(self.lstm_model.train, X, y)
+    def _streamed_indicators(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Rows of the streaming engine for the candles of ``df``, or None if it has not absorbed
+        all of them (e.g. the last sync failed), in which case they are computed in batch.
+        """
+        history = self.indicators.history().set_index("timestamp")
+        if not df["timestamp"].isin(history.index).all():
+            return None
+        return history.reindex(df["timestamp"]).set_index(df.index)
 
-        # Save trained model
-        os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-        await asyncio.to_thread(self.lstm_model.save_model, MODEL_PATH)
-        logger.info("Model trained and saved successfully")
+    @staticmethod
+    def _feature_sentiment(df: pd.DataFrame) -> Dict[str, float]:
+        """Return the sentiment of the latest row of a prepared feature frame."""
+        if "sentiment" in df.attrs:
+            return dict(df.attrs["sentiment"])
+        return {col: float(df[f"sentiment_{col}"].iloc[-1]) for col in SENTIMENT_FEATURES}
 
+    async def current_indicators(self, resolution: str = MARKET_DATA_RESOLUTION) -> Optional[Dict[str, Any]]:
+        """Return the technical indicators and sentiment of the latest bar, or None without data."""
+        df = await self.get_feature_snapshot(resolution)
+        if df.empty:
+            return None
+
+        latest = df.iloc[-1]
         return {
-            "message": "Model trained successfully",
-            "history": history.history,
+            "timestamp": latest["timestamp"].isoformat(),
+            "technical_indicators": {
+                col: float(latest[col]) for col in self.technical_indicators.get_feature_columns()
+            },
+            "sentiment": self._feature_sentiment(df),
         }
 
+    async def _get_sentiment_scores(self) -> Dict[str, float]:
+        """Fetch sentiment scores for Bitcoin-related news (kept warm by the background refresher)."""
+        return await self.sentiment_refresher.get_sentiment()
+
+    async def train_model(
+        self, days: int = 30, epochs: int = TRAIN_DEFAULT_EPOCHS, mode: str = "full"
+    ) -> Dict[str, Any]:
+        """
+        Start training the LSTM model on recent Bitcoin data in a worker process.
+
+        Returns immediately with the job status; an identical request made while the job
+        is running returns the same job.
+
+        Args:
+            days: Days of history to train on (for "incremental", the pool replay windows come from)
+            epochs: Maximum epochs; early stopping may end the run sooner
+            mode: "full" trains new weights, "incremental" fine-tunes the active model on the
+                candles after the ones it was trained on
+
+        Raises:
+            ValueError: If the mode is unknown, or "incremental" has no model trained by the service
+                or no candles newer than the ones it was trained on
+        """
+        if mode not in TRAINING_MODES:
+            raise ValueError(f"Invalid training mode. Must be one of: {', '.join(TRAINING_MODES)}")
+        params = {
+            "mode": mode,
+            "days": days,
+            "epochs": epochs,
+            "sequence_length": self.lstm_model.sequence_length,
+            "config": self.lstm_model.config.to_dict(),
+            "horizons": sorted(VALID_TIMEFRAMES.values()),
+            "streaming": TRAIN_STREAMING,
+            "shuffle_buffer": TRAIN_SHUFFLE_BUFFER,
+            "prefetch": TRAIN_PREFETCH,
+            "tflite": INFERENCE_BACKEND == "tflite",
+            "tflite_quantization": TFLITE_QUANTIZATION,
+            "patience": TRAIN_EARLY_STOPPING_PATIENCE,
+            "validation_split": TRAIN_VALIDATION_SPLIT,
+        }
+        if mode == "incremental":
+            trained_until = (self.lstm_model.training_info or {}).get("trained_until")
+            if self.model_version is None or trained_until is None:
+                raise ValueError("Incremental training needs an active model trained by the service")
+            # Refuse up front rather than start a worker that can only fail with nothing to learn
+            try:
+                await self._sync_market_data()
+            except Exception as e:
+                logger.error("Error syncing Bitcoin data: {}", str(e))
+            last_candle = self.market_data.last_timestamp()
+            if last_candle is None or last_candle <= pd.Timestamp(trained_until):
+                raise ValueError(f"No candles newer than {trained_until} to fine-tune on")
+            params.update({
+                "base_version": self.model_version,
+                "base_model_path": self.registry.model_path(self.model_version),
+                "trained_until": trained_until,
+                "replay_fraction": TRAIN_REPLAY_FRACTION,
+                "learning_rate": TRAIN_FINE_TUNE_LEARNING_RATE,
+            })
+
+        async def load_prices() -> Dict[str, np.ndarray]:
+            # Every training sample needs a full input window plus the longest horizon ahead of it
+            lookaround = params["sequence_length"] + max(params["horizons"])
+            df = await self.get_bitcoin_data(days=days + lookaround / 24)
+            if df.empty:
+                raise ValueError("Training aborted: No data available")
+            # The LSTM is trained on the closing price series
+            return {"timestamp": df["timestamp"].to_numpy(), "close": df["close"].to_numpy()}
+
+        job = await self.training_jobs.submit(params, load_prices)
+        return job.to_dict()
+
+    async def _deploy_trained_model(self, job: TrainingJob) -> None:
+        """Register the model a training job produced and hot-swap it in."""
+        report = job.result.get("training") or {}
+        if report.get("mode") == "incremental":
+            logger.info(
+                "Fine-tuned on {} new + {} replayed windows in {}s over {} epochs "
+                "(full retraining estimated at {}s, {}s saved)",
+                report["new_windows"], report["replay_windows"], report["wall_seconds"],
+                report["epochs_run"], report["estimated_full_seconds"], report["time_saved_seconds"],
+            )
+        version = f"{datetime.utcnow():%Y%m%d-%H%M%S}-{job.id[:8]}"
+        await asyncio.to_thread(self._publish_job_model, version, job)
+        await self.reload_model(version)
+
+    def _publish_job_model(self, version: str, job: TrainingJob) -> None:
+        tflite_path = None
+        tflite = job.result.get("tflite")
+        if tflite is not None:
+            logger.info("TFLite model exported ({} bytes), drift vs Keras: {}", tflite["size"], tflite["drift"])
+            if tflite["drift"]["max_rel_error"] > TFLITE_MAX_REL_DRIFT:
+                logger.warning(
+                    "TFLite drift {:.4f} exceeds {:.4f}, keeping the Keras backend",
+                    tflite["drift"]["max_rel_error"], TFLITE_MAX_REL_DRIFT,
+                )
+            else:
+                tflite_path = tflite["path"]
+
+        self.registry.publish(
+            version,
+            job.result["model_path"],
+            tflite_path,
+            metadata={
+                "training_job": job.id,
+                "params": job.params,
+                "loss": job.loss,
+                "val_loss": job.val_loss,
+                "training": job.result.get("training"),
+                "tflite_drift": tflite["drift"] if tflite else None,
+            },
+            activate=False,
+        )
+
     async def predict(self, timeframe: str = DEFAULT_PREDICTION_TIMEFRAME) -> Dict[str, Any]:
         """Make price predictions based on the latest Bitcoin data."""
         if timeframe not in VALID_TIMEFRAMES:
             raise ValueError(f"Invalid timeframe. Must be one of: {list(VALID_TIMEFRAMES.keys())}")
 
-        df = await self.get_bitcoin_data()
-        if df.empty:
+        try:
+            await self._sync_market_data()
+        except Exception as e:
+            logger.error("Error syncing Bitcoin data: {}", str(e))
+        last_candle = self.market_data.last_timestamp()
+        if last_candle is None:
             return {"message": "Prediction aborted: No data available"}
 
-        df = await self.prepare_features(df)
+        # Results are shared across workers until the next candle or model version
+        model_version = self.model_version
+        return await self.prediction_cache.get_or_compute(
+            f"{model_version}:{timeframe}:{last_candle.isoformat()}",
+            lambda: self._compute_prediction(timeframe, model_version),
+        )
 
-        # Prepare features
-        feature_columns = TECHNICAL_FEATURES + [f"sentiment_{f}" for f in SENTIMENT_FEATURES]
-        X = df[feature_columns].values
-        current_price = df["close"].iloc[-1]
+    async def _stream_version(self) -> Optional[Tuple[Optional[str], pd.Timestamp]]:
+        """Key of the data a stream update depends on: the model version and the latest candle."""
+        await self._sync_market_data()
+        last_candle = self.market_data.last_timestamp()
+        if last_candle is None:
+            return None
+        return self.model_version, last_candle
 
-        # Run prediction asynchronously
-        predicted_price = await asyncio.to_thread(self.lstm_model.predict, X)
-        logger.info("Price prediction completed successfully")
+    async def _stream_update(self) -> Dict[str, Any]:
+        """Build the message pushed to streaming clients: every timeframe plus the indicators."""
+        predictions = {}
+        for timeframe in VALID_TIMEFRAMES:
+            predictions[timeframe] = await self.predict(timeframe)
+        return {
+            "type": "prediction",
+            "data": {
+                "model_version": self.model_version,
+                "predictions": predictions,
+                "indicators": await self.current_indicators(),
+            },
+        }
 
-        # Calculate prediction metrics
-        price_change = ((predicted_price - current_price) / current_price) * 100
-        confidence = self._calculate_confidence(df, predicted_price)
+    async def predict_symbols(self, timeframe: str, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Predict the price of several symbols for one timeframe.
 
+        Symbols are predicted concurrently, so their windows reach the inference batcher
+        together and share one forward pass. Only the closing prices are needed: unlike
+        ``predict``, no indicators or news sentiment are computed per symbol.
+
+        Returns:
+            Per-symbol predictions, and the error of each symbol that could not be predicted
+        """
+        if timeframe not in VALID_TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe. Must be one of: {list(VALID_TIMEFRAMES.keys())}")
+
+        model_version = self.model_version
+        results = await asyncio.gather(
+            *(self._predict_symbol(timeframe, symbol, model_version) for symbol in symbols),
+            return_exceptions=True,
+        )
+        predictions, errors = {}, {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error("Error predicting {}: {}", symbol, str(result))
+                errors[symbol] = str(result)
+            else:
+                predictions[symbol] = result
         return {
             "timestamp": datetime.utcnow().isoformat(),
             "timeframe": timeframe,
+            "model_version": model_version,
+            "predictions": predictions,
+            "errors": errors,
+        }
+
+    async def _predict_symbol(self, timeframe: str, symbol: str, model_version: Optional[str]) -> Dict[str, Any]:
+        await self._sync_market_data(symbol)
+        last_candle = self.market_store(symbol).last_timestamp()
+        if last_candle is None:
+            raise ValueError("No data available")
+        # Fitting reads the symbol's whole history, so it happens here rather than inside the
+        # shared micro-batch, where it would stall (or fail) the other symbols' rows
+        model = self.lstm_model
+        if symbol != DEFAULT_SYMBOL and symbol not in model.symbol_scalers:
+            await asyncio.to_thread(self._fit_symbol_scalers, model, [symbol])
+        return await self.prediction_cache.get_or_compute(
+            f"{model_version}:{symbol}:{timeframe}:{last_candle.isoformat()}",
+            lambda: self._compute_symbol_prediction(timeframe, symbol, model_version),
+        )
+
+    async def _compute_symbol_prediction(
+        self, timeframe: str, symbol: str, model_version: Optional[str]
+    ) -> Dict[str, Any]:
+        sequence_length = self.lstm_model.sequence_length
+        # A small memory-mapped slice, read inline so that every symbol of a request reaches
+        # the inference batcher within the same batching window
+        df = self.market_store(symbol).tail(sequence_length, ["close"])
+        if df.empty:
+            raise ValueError("No data available")
+
+        estimate = await self.inference_cache.get_or_compute(
+            (model_version, symbol, df["timestamp"].iloc[-1]), lambda: self._run_inference(df, symbol)
+        )
+        return {
+            "candle": df["timestamp"].iloc[-1].isoformat(),
+            **self._estimate_fields(estimate, timeframe, df["close"].iloc[-1]),
+        }
+
+    def _estimate_fields(self, estimate: Dict[str, np.ndarray], timeframe: str, current_price: float) -> Dict[str, Any]:
+        """
+        Price, change, confidence and interval fields of a prediction for one timeframe.
+
+        Without Monte Carlo samples (disabled, or no Keras model loaded) the interval is None.
+        """
+        # Index with the horizons of the model that made the estimate, which may have been swapped out since
+        column = BitcoinLSTMModel.horizon_column(estimate["horizons"], VALID_TIMEFRAMES[timeframe])
+        estimate = {key: float(values[column]) for key, values in estimate.items() if key != "horizons"}
+        predicted_price = estimate["prediction"]
+
+        # Calculate prediction metrics
+        price_change = ((predicted_price - current_price) / current_price) * 100
+        with track_stage("confidence"):
+            confidence = self._calculate_confidence(estimate)
+
+        interval = None
+        if "std" in estimate:
+            interval = {
+                "lower": estimate["lower"],
+                "upper": estimate["upper"],
+                "level": PREDICTION_INTERVAL,
+                "std": estimate["std"],
+                "samples": PREDICTION_MC_SAMPLES,
+            }
+        return {
             "current_price": float(current_price),
             "predicted_price": float(predicted_price),
             "price_change_percent": float(price_change),
             "confidence": confidence,
+            "prediction_interval": interval,
+        }
+
+    async def _compute_prediction(self, timeframe: str, model_version: Optional[str]) -> Dict[str, Any]:
+        df = await self.get_feature_snapshot()
+        if df.empty:
+            raise ValueError("Prediction aborted: No data available")
+
+        estimate = await self.inference_cache.get_or_compute(
+            (model_version, DEFAULT_SYMBOL, df["timestamp"].iloc[-1]), lambda: self._run_inference(df)
+        )
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "timeframe": timeframe,
+            "model_version": model_version,
+            **self._estimate_fields(estimate, timeframe, df["close"].iloc[-1]),
             "technical_indicators": {
                 col: float(df[col].iloc[-1]) for col in TECHNICAL_FEATURES
             },
-            "sentiment": {
-                col: float(df[f"sentiment_{col}"].iloc[-1]) for col in SENTIMENT_FEATURES
-            },
+            "sentiment": self._feature_sentiment(df),
         }
 
-    def _calculate_confidence(self, df: pd.DataFrame, predicted_price: float) -> float:
+    async def _run_inference(self, df: pd.DataFrame, symbol: str = DEFAULT_SYMBOL) -> Dict[str, np.ndarray]:
+        """Predict every horizon, with its uncertainty, for the latest window of closing prices."""
+        sequence_length = self.lstm_model.sequence_length
+        if len(df) < sequence_length:
+            raise ValueError(f"Need at least {sequence_length} data points to predict")
+
+        # Concurrent requests share a single batched forward pass
+        with track_stage("inference"):
+            predictions = await self.inference_batcher.submit(df["close"].values[-sequence_length:], symbol)
+        logger.info("Price prediction completed successfully")
+        return predictions
+
+    def _predict_windows(self, windows: np.ndarray, symbols: List[str]) -> List[Dict[str, np.ndarray]]:
         """
-        Calculate confidence score for the prediction.
-        This is a placeholder implementation.
+        Scale and predict a batch of raw price windows of any symbols, one estimate per window.
+
+        Each estimate carries the horizons of the model that produced it, which its columns follow.
+        """
+        # Resolve the model once so a whole batch is scaled and run by the same version during a swap
+        model = self.lstm_model
+        with track_stage("forward_pass"):
+            estimate = model.predict_with_uncertainty(
+                model.scale_windows(windows, symbols),
+                samples=PREDICTION_MC_SAMPLES,
+                interval=PREDICTION_INTERVAL,
+                symbols=symbols,
+            )
+        return [
+            {"horizons": model.horizons, **{key: values[i] for key, values in estimate.items()}}
+            for i in range(len(windows))
+        ]
+
+    def _fit_symbol_scalers(self, model: BitcoinLSTMModel, symbols: List[str]) -> None:
+        """Fit the normalization of symbols the model has none for on their stored history."""
+        for symbol in set(symbols) - {DEFAULT_SYMBOL} - set(model.symbol_scalers):
+            closes = self.market_store(symbol).read(columns=["close"])["close"].values
+            if len(closes) == 0:
+                raise ValueError(f"No {symbol} data to fit its scaler on")
+            model.fit_symbol_scaler(symbol, closes)
+            logger.info("Fitted {} scaler on {} candles", symbol, len(closes))
+
+    @staticmethod
+    def _calculate_confidence(estimate: Dict[str, float]) -> float:
         """
-        # TODO: Implement actual confidence calculation based on model metrics
-        return 0.8
+        Confidence score of a prediction: one minus the relative half-width of its interval.
+
+        A prediction whose Monte Carlo dropout interval spans +/-5% of the predicted price
+        scores 0.95; intervals wider than the price itself score 0. Predictions without an
+        interval get DEFAULT_CONFIDENCE.
+        """
+        if "lower" not in estimate:
+            return DEFAULT_CONFIDENCE
+        half_width = (estimate["upper"] - estimate["lower"]) / 2
+        return float(np.clip(1 - half_width / abs(estimate["prediction"]), 0.0, 1.0))
+
+    async def shutdown(self) -> None:
+        """Stop background tasks and release pooled resources."""
+        if self._registry_watcher is not None:
+            self._registry_watcher.cancel()
+            self._registry_watcher = None
+        await self.stream.close()
+        await self.training_jobs.shutdown()
+        await self.sentiment_refresher.stop()
+        await self.inference_batcher.close()
+        await self.prediction_cache.close()
+        await asyncio.to_thread(self.news_analyzer.close)
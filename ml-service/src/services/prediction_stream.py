@@ -0,0 +1,182 @@
+"""
+Push-based fan-out of prediction updates to streaming (WebSocket / SSE) subscribers.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from loguru import logger
+
+from utils.metrics import STREAM_MESSAGES, STREAM_SUBSCRIBERS
+
+class Subscription:
+    """
+    One connected client: a bounded queue of pending messages.
+
+    When the client reads slower than updates arrive, the oldest pending message is
+    dropped, so a slow client only ever lags by ``queue_size`` messages and never holds
+    back the broadcaster or the other clients.
+    """
+
+    def __init__(self, transport: str, queue_size: int):
+        self.transport = transport
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.connected_at = time.monotonic()
+        self.delivered = 0
+        self.dropped = 0
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        """Enqueue a message without blocking, dropping the oldest pending one when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            STREAM_MESSAGES.labels(self.transport, "dropped").inc()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next message
+
+        Returns:
+            The message, or None if ``timeout`` elapsed first
+        """
+        if self.queue.empty():
+            try:
+                message = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        else:
+            message = self.queue.get_nowait()
+        self.delivered += 1
+        STREAM_MESSAGES.labels(self.transport, "sent").inc()
+        return message
+
+class PredictionBroadcaster:
+    """
+    Computes an update once per new version of the data and pushes it to every subscriber.
+
+    A single poll loop checks ``version_fn`` (e.g. the latest candle and model version)
+    every ``poll_interval_seconds``; when it changes, ``update_fn`` runs once and its
+    result is offered to each subscriber's queue. The cost therefore follows the candle
+    rate rather than the number of clients. The loop only runs while someone is
+    subscribed, and new subscribers receive the latest update right away.
+    """
+
+    def __init__(
+        self,
+        version_fn: Callable[[], Awaitable[Optional[Hashable]]],
+        update_fn: Callable[[], Awaitable[Dict[str, Any]]],
+        poll_interval_seconds: float = 5.0,
+        queue_size: int = 8,
+    ):
+        self.version_fn = version_fn
+        self.update_fn = update_fn
+        self.poll_interval_seconds = poll_interval_seconds
+        self.queue_size = queue_size
+
+        self.subscribers: Set[Subscription] = set()
+        self.latest: Optional[Dict[str, Any]] = None
+        self._latest_version: Optional[Hashable] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._connections_total = 0
+        # Delivery counters of clients that have already disconnected
+        self._delivered_closed = 0
+        self._dropped_closed = 0
+        self._updates = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._last_update_seconds: Optional[float] = None
+
+    def subscribe(self, transport: str) -> Subscription:
+        """Register a client and start the poll loop if it is the first one."""
+        subscription = Subscription(transport, self.queue_size)
+        if self.latest is not None:
+            subscription.offer(self.latest)
+        self.subscribers.add(subscription)
+        self._connections_total += 1
+        STREAM_SUBSCRIBERS.labels(transport).inc()
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+        logger.info("Stream subscriber connected over {} ({} connected)", transport, len(self.subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a client; the poll loop stops with the last one."""
+        if subscription not in self.subscribers:
+            return
+        self.subscribers.discard(subscription)
+        self._delivered_closed += subscription.delivered
+        self._dropped_closed += subscription.dropped
+        STREAM_SUBSCRIBERS.labels(subscription.transport).dec()
+        if not self.subscribers and self._loop_task is not None:
+            self._loop_task.cancel()
+            self._loop_task = None
+        logger.info(
+            "Stream subscriber disconnected from {} after {} messages ({} dropped, {} connected)",
+            subscription.transport, subscription.delivered, subscription.dropped, len(self.subscribers),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                self._failures += 1
+                self._last_error = str(e)
+                logger.error("Error computing stream update: {}", str(e))
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def poll(self) -> bool:
+        """
+        Compute and broadcast an update if the version changed since the last one
+
+        Returns:
+            Whether an update was broadcast
+        """
+        version = await self.version_fn()
+        if version is None or version == self._latest_version:
+            return False
+
+        started = time.perf_counter()
+        update = await self.update_fn()
+        self._last_update_seconds = time.perf_counter() - started
+        self._latest_version = version
+        self._updates += 1
+        self._last_error = None
+        self.publish(update)
+        return True
+
+    def publish(self, message: Dict[str, Any]) -> None:
+        """Offer a message to every subscriber (never blocks on slow clients)."""
+        self.latest = message
+        for subscription in list(self.subscribers):
+            subscription.offer(message)
+
+    async def close(self) -> None:
+        """Stop the poll loop; connected handlers end when their transport closes."""
+        if self._loop_task is not None and not self._loop_task.done():
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+        self._loop_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection counts and per-client delivery counters."""
+        by_transport: Dict[str, int] = {}
+        for subscription in self.subscribers:
+            by_transport[subscription.transport] = by_transport.get(subscription.transport, 0) + 1
+        return {
+            "subscribers": len(self.subscribers),
+            "subscribers_by_transport": by_transport,
+            "connections_total": self._connections_total,
+            "updates": self._updates,
+            "failures": self._failures,
+            "last_error": self._last_error,
+            "last_update_seconds": self._last_update_seconds,
+            "version": str(self._latest_version) if self._latest_version is not None else None,
+            "messages_delivered": self._delivered_closed + sum(s.delivered for s in self.subscribers),
+            "messages_dropped": self._dropped_closed + sum(s.dropped for s in self.subscribers),
+            "max_pending": max((s.queue.qsize() for s in self.subscribers), default=0),
+        }
@@ -0,0 +1,121 @@
+"""
+Background refresher keeping the aggregated news sentiment warm.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from utils.news_client import AsyncNewsClient
+from utils.sentiment_analysis import NewsAnalyzer
+
+class SentimentRefresher:
+    """
+    Periodically fetches and scores news so request handlers can read sentiment instantly.
+
+    Readers always get the last good aggregate (stale-while-revalidate); when the upstream is
+    slow or down the previous value keeps being served and the failure is recorded.
+    """
+
+    def __init__(
+        self,
+        news_analyzer: NewsAnalyzer,
+        client: AsyncNewsClient,
+        interval_seconds: float = 300.0,
+        initial_wait_seconds: float = 5.0,
+        days: int = 1,
+    ):
+        self.news_analyzer = news_analyzer
+        self.client = client
+        self.interval_seconds = interval_seconds
+        self.initial_wait_seconds = initial_wait_seconds
+        self.days = days
+
+        self.sentiment: Optional[Dict[str, float]] = None
+        self.updated_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        # First refresh after startup, and when readers stop waiting for it
+        self._first_attempt: Optional[asyncio.Task] = None
+        self._first_attempt_deadline = 0.0
+
+    def start(self) -> None:
+        """Start the background refresh loop (idempotent)."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval_seconds)
+
+    async def refresh(self) -> Dict[str, float]:
+        """Fetch and score news now; concurrent calls share one refresh."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> Dict[str, float]:
+        try:
+            articles = await self.client.fetch_articles(days=self.days)
+            scored = await asyncio.to_thread(self.news_analyzer.score_articles, articles)
+            self.sentiment = self.news_analyzer.get_aggregated_sentiment(scored)
+            self.updated_at = time.monotonic()
+            self.last_error = None
+            logger.info("News sentiment refreshed from {} articles", len(scored))
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning("News sentiment refresh failed, serving last good value: {}", str(e))
+        return self.current()
+
+    def current(self) -> Dict[str, float]:
+        """Return the last good aggregate, or neutral sentiment if none is available yet."""
+        if self.sentiment is None:
+            return self.news_analyzer.get_aggregated_sentiment([])
+        return dict(self.sentiment)
+
+    async def get_sentiment(self) -> Dict[str, float]:
+        """
+        Return the aggregated sentiment without waiting on the upstream.
+
+        Only callers arriving during the first refresh after startup wait for it, all of them
+        together for at most ``initial_wait_seconds``. After that the last good value (or
+        neutral sentiment) is returned at once, even if the first refresh failed; retries are
+        left to the refresh loop.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        if self._first_attempt is None:
+            self._first_attempt = asyncio.ensure_future(self.refresh())
+            self._first_attempt_deadline = loop.time() + self.initial_wait_seconds
+        remaining = self._first_attempt_deadline - loop.time()
+        if not self._first_attempt.done() and remaining > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._first_attempt), remaining)
+            except asyncio.TimeoutError:
+                logger.warning("No news sentiment available yet, using neutral sentiment")
+        return self.current()
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and close the HTTP connection pool."""
+        for task in (self._loop_task, self._refreshing, self._first_attempt):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = None
+        self._refreshing = None
+        self._first_attempt = None
+        await self.client.aclose()
+
+    def status(self) -> Dict[str, Any]:
+        """Return freshness and upstream health information."""
+        return {
+            "age_seconds": time.monotonic() - self.updated_at if self.updated_at is not None else None,
+            "last_error": self.last_error,
+            "circuit_breaker": self.client.breaker.state,
+        }
@@ -0,0 +1,100 @@
+"""
+Async snapshot cache with single-flight coalescing.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class SnapshotCache:
+    """
+    Cache for expensive, immutable snapshots keyed by a data version (e.g. the latest candle timestamp).
+
+    Concurrent misses for the same key are coalesced onto a single computation; every waiter
+    receives the same result. Entries expire after ``ttl_seconds`` and the least recently used
+    entry is evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 4):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get_or_compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key``, computing it with ``factory`` on a miss.
+
+        Args:
+            key: Version key of the snapshot
+            factory: Zero-argument coroutine function producing the snapshot
+
+        Returns:
+            The cached or freshly computed snapshot
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.evictions += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, factory))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+
+        # Shield so a cancelled caller (e.g. a dropped client) does not abort the shared computation
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await factory()
+            self._store(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+
+        # Drop expired entries first, then the least recently used ones
+        for stale_key in [k for k, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl_seconds]:
+            del self._entries[stale_key]
+            self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop all cached snapshots (in-flight computations are left to finish)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,453 @@
+"""
+Out-of-process training jobs with progress reporting and cancellation.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from utils.tensorflow_threads import limit_tensorflow_threads
+
+ACTIVE_STATUSES = ("queued", "running")
+
+class TrainingJobConflict(Exception):
+    """Raised when a different training job is already running."""
+
+@dataclass
+class TrainingJob:
+    """State of one training run, as seen by the web process."""
+
+    id: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    epoch: int = 0
+    loss: Optional[float] = None
+    val_loss: Optional[float] = None
+    history: List[Dict[str, float]] = field(default_factory=list)
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "params": dict(self.params),
+            "epoch": self.epoch,
+            "epochs": self.params.get("epochs"),
+            "loss": self.loss,
+            "val_loss": self.val_loss,
+            "history": list(self.history),
+            "result": dict(self.result),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+def _train(model, params: Dict[str, Any], series: Dict[str, np.ndarray], checkpoint_dir: str, progress) -> Dict[str, Any]:
+    """
+    Fit ``model`` as the job's mode asks and report what it cost
+
+    A "full" job trains fresh weights on the whole series. An "incremental" job loads the base
+    model and fine-tunes it on the candles after its ``trained_until`` plus a replay sample.
+    Its time saved is measured against the last full training when the base model records
+    one, and otherwise against an estimate of a full retraining on the same series, from
+    the per-window cost of its steady-state epochs (the first one also traces the graph).
+    """
+    callbacks = [progress]
+    prices = series["close"]
+    started = time.perf_counter()
+    if params["mode"] == "incremental":
+        model.load_model(params["base_model_path"])
+        base_info = model.training_info or {}
+        trained_until = np.datetime64(params["trained_until"], "ns")
+        new_from = int(np.searchsorted(series["timestamp"], trained_until, side="right"))
+        history, counts = model.fine_tune(
+            prices,
+            new_from,
+            epochs=params["epochs"],
+            validation_split=params["validation_split"],
+            replay_fraction=params["replay_fraction"],
+            learning_rate=params["learning_rate"],
+            patience=params["patience"],
+            checkpoint_dir=checkpoint_dir,
+            callbacks=callbacks,
+        )
+    else:
+        base_info = {}
+        history = model.train(
+            prices,
+            epochs=params["epochs"],
+            validation_split=params["validation_split"],
+            streaming=params["streaming"],
+            shuffle_buffer=params["shuffle_buffer"],
+            prefetch=params["prefetch"],
+            patience=params["patience"],
+            checkpoint_dir=checkpoint_dir,
+            callbacks=callbacks,
+        )
+    wall_seconds = time.perf_counter() - started
+
+    epochs_run = len(history.history.get("loss", []))
+    report = {
+        "mode": params["mode"],
+        "epochs_run": epochs_run,
+        "stopped_early": bool(history.model.stop_training) and epochs_run < params["epochs"],
+        "wall_seconds": round(wall_seconds, 3),
+    }
+    if params["mode"] == "incremental":
+        # A full run trains on every window but the held-out validation tail, for every epoch
+        full_windows = counts["total"] - int(counts["total"] * params["validation_split"])
+        steady = progress.epoch_seconds[1:] or progress.epoch_seconds
+        window_seconds = float(np.median(steady)) / max(1, counts["new"] + counts["replay"]) if steady else 0.0
+        estimated_full_seconds = window_seconds * full_windows * params["epochs"]
+        last_full_seconds = base_info.get("last_full_seconds")
+        baseline = last_full_seconds if last_full_seconds is not None else estimated_full_seconds
+        report.update({
+            "new_windows": counts["new"],
+            "replay_windows": counts["replay"],
+            "estimated_full_seconds": round(estimated_full_seconds, 3),
+            "last_full_seconds": last_full_seconds,
+            "time_saved_seconds": round(baseline - wall_seconds, 3),
+            "speedup": round(baseline / wall_seconds, 2) if wall_seconds > 0 else None,
+        })
+    else:
+        report["last_full_seconds"] = report["wall_seconds"]
+
+    model.training_info = {
+        **report,
+        "trained_until": np.datetime_as_string(series["timestamp"][-1], unit="s"),
+        "base_version": params.get("base_version"),
+    }
+    return report
+
+def _run_training_job(
+    job_id: str,
+    params: Dict[str, Any],
+    series: Dict[str, np.ndarray],
+    output_dir: str,
+    checkpoint_dir: str,
+    events,
+    cancel_event,
+    num_threads: int,
+    niceness: int,
+) -> None:
+    """
+    Worker process entry point: train a model on ``series`` and save it under ``output_dir``.
+
+    Progress is reported on the ``events`` queue; ``cancel_event`` is checked after every batch.
+    The training state is backed up to ``checkpoint_dir`` after every epoch, so a job with the
+    same parameters and data resumes where a crashed one stopped.
+    """
+    if niceness:
+        os.nice(niceness)
+
+    try:
+        # Thread pools are sized when TensorFlow initializes, so the budget is set before importing it
+        limit_tensorflow_threads(num_threads)
+        import tensorflow as tf
+
+        from config.model_config import ModelConfig
+        from models.lstm_model import BitcoinLSTMModel
+
+        class ProgressCallback(tf.keras.callbacks.Callback):
+            def __init__(self):
+                super().__init__()
+                self.epoch_seconds: List[float] = []
+                self._epoch_started = 0.0
+
+            def on_epoch_begin(self, epoch, logs=None):
+                self._epoch_started = time.perf_counter()
+
+            def on_train_batch_end(self, batch, logs=None):
+                if cancel_event.is_set():
+                    self.model.stop_training = True
+
+            def on_epoch_end(self, epoch, logs=None):
+                self.epoch_seconds.append(time.perf_counter() - self._epoch_started)
+                logs = logs or {}
+                events.put({
+                    "type": "epoch",
+                    "epoch": epoch + 1,
+                    "loss": float(logs["loss"]) if "loss" in logs else None,
+                    "val_loss": float(logs["val_loss"]) if "val_loss" in logs else None,
+                })
+
+        events.put({"type": "started", "pid": os.getpid()})
+        model = BitcoinLSTMModel(
+            sequence_length=params["sequence_length"],
+            horizons=params["horizons"],
+            config=ModelConfig.from_dict(params["config"]) if params.get("config") else None,
+        )
+        report = _train(model, params, series, checkpoint_dir, ProgressCallback())
+        if cancel_event.is_set():
+            events.put({"type": "cancelled"})
+            return
+
+        model_path = os.path.join(output_dir, "lstm_model")
+        model.save_model(model_path)
+        result = {"model_path": model_path, "training": report}
+
+        if params.get("tflite"):
+            tflite_path = model_path + ".tflite"
+            size = model.export_tflite(
+                tflite_path, quantization=params.get("tflite_quantization"), representative_data=series["close"]
+            )
+            model.load_tflite(tflite_path)
+            result["tflite"] = {"path": tflite_path, "size": size, "drift": model.check_drift(series["close"])}
+
+        events.put({"type": "completed", "result": result})
+    except Exception as e:
+        events.put({"type": "failed", "error": f"{type(e).__name__}: {e}"})
+
+class TrainingJobManager:
+    """
+    Runs model training in a separate worker process.
+
+    Only one job runs at a time: submitting the same parameters while a job is active returns
+    that job, and different parameters are rejected with ``TrainingJobConflict``. When a job
+    completes, ``on_complete`` is awaited in the web process to deploy the trained model.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        on_complete: Callable[[TrainingJob], Awaitable[None]],
+        num_threads: int = 2,
+        niceness: int = 10,
+        cancel_grace_seconds: float = 10.0,
+        max_finished_jobs: int = 20,
+    ):
+        self.work_dir = work_dir
+        self.on_complete = on_complete
+        self.num_threads = num_threads
+        self.niceness = niceness
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self.max_finished_jobs = max_finished_jobs
+
+        # Spawned workers start from a clean interpreter instead of a fork of the web process
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: Dict[str, TrainingJob] = {}
+        self._processes: Dict[str, Any] = {}
+        self._cancel_events: Dict[str, Any] = {}
+        self._monitors: Dict[str, asyncio.Task] = {}
+        self._checkpoint_dirs: Dict[str, str] = {}
+        self._submit_lock: Optional[asyncio.Lock] = None
+
+    def checkpoint_dir(self, params: Dict[str, Any], series: Dict[str, np.ndarray]) -> str:
+        """
+        Checkpoint location shared by every job with these parameters and training data
+
+        A rerun after a crash resumes from it only while the series still ends at the same
+        candle; on newer data the backed-up weights, epoch counter and scaler would not match.
+        """
+        data_end = str(series["timestamp"][-1]) if len(series["timestamp"]) else None
+        key = hashlib.sha1(
+            json.dumps({"params": params, "data_end": data_end}, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return os.path.join(self.work_dir, "checkpoints", key)
+
+    def _discard_checkpoints(self, keep: Optional[str] = None) -> None:
+        """Delete the checkpoints of earlier jobs, which no new job can resume from."""
+        root = os.path.join(self.work_dir, "checkpoints")
+        if not os.path.isdir(root):
+            return
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def active_job(self) -> Optional[TrainingJob]:
+        return next((job for job in self._jobs.values() if job.active), None)
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[TrainingJob]:
+        return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    async def submit(
+        self,
+        params: Dict[str, Any],
+        load_data: Callable[[], Awaitable[Dict[str, np.ndarray]]],
+    ) -> TrainingJob:
+        """
+        Start a training job, or join the active one if it has the same parameters
+
+        Args:
+            params: Training parameters (mode, epochs, horizons, pipeline settings, ...)
+            load_data: Coroutine factory returning the series to train on: aligned "timestamp"
+                (datetime64[ns]) and "close" arrays
+
+        Returns:
+            The new or already running job
+
+        Raises:
+            TrainingJobConflict: If a job with different parameters is active
+        """
+        self._submit_lock = self._submit_lock or asyncio.Lock()
+        async with self._submit_lock:
+            active = self.active_job()
+            if active is not None:
+                if active.params == params:
+                    logger.info("Training request coalesced into active job {}", active.id)
+                    return active
+                raise TrainingJobConflict(f"Training job {active.id} is already {active.status}")
+
+            series = await load_data()
+            job = TrainingJob(id=uuid.uuid4().hex, params=dict(params))
+            output_dir = os.path.join(self.work_dir, job.id)
+            os.makedirs(output_dir, exist_ok=True)
+            checkpoint_dir = self.checkpoint_dir(job.params, series)
+            # Only one job runs at a time, so any other checkpoint belongs to different data
+            self._discard_checkpoints(keep=checkpoint_dir)
+
+            events = self._context.Queue()
+            cancel_event = self._context.Event()
+            process = self._context.Process(
+                target=_run_training_job,
+                args=(
+                    job.id, job.params, series, output_dir, checkpoint_dir,
+                    events, cancel_event, self.num_threads, self.niceness,
+                ),
+                name=f"training-{job.id[:8]}",
+                daemon=True,
+            )
+            process.start()
+
+            self._jobs[job.id] = job
+            self._processes[job.id] = process
+            self._cancel_events[job.id] = cancel_event
+            self._checkpoint_dirs[job.id] = checkpoint_dir
+            self._monitors[job.id] = asyncio.create_task(self._monitor(job, process, events))
+            self._prune()
+            logger.info("Training job {} started in process {}", job.id, process.pid)
+            return job
+
+    async def _monitor(self, job: TrainingJob, process, events) -> None:
+        """Apply progress events from the worker until it reports a final state or dies."""
+        crashed = False
+        try:
+            while job.active:
+                event = await asyncio.to_thread(self._next_event, events)
+                if event is None:
+                    if not process.is_alive():
+                        # Pick up anything written just before the worker exited
+                        event = self._next_event(events, timeout=0)
+                        if event is None:
+                            crashed = True
+                            self._finish(job, "cancelled" if self._cancel_events[job.id].is_set() else "failed",
+                                         error=f"Training process exited with code {process.exitcode}")
+                            break
+                    else:
+                        continue
+                await self._apply(job, event)
+        finally:
+            await asyncio.to_thread(process.join, self.cancel_grace_seconds)
+            if process.is_alive():
+                process.kill()
+            events.close()
+            shutil.rmtree(os.path.join(self.work_dir, job.id), ignore_errors=True)
+            self._processes.pop(job.id, None)
+            self._monitors.pop(job.id, None)
+            checkpoint_dir = self._checkpoint_dirs.pop(job.id, None)
+            # Keep the checkpoint only for a rerun after a crash; a job that finished, or failed
+            # with an error, has nothing to resume
+            if checkpoint_dir and job.status in ("completed", "failed") and not crashed:
+                shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+    @staticmethod
+    def _next_event(events, timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+        try:
+            return events.get(timeout=timeout) if timeout else events.get_nowait()
+        except queue.Empty:
+            return None
+
+    async def _apply(self, job: TrainingJob, event: Dict[str, Any]) -> None:
+        kind = event["type"]
+        if kind == "started":
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+        elif kind == "epoch":
+            job.epoch, job.loss, job.val_loss = event["epoch"], event["loss"], event["val_loss"]
+            job.history.append({"epoch": job.epoch, "loss": job.loss, "val_loss": job.val_loss})
+        elif kind == "completed":
+            job.result = event["result"]
+            try:
+                await self.on_complete(job)
+            except Exception as e:
+                logger.error("Deploying the model of training job {} failed: {}", job.id, str(e))
+                self._finish(job, "failed", error=f"Deployment failed: {e}")
+                return
+            self._finish(job, "completed")
+        elif kind == "cancelled":
+            self._finish(job, "cancelled")
+        elif kind == "failed":
+            self._finish(job, "failed", error=event["error"])
+
+    def _finish(self, job: TrainingJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        log = logger.info if status == "completed" else logger.warning
+        log("Training job {} {}{}", job.id, status, f": {error}" if error else "")
+
+    async def cancel(self, job_id: str) -> Optional[TrainingJob]:
+        """
+        Ask a job to stop after its current batch; it is killed if it does not within the grace period
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return job
+
+        self._cancel_events[job_id].set()
+        logger.info("Cancellation requested for training job {}", job_id)
+        asyncio.create_task(self._kill_after_grace(job))
+        return job
+
+    async def _kill_after_grace(self, job: TrainingJob) -> None:
+        deadline = time.monotonic() + self.cancel_grace_seconds
+        while job.active and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        process = self._processes.get(job.id)
+        if job.active and process is not None and process.is_alive():
+            logger.warning("Training job {} did not stop in time, terminating it", job.id)
+            process.terminate()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond ``max_finished_jobs``."""
+        finished = [job for job in self.list_jobs() if not job.active]
+        for job in finished[self.max_finished_jobs:]:
+            del self._jobs[job.id]
+            self._cancel_events.pop(job.id, None)
+
+    async def shutdown(self) -> None:
+        """Terminate running workers and wait for their monitors to finish."""
+        for job_id, process in list(self._processes.items()):
+            self._cancel_events[job_id].set()
+            if process.is_alive():
+                process.terminate()
+        monitors = list(self._monitors.values())
+        if monitors:
+            await asyncio.gather(*monitors, return_exceptions=True)
@@ -0,0 +1,245 @@
+"""
+Incremental multi-resolution OHLCV aggregation.
+
+Base candles are folded once into a chain of coarser bars (e.g. 1m -> 5m -> 1h -> 4h -> 1d):
+every level consumes only the bars the level below has just closed, so absorbing a candle
+costs O(levels) and no request ever resamples raw history. Buckets are aligned to the epoch,
+which matches ``DataFrame.resample`` for every resolution that divides a day.
+
+Each level keeps its closed bars in a bounded columnar buffer plus the bar it is still
+filling; reads compose that open bar with the open bars of the finer levels, so the newest
+bar of every resolution always reflects the latest base candle.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CANDLE_RESOLUTIONS
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+_NS_PER_MINUTE = 60 * 10**9
+
+# (bucket start ns, open, high, low, close, volume)
+_Bar = Tuple[int, float, float, float, float, float]
+
+def _merge(first: _Bar, second: _Bar, timestamp: int) -> _Bar:
+    """Combine two consecutive bars into one starting at ``timestamp``."""
+    return (timestamp, first[1], max(first[2], second[2]), min(first[3], second[3]), second[4], first[5] + second[5])
+
+class _BarBuffer:
+    """Bounded append-only columns of closed bars, trimmed to the newest ``max_bars``."""
+
+    def __init__(self, max_bars: int):
+        self.max_bars = max_bars
+        capacity = 2 * max_bars
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((capacity, len(OHLCV_COLUMNS)), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        if len(timestamps) > self.max_bars:
+            timestamps, values = timestamps[-self.max_bars:], values[-self.max_bars:]
+        if self._end + len(timestamps) > len(self._timestamps):
+            # Slide the bars that stay to the front; each bar is moved at most once per max_bars appends
+            keep = min(len(self), self.max_bars - len(timestamps))
+            self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+            self._values[:keep] = self._values[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._timestamps[self._end:self._end + len(timestamps)] = timestamps
+        self._values[self._end:self._end + len(timestamps)] = values
+        self._end += len(timestamps)
+        self._start = max(self._start, self._end - self.max_bars)
+
+    def tail(self, periods: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        start = self._start if periods is None else max(self._start, self._end - periods)
+        return self._timestamps[start:self._end], self._values[start:self._end]
+
+class _Level:
+    """One resolution: closed bars plus the bar currently being filled."""
+
+    def __init__(self, resolution: str, max_bars: int):
+        self.resolution = resolution
+        self.width = CANDLE_RESOLUTIONS[resolution] * _NS_PER_MINUTE
+        self.closed = _BarBuffer(max_bars)
+        self.open_bar: Optional[_Bar] = None
+
+    def update(
+        self, timestamps: np.ndarray, values: np.ndarray, complete_until: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fold finer closed bars into this level
+
+        Args:
+            timestamps: Start times (ns) of the incoming bars, increasing
+            values: Their OHLCV rows, shaped (n, 5)
+            complete_until: End (ns) of the newest base candle; no bar ending at or
+                before it can receive more data
+
+        Returns:
+            The bars this level closed, as (timestamps, values)
+        """
+        if len(timestamps):
+            buckets = timestamps - timestamps % self.width
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            ends = np.r_[starts[1:], len(buckets)]
+            bars = np.empty((len(starts), len(OHLCV_COLUMNS)), dtype=np.float64)
+            bars[:, 0] = values[starts, 0]
+            bars[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+            bars[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+            bars[:, 3] = values[ends - 1, 3]
+            bars[:, 4] = np.add.reduceat(values[:, 4], starts)
+            bar_times = buckets[starts]
+
+            if self.open_bar is not None:
+                if bar_times[0] == self.open_bar[0]:
+                    merged = _merge(self.open_bar, (bar_times[0], *bars[0]), bar_times[0])
+                    bars[0] = merged[1:]
+                else:
+                    bar_times = np.r_[self.open_bar[0], bar_times]
+                    bars = np.vstack([self.open_bar[1:], bars])
+            self.open_bar = (int(bar_times[-1]), *map(float, bars[-1]))
+            closed_times, closed_bars = bar_times[:-1], bars[:-1]
+        else:
+            closed_times = np.empty(0, dtype=np.int64)
+            closed_bars = np.empty((0, len(OHLCV_COLUMNS)), dtype=np.float64)
+
+        if self.open_bar is not None and self.open_bar[0] + self.width <= complete_until:
+            closed_times = np.r_[closed_times, self.open_bar[0]]
+            closed_bars = np.vstack([closed_bars, self.open_bar[1:]])
+            self.open_bar = None
+        self.closed.append(closed_times, closed_bars)
+        return closed_times, closed_bars
+
+class CandleResampler:
+    """
+    Maintains OHLCV bars at every resolution from the base candle interval up to one day.
+
+    Feed base candles with ``append`` as they are ingested (overlapping frames are fine,
+    already-seen candles are skipped) and read any resolution with ``bars``.
+    Thread-safe: ingestion and reads may happen on different worker threads.
+    """
+
+    def __init__(self, base_resolution: str, resolutions: Optional[Sequence[str]] = None, max_bars: int = 1000):
+        """
+        Args:
+            base_resolution: Interval of the candles fed to ``append`` (a key of CANDLE_RESOLUTIONS)
+            resolutions: Resolutions to maintain (defaults to every one at or above the base)
+            max_bars: Closed bars kept per resolution
+        """
+        if base_resolution not in CANDLE_RESOLUTIONS:
+            raise ValueError(f"Unknown resolution {base_resolution}. Must be one of: {', '.join(CANDLE_RESOLUTIONS)}")
+        base_minutes = CANDLE_RESOLUTIONS[base_resolution]
+        resolutions = [
+            resolution for resolution in (resolutions or CANDLE_RESOLUTIONS)
+            if CANDLE_RESOLUTIONS[resolution] >= base_minutes
+        ]
+        resolutions = sorted(set(resolutions) | {base_resolution}, key=CANDLE_RESOLUTIONS.get)
+        for finer, coarser in zip(resolutions[:-1], resolutions[1:]):
+            if CANDLE_RESOLUTIONS[coarser] % CANDLE_RESOLUTIONS[finer]:
+                raise ValueError(f"{coarser} bars cannot be built from {finer} bars")
+
+        self.base_resolution = base_resolution
+        self.base_width = base_minutes * _NS_PER_MINUTE
+        self.levels: List[_Level] = [_Level(resolution, max_bars) for resolution in resolutions]
+        self._by_resolution: Dict[str, int] = {level.resolution: i for i, level in enumerate(self.levels)}
+        self._last_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def resolutions(self) -> List[str]:
+        return [level.resolution for level in self.levels]
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest base candle absorbed, or None before the first one."""
+        return None if self._last_ns is None else pd.Timestamp(self._last_ns)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Absorb base candles newer than the last one seen
+
+        Args:
+            df: DataFrame with 'timestamp' and OHLCV columns, sorted by timestamp
+
+        Returns:
+            Number of base candles absorbed
+        """
+        timestamps = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        with self._lock:
+            start = 0 if self._last_ns is None else int(np.searchsorted(timestamps, self._last_ns, side="right"))
+            if start == len(timestamps):
+                return 0
+            timestamps = timestamps[start:]
+            values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)[start:]
+            self._last_ns = int(timestamps[-1])
+
+            complete_until = self._last_ns + self.base_width
+            for level in self.levels:
+                # Each coarser level only sees the bars the finer one has just closed
+                timestamps, values = level.update(timestamps, values, complete_until)
+            return len(df) - start
+
+    def bars(self, resolution: str, periods: Optional[int] = None, include_partial: bool = True) -> pd.DataFrame:
+        """
+        Return the latest bars of a resolution
+
+        Args:
+            resolution: One of ``resolutions``
+            periods: Number of bars to return (default: every bar kept)
+            include_partial: Include the bar still being filled by the newest base candles
+
+        Returns:
+            DataFrame with 'timestamp' (bar start) and OHLCV columns, oldest first
+
+        Raises:
+            ValueError: If the resolution is not maintained
+        """
+        if resolution not in self._by_resolution:
+            raise ValueError(f"Unsupported resolution {resolution}. Must be one of: {', '.join(self.resolutions)}")
+        index = self._by_resolution[resolution]
+        with self._lock:
+            partial = self._partial_bar(index) if include_partial else None
+            closed_periods = None if periods is None else periods - (partial is not None)
+            timestamps, values = self.levels[index].closed.tail(closed_periods)
+            if partial is not None and periods != 0:
+                timestamps = np.r_[timestamps, partial[0]]
+                values = np.vstack([values, partial[1:]])
+            else:
+                timestamps, values = timestamps.copy(), values.copy()
+
+        data = {"timestamp": timestamps.view("datetime64[ns]")}
+        data.update({column: values[:, i] for i, column in enumerate(OHLCV_COLUMNS)})
+        return pd.DataFrame(data)
+
+    def _partial_bar(self, index: int) -> Optional[_Bar]:
+        """Compose the open bar of a level with the still-open bars of the finer levels."""
+        level = self.levels[index]
+        partial = level.open_bar
+        for finer in reversed(self.levels[:index]):
+            if finer.open_bar is None:
+                continue
+            # Finer open bars hold newer data than coarser ones and always fall in the same bucket
+            bucket = finer.open_bar[0] - finer.open_bar[0] % level.width
+            partial = (bucket, *finer.open_bar[1:]) if partial is None else _merge(partial, finer.open_bar, bucket)
+        return partial
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the number of closed bars and the newest bar start per resolution."""
+        with self._lock:
+            result = {}
+            for i, level in enumerate(self.levels):
+                partial = self._partial_bar(i)
+                timestamps, _ = level.closed.tail(1)
+                newest = partial[0] if partial is not None else (int(timestamps[-1]) if len(timestamps) else None)
+                result[level.resolution] = {
+                    "closed_bars": len(level.closed),
+                    "latest_bar": None if newest is None else pd.Timestamp(newest).isoformat(),
+                    "partial": partial is not None,
+                }
+            return result
@@ -1,7 +1,8 @@
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
-from typing import Optional, Tuple, List
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, Optional, Tuple, List
 
 class DataPreprocessor:
     """
@@ -9,8 +10,14 @@ class DataPreprocessor:
     Includes functionality for scaling data and preparing sequences.
     """
 
-    def __init__(self):
+    def __init__(self, dtype: Optional[np.dtype] = None):
+        """
+        Args:
+            dtype (Optional[np.dtype]): Float type of the scaled data and the sequence arrays
+                (e.g. float32 for a compact pipeline). Sequences default to float64.
+        """
         self.scaler = MinMaxScaler()
+        self.dtype = np.dtype(dtype) if dtype is not None else None
 
     def prepare_sequences(
         self,
@@ -18,22 +25,104 @@ class DataPreprocessor:
         sequence_length: int,
         target_column: str = "close",
         feature_columns: Optional[List[str]] = None,
+        copy: bool = False,
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Convert data into sequences for LSTM.
 
+        The feature block is extracted once as a contiguous float array and the sequences are
+        returned as a strided sliding-window view over it, so no per-window copy is made.
+
         Args:
             data (pd.DataFrame): DataFrame containing the input data (e.g., historical Bitcoin prices).
             sequence_length (int): Number of time steps for the LSTM input sequence.
             target_column (str): The column that contains the target variable (default is 'close').
             feature_columns (Optional[List[str]]): List of columns to use as features. If None, all columns except the target are used.
+            copy (bool): If True, materialize the windows into a new contiguous array instead of a read-only view.
+                Pass True when the caller writes into X.
 
         Returns:
-            Tuple[np.ndarray, np.ndarray]: Input features (X) and target labels (y) as numpy arrays.
+            Tuple[np.ndarray, np.ndarray]: Input features (X) of shape (n - sequence_length, sequence_length, n_features)
+            and target labels (y) as numpy arrays; both are empty when there are at most ``sequence_length`` rows.
 
         Raises:
             ValueError: If the input data is empty, the target column is missing, or feature columns are invalid.
         """
+        features, target = self._extract_arrays(data, target_column, feature_columns, self.dtype or np.float64)
+        if len(features) <= sequence_length:
+            # Too short for a single (window, target) pair
+            return np.empty((0, sequence_length, features.shape[1]), dtype=features.dtype), target[:0].copy()
+
+        X = self.make_windows(features, sequence_length)[: len(features) - sequence_length]
+        y = target[sequence_length:]
+
+        if copy:
+            return np.ascontiguousarray(X), y.copy()
+        return X, y
+
+    def iter_sequence_batches(
+        self,
+        data: pd.DataFrame,
+        sequence_length: int,
+        batch_size: int,
+        target_column: str = "close",
+        feature_columns: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lazily materialize sequences in contiguous batches.
+
+        Only one batch of windows is copied at a time, so peak memory is bounded by
+        ``batch_size * sequence_length * n_features`` instead of the full sequence tensor.
+
+        Args:
+            data (pd.DataFrame): DataFrame containing the input data.
+            sequence_length (int): Number of time steps for the LSTM input sequence.
+            batch_size (int): Number of sequences per yielded batch.
+            target_column (str): The column that contains the target variable (default is 'close').
+            feature_columns (Optional[List[str]]): List of columns to use as features. If None, all columns except the target are used.
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: Contiguous (X, y) batches in chronological order.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive.")
+
+        X, y = self.prepare_sequences(data, sequence_length, target_column, feature_columns)
+        for start in range(0, len(X), batch_size):
+            stop = start + batch_size
+            yield np.ascontiguousarray(X[start:stop]), y[start:stop].copy()
+
+    @staticmethod
+    def make_windows(values: np.ndarray, sequence_length: int) -> np.ndarray:
+        """
+        Build a read-only sliding-window view over the first axis of an array.
+
+        Args:
+            values (np.ndarray): Array of shape (n,) or (n, n_features).
+            sequence_length (int): Window length.
+
+        Returns:
+            np.ndarray: View of shape (n - sequence_length + 1, sequence_length, ...) sharing memory with ``values``.
+
+        Raises:
+            ValueError: If the sequence length is not positive or exceeds the number of rows.
+        """
+        if sequence_length <= 0:
+            raise ValueError("Sequence length must be positive.")
+        if len(values) < sequence_length:
+            raise ValueError(
+                f"Not enough rows ({len(values)}) for sequence length {sequence_length}."
+            )
+
+        windows = sliding_window_view(values, sequence_length, axis=0)
+        # sliding_window_view appends the window axis last; move it next to the batch axis
+        return np.moveaxis(windows, -1, 1)
+
+    @staticmethod
+    def _extract_arrays(
+        data: pd.DataFrame, target_column: str, feature_columns: Optional[List[str]], dtype: np.dtype = np.float64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Validate the inputs and return the feature block and target as contiguous float arrays."""
         if data.empty:
             raise ValueError("Input data is empty.")
 
@@ -48,15 +137,12 @@ class DataPreprocessor:
             if col not in data.columns:
                 raise ValueError(f"Feature column '{col}' not found in the data.")
 
-        X, y = [], []
-        for i in range(len(data) - sequence_length):
-            X.append(data.iloc[i : (i + sequence_length)][feature_columns].values)  # Features
-            y.append(data.iloc[i + sequence_length][target_column])  # Target value
-
-        return np.array(X), np.array(y)
+        features = np.ascontiguousarray(data[feature_columns].to_numpy(dtype=dtype))
+        target = data[target_column].to_numpy(dtype=dtype)
+        return features, target
 
     def scale_data(
-        self, data: pd.DataFrame, columns: Optional[List[str]] = None
+        self, data: pd.DataFrame, columns: Optional[List[str]] = None, copy: bool = True
     ) -> pd.DataFrame:
         """
         Scale the data to [0, 1] range.
@@ -64,6 +150,7 @@ class DataPreprocessor:
         Args:
             data (pd.DataFrame): DataFrame containing the input data.
             columns (Optional[List[str]]): List of columns to scale. If None, scale all numeric columns.
+            copy (bool): If False, scale the columns of ``data`` in place instead of a copy of the frame.
 
         Returns:
             pd.DataFrame: Scaled DataFrame.
@@ -82,8 +169,11 @@ class DataPreprocessor:
             if column not in data.columns:
                 raise ValueError(f"Column '{column}' not found in the data.")
 
-        scaled_data = data.copy()
-        scaled_data[columns] = self.scaler.fit_transform(data[columns])
+        scaled = self.scaler.fit_transform(data[columns])
+        if self.dtype is not None:
+            scaled = scaled.astype(self.dtype, copy=False)
+        scaled_data = data.copy() if copy else data
+        scaled_data[columns] = scaled
 
         return scaled_data
 
@@ -0,0 +1,177 @@
+"""
+Async NewsAPI client with connection pooling, retries and a circuit breaker.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+from loguru import logger
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+def news_query_params(days: int) -> Dict[str, str]:
+    """
+    Build the NewsAPI query for Bitcoin/cryptocurrency articles of the last ``days`` days.
+
+    The API key travels in the ``X-Api-Key`` header so it never ends up in logged URLs.
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    return {
+        'q': 'bitcoin OR cryptocurrency',
+        'from': start_date.strftime('%Y-%m-%d'),
+        'to': end_date.strftime('%Y-%m-%d'),
+        'language': 'en',
+        'sortBy': 'publishedAt',
+    }
+
+class CircuitBreakerOpen(Exception):
+    """Raised when a call is short-circuited because the upstream keeps failing."""
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and rejects calls for
+    ``reset_timeout`` seconds; then a single trial call is let through (half-open) and its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        # Let one trial call through; a trial that never reported back expires after reset_timeout
+        now = time.monotonic()
+        if state == "half_open" and (
+            self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout
+        ):
+            self._trial_started_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class AsyncNewsClient:
+    """Fetches cryptocurrency articles from NewsAPI over a persistent connection pool."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str = NEWS_API_URL,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_connections: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_connections = max_connections
+        self.breaker = breaker or CircuitBreaker()
+        # Custom transport (e.g. httpx.MockTransport or an ASGI stub) instead of the network
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def fetch_articles(self, days: int = 1) -> List[Dict]:
+        """
+        Fetch cryptocurrency news articles
+
+        Args:
+            days: Number of days of news to fetch
+
+        Returns:
+            List of raw NewsAPI articles
+
+        Raises:
+            ValueError: If no API key is configured
+            CircuitBreakerOpen: If the upstream is considered down
+            httpx.HTTPError: If every attempt failed
+            ValueError: If the response body is not JSON
+        """
+        if not self.api_key:
+            raise ValueError("NEWS_API_KEY environment variable not set")
+        if not self.breaker.allow():
+            raise CircuitBreakerOpen("NewsAPI circuit breaker is open")
+
+        params = news_query_params(days)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._get_client().get(
+                    self.base_url, params=params, headers={'X-Api-Key': self.api_key}
+                )
+                response.raise_for_status()
+                try:
+                    articles = response.json().get('articles', [])
+                except ValueError:
+                    # A 200 with a non-JSON body (e.g. a proxy error page) is a failed call too
+                    self.breaker.record_failure()
+                    raise
+                self.breaker.record_success()
+                return articles
+            except httpx.HTTPStatusError as exc:
+                # Client errors other than rate limiting will not succeed on retry
+                if exc.response.status_code < 500 and exc.response.status_code != 429:
+                    self.breaker.record_failure()
+                    raise
+                error = exc
+            except httpx.TransportError as exc:
+                error = exc
+
+            if attempt < self.max_retries:
+                delay = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning("NewsAPI request failed ({}), retrying in {:.2f}s", error, delay)
+                await asyncio.sleep(delay)
+
+        self.breaker.record_failure()
+        raise error
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
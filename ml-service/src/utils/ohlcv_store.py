@@ -0,0 +1,220 @@
+"""
+Append-only columnar OHLCV store with memory-mapped range reads.
+
+Layout::
+
+    <root>/<YYYY-MM>/timestamp.bin   int64 nanoseconds since the epoch (UTC)
+    <root>/<YYYY-MM>/open.bin        float64
+    <root>/<YYYY-MM>/high.bin ...    one raw little-endian file per column
+
+Each monthly partition holds one flat file per column, so appends are plain file appends
+and reads memory-map only the partitions (and rows) a query touches. The timestamp column
+is written last and defines how many rows of a partition are committed. Appends hold an
+exclusive ``flock`` on ``<root>/.lock``, so several processes can share one store.
+"""
+import fcntl
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMN_DTYPES: Dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+VALUE_COLUMNS = [column for column in COLUMN_DTYPES if column != "timestamp"]
+
+_PARTITION_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+_LOCK_FILE = ".lock"
+
+class OHLCVStore:
+    """
+    Persistent OHLCV candles for one instrument, queried by timestamp range.
+
+    Candles must be ingested in timestamp order; rows at or before the last stored
+    timestamp are skipped, so re-ingesting an overlapping window is harmless, including
+    when another process has appended the same window first.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._write_lock = threading.Lock()
+
+    def partitions(self) -> List[str]:
+        """Return the partition names (``YYYY-MM``) in chronological order."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if _PARTITION_PATTERN.match(name))
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the write lock against other threads and, through the lock file, other processes."""
+        os.makedirs(self.root, exist_ok=True)
+        with self._write_lock, open(os.path.join(self.root, _LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, partition: str, column: str) -> str:
+        return os.path.join(self.root, partition, f"{column}.bin")
+
+    def _length(self, partition: str) -> int:
+        try:
+            return os.path.getsize(self._path(partition, "timestamp")) // COLUMN_DTYPES["timestamp"].itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _column(self, partition: str, column: str, length: int) -> np.ndarray:
+        dtype = COLUMN_DTYPES[column]
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._path(partition, column), dtype=dtype, mode="r", shape=(length,))
+
+    def __len__(self) -> int:
+        return sum(self._length(partition) for partition in self.partitions())
+
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Return the timestamp of the newest stored candle, or None if the store is empty."""
+        last = self._last_timestamp_ns()
+        return None if last is None else pd.Timestamp(last)
+
+    def _last_timestamp_ns(self) -> Optional[int]:
+        for partition in reversed(self.partitions()):
+            length = self._length(partition)
+            if length:
+                return int(self._column(partition, "timestamp", length)[-1])
+        return None
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Ingest candles
+
+        Args:
+            df: DataFrame with 'timestamp' and OHLCV columns, sorted by timestamp
+
+        Returns:
+            Number of rows written (rows not newer than the stored data are skipped)
+
+        Raises:
+            ValueError: If columns are missing or timestamps are not strictly increasing
+        """
+        missing = set(COLUMN_DTYPES) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        timestamps = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if len(timestamps) > 1 and not np.all(np.diff(timestamps) > 0):
+            raise ValueError("Timestamps must be strictly increasing")
+
+        with self._exclusive():
+            # Read under the lock: another process may have appended since the caller checked
+            last = self._last_timestamp_ns()
+            start = 0 if last is None else int(np.searchsorted(timestamps, last, side="right"))
+            if start == len(timestamps):
+                return 0
+
+            timestamps = timestamps[start:]
+            values = {column: df[column].to_numpy(dtype=COLUMN_DTYPES[column])[start:] for column in VALUE_COLUMNS}
+            months = timestamps.view("datetime64[ns]").astype("datetime64[M]")
+            boundaries = [0, *(np.flatnonzero(months[1:] != months[:-1]) + 1), len(timestamps)]
+
+            for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+                partition = str(months[lo])
+                os.makedirs(os.path.join(self.root, partition), exist_ok=True)
+                self._truncate_uncommitted(partition)
+                for column in VALUE_COLUMNS:
+                    self._append_column(partition, column, values[column][lo:hi])
+                # Committing the timestamps last makes a partially written append invisible
+                self._append_column(partition, "timestamp", timestamps[lo:hi])
+
+            return len(timestamps)
+
+    def _append_column(self, partition: str, column: str, values: np.ndarray) -> None:
+        with open(self._path(partition, column), "ab") as f:
+            f.write(np.ascontiguousarray(values, dtype=COLUMN_DTYPES[column]).tobytes())
+
+    def _truncate_uncommitted(self, partition: str) -> None:
+        """Drop value rows left behind by an append interrupted before its timestamps were written."""
+        length = self._length(partition)
+        for column in VALUE_COLUMNS:
+            path = self._path(partition, column)
+            size = length * COLUMN_DTYPES[column].itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def read(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        columns: Optional[Sequence[str]] = None,
+        dtype: Optional[np.dtype] = None,
+    ) -> pd.DataFrame:
+        """
+        Return candles with ``start <= timestamp < end``
+
+        Only partitions overlapping the range are opened, and only the matching rows are copied.
+        With ``dtype`` (e.g. float32) the value columns are converted while they are copied.
+        """
+        start_ns = None if start is None else pd.Timestamp(start).value
+        end_ns = None if end is None else pd.Timestamp(end).value
+        first = None if start is None else str(np.datetime64(pd.Timestamp(start).to_datetime64(), "M"))
+        last = None if end is None else str(np.datetime64(pd.Timestamp(end).to_datetime64(), "M"))
+
+        slices = []
+        for partition in self.partitions():
+            if (first is not None and partition < first) or (last is not None and partition > last):
+                continue
+            length = self._length(partition)
+            timestamps = self._column(partition, "timestamp", length)
+            lo = 0 if start_ns is None else int(np.searchsorted(timestamps, start_ns, side="left"))
+            hi = length if end_ns is None else int(np.searchsorted(timestamps, end_ns, side="left"))
+            if hi > lo:
+                slices.append((partition, lo, hi))
+        return self._frame(slices, columns, dtype)
+
+    def tail(
+        self, periods: int, columns: Optional[Sequence[str]] = None, dtype: Optional[np.dtype] = None
+    ) -> pd.DataFrame:
+        """Return the latest ``periods`` candles, opening only the newest partitions."""
+        slices = []
+        remaining = periods
+        for partition in reversed(self.partitions()):
+            if remaining <= 0:
+                break
+            length = self._length(partition)
+            take = min(length, remaining)
+            if take:
+                slices.append((partition, length - take, length))
+                remaining -= take
+        return self._frame(reversed(slices), columns, dtype)
+
+    def _frame(
+        self,
+        slices: Iterable[Tuple[str, int, int]],
+        columns: Optional[Sequence[str]],
+        dtype: Optional[np.dtype] = None,
+    ) -> pd.DataFrame:
+        columns = ["timestamp", *[column for column in (columns or VALUE_COLUMNS) if column != "timestamp"]]
+        chunks: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+        for partition, lo, hi in slices:
+            length = self._length(partition)
+            for column in columns:
+                chunks[column].append(self._column(partition, column, length)[lo:hi])
+
+        data = {}
+        for column, parts in chunks.items():
+            column_dtype = COLUMN_DTYPES[column] if dtype is None or column == "timestamp" else np.dtype(dtype)
+            data[column] = np.concatenate(parts, dtype=column_dtype) if parts else np.empty(0, dtype=column_dtype)
+        data["timestamp"] = data["timestamp"].view("datetime64[ns]")
+        # The arrays are fresh copies already; let the frame take them over instead of copying again
+        return pd.DataFrame(data, copy=False)
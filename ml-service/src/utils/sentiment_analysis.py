@@ -1,9 +1,81 @@
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
-from datetime import datetime, timedelta
+import json
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.news_client import NEWS_API_URL, news_query_params
+
+# Per-process analyzer used by the scoring pool workers
+_worker_sia = None
+
+def _init_worker():
+    global _worker_sia
+    _worker_sia = SentimentIntensityAnalyzer()
+
+def _score_texts(texts: List[str]) -> List[Dict[str, float]]:
+    return [_worker_sia.polarity_scores(text) for text in texts]
+
+class SentimentCache:
+    """LRU cache of polarity scores keyed by a hash of the scored text, optionally persisted to disk"""
+    
+    def __init__(self, max_entries: int = 10_000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Entries set since the last save; with a full cache every set evicts, so the size can't tell
+        self.dirty = 0
+        
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._entries.update(json.load(f))
+            self._evict()
+    
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        scores = self._entries.get(key)
+        if scores is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return scores
+    
+    def set(self, key: str, scores: Dict[str, float]):
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        self.dirty += 1
+        self._evict()
+    
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def save(self):
+        """Write the cache to ``path`` atomically (no-op without a path)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = 0
+    
+    def __len__(self):
+        return len(self._entries)
 
 class NewsAnalyzer:
     def __init__(self):
@@ -15,6 +87,14 @@ class NewsAnalyzer:
         
         self.sia = SentimentIntensityAnalyzer()
         self.news_api_key = os.getenv('NEWS_API_KEY')
+        self.cache = SentimentCache(
+            max_entries=int(os.getenv('SENTIMENT_CACHE_SIZE', '10000')),
+            path=os.getenv('SENTIMENT_CACHE_PATH'),
+        )
+        # Batches with at least this many uncached texts are scored in a process pool
+        self.parallel_threshold = int(os.getenv('SENTIMENT_PARALLEL_THRESHOLD', '500'))
+        self.max_workers = int(os.getenv('SENTIMENT_WORKERS', '0')) or None
+        self._executor: Optional[ProcessPoolExecutor] = None
         
     def get_crypto_news(self, days: int = 1) -> List[Dict]:
         """
@@ -29,41 +109,39 @@ class NewsAnalyzer:
         if not self.news_api_key:
             raise ValueError("NEWS_API_KEY environment variable not set")
             
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        # NewsAPI endpoint
-        url = 'https://newsapi.org/v2/everything'
-        
-        # Parameters for the API request
-        params = {
-            'q': 'bitcoin OR cryptocurrency',
-            'from': start_date.strftime('%Y-%m-%d'),
-            'to': end_date.strftime('%Y-%m-%d'),
-            'language': 'en',
-            'sortBy': 'publishedAt',
-            'apiKey': self.news_api_key
-        }
+        # NewsAPI endpoint and query
+        url = NEWS_API_URL
+        params = news_query_params(days)
         
         try:
-            response = requests.get(url, params=params)
+            response = requests.get(url, params=params, headers={'X-Api-Key': self.news_api_key}, timeout=10)
             response.raise_for_status()
             articles = response.json().get('articles', [])
             
-            # Analyze sentiment for each article
-            analyzed_articles = []
-            for article in articles:
-                sentiment_scores = self.analyze_sentiment(article.get('title', '') + ' ' + article.get('description', ''))
-                article['sentiment_scores'] = sentiment_scores
-                analyzed_articles.append(article)
-                
-            return analyzed_articles
+            return self.score_articles(articles)
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching news: {e}")
             return []
     
+    def score_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Attach sentiment scores to articles; previously seen articles come from the cache
+        
+        Args:
+            articles: Raw NewsAPI articles
+            
+        Returns:
+            The same articles with a 'sentiment_scores' entry
+        """
+        texts = [(article.get('title') or '') + ' ' + (article.get('description') or '') for article in articles]
+        for article, sentiment_scores in zip(articles, self.analyze_batch(texts)):
+            article['sentiment_scores'] = sentiment_scores
+        if self.cache.dirty:
+            self.cache.save()
+        
+        return articles
+    
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """
         Analyze sentiment of text using VADER sentiment analyzer
@@ -74,7 +152,68 @@ class NewsAnalyzer:
         Returns:
             Dictionary containing sentiment scores
         """
-        return self.sia.polarity_scores(text)
+        key = SentimentCache.key(text)
+        scores = self.cache.get(key)
+        if scores is None:
+            scores = self.sia.polarity_scores(text)
+            self.cache.set(key, scores)
+        return scores
+    
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Analyze sentiment of many texts, scoring only those not already cached
+        
+        Large batches of uncached texts are fanned out over a process pool.
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            List of sentiment score dictionaries, in the order of ``texts``
+        """
+        keys = [SentimentCache.key(text) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+        
+        # Score each distinct uncached text once
+        pending = {}
+        for key, text, scores in zip(keys, texts, results):
+            if scores is None:
+                pending.setdefault(key, text)
+        
+        fresh = {}
+        if pending:
+            pending_texts = list(pending.values())
+            if len(pending_texts) >= self.parallel_threshold:
+                scored = self._score_in_pool(pending_texts)
+            else:
+                scored = [self.sia.polarity_scores(text) for text in pending_texts]
+            for key, scores in zip(pending, scored):
+                self.cache.set(key, scores)
+                fresh[key] = scores
+        
+        return [scores if scores is not None else fresh[key] for key, scores in zip(keys, results)]
+    
+    def _score_in_pool(self, texts: List[str]) -> List[Dict[str, float]]:
+        workers = self.max_workers or os.cpu_count() or 1
+        if self._executor is None:
+            # Forking the service process would copy TensorFlow's running threads into the workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        
+        chunk_size = max(1, -(-len(texts) // (workers * 4)))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        return [scores for chunk_scores in self._executor.map(_score_texts, chunks) for scores in chunk_scores]
+    
+    def close(self):
+        """Shut down the scoring pool and persist the cache"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.cache.dirty:
+            self.cache.save()
     
     def get_aggregated_sentiment(self, articles: List[Dict]) -> Dict[str, float]:
         """
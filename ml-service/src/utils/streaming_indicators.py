@@ -0,0 +1,289 @@
+"""
+Incremental (streaming) technical indicators.
+
+Each indicator keeps just enough running state to absorb one new candle in O(1),
+reproducing the pandas_ta definitions used by the batch path in
+``TechnicalIndicators.calculate_indicators``.
+"""
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import REQUIRED_PRICE_COLUMNS, TECHNICAL_FEATURES, TECHNICAL_INDICATORS_CONFIG
+
+NaN = float("nan")
+
+class _EMA:
+    """pandas_ta EMA: SMA-seeded, then ``ewm(span=length, adjust=False)``."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self._seed_sum = 0.0
+        self.value = NaN
+
+    def update(self, x: float) -> float:
+        if self.count < self.length:
+            self.count += 1
+            self._seed_sum += x
+            if self.count == self.length:
+                self.value = self._seed_sum / self.length
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+class _RMA:
+    """pandas_ta RMA: ``ewm(alpha=1/length, min_periods=length)`` with ``adjust=True``."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.count = 0
+        self._numerator = 0.0
+        self._denominator = 0.0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        self._numerator = x + self.decay * self._numerator
+        self._denominator = 1.0 + self.decay * self._denominator
+        return self._numerator / self._denominator if self.count >= self.length else NaN
+
+class _RSI:
+    def __init__(self, length: int):
+        self._gain = _RMA(length)
+        self._loss = _RMA(length)
+        self._prev: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        if self._prev is None:
+            self._prev = close
+            return NaN
+        change = close - self._prev
+        self._prev = close
+        gain = self._gain.update(max(change, 0.0))
+        loss = self._loss.update(min(change, 0.0))
+        denominator = gain + abs(loss)
+        if math.isnan(denominator) or denominator == 0:
+            return NaN
+        return 100.0 * gain / denominator
+
+class _MACD:
+    def __init__(self, fast: int, slow: int, signal: int):
+        self._fast = _EMA(fast)
+        self._slow = _EMA(slow)
+        self._signal = _EMA(signal)
+
+    def update(self, close: float) -> Dict[str, float]:
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        macd = fast - slow
+        if math.isnan(macd):
+            return {"macd": NaN, "signal": NaN, "histogram": NaN}
+        # The signal line starts at the first valid MACD value, as in pandas_ta
+        signal = self._signal.update(macd)
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+class _BollingerBands:
+    """Rolling SMA +/- ``std`` population standard deviations (ddof=0)."""
+
+    def __init__(self, length: int, std: float = 2.0):
+        self.length = length
+        self.std = std
+        self._window: deque = deque()
+        self._shift: Optional[float] = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, close: float) -> Dict[str, float]:
+        if self._shift is None:
+            # Accumulate around the first price to avoid catastrophic cancellation
+            self._shift = close
+        x = close - self._shift
+        self._window.append(x)
+        self._sum += x
+        self._sum_sq += x * x
+        if len(self._window) > self.length:
+            old = self._window.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        if len(self._window) < self.length:
+            return {"upper": NaN, "middle": NaN, "lower": NaN}
+
+        mean = self._sum / self.length
+        deviation = math.sqrt(max(self._sum_sq / self.length - mean * mean, 0.0))
+        middle = mean + self._shift
+        return {
+            "upper": middle + self.std * deviation,
+            "middle": middle,
+            "lower": middle - self.std * deviation,
+        }
+
+class _OBV:
+    def __init__(self):
+        self._prev: Optional[float] = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self._prev is None:
+            sign = 1.0
+        else:
+            sign = (close > self._prev) - (close < self._prev)
+        self._prev = close
+        self.value += sign * volume
+        return self.value
+
+class _Momentum:
+    def __init__(self, length: int):
+        self._window: deque = deque(maxlen=length + 1)
+
+    def update(self, close: float) -> float:
+        self._window.append(close)
+        if len(self._window) < self._window.maxlen:
+            return NaN
+        return close - self._window[0]
+
+class StreamingIndicators:
+    """
+    Stateful engine producing the ``TECHNICAL_FEATURES`` columns one candle at a time.
+
+    Seed it once with history via ``seed`` and then feed each new candle with ``update``
+    (or ``append`` for a frame that may overlap already-seen candles). With ``history_size``,
+    the feature rows of that many latest timestamped candles are kept for ``history``.
+    Thread-safe: candles may be fed and the history read on different threads.
+    """
+
+    def __init__(self, config: Optional[dict] = None, history_size: int = 0):
+        config = config or TECHNICAL_INDICATORS_CONFIG
+        self._ema_lengths = [params["length"] for params in config["ema"]]
+        self._rsi = _RSI(config["rsi"]["length"])
+        self._macd = _MACD(**config["macd"])
+        self._emas = [_EMA(length) for length in self._ema_lengths]
+        self._bbands = _BollingerBands(config["bbands"]["length"])
+        self._obv = _OBV()
+        self._mom = _Momentum(config["mom"]["length"])
+        self._macd_suffix = "{fast}_{slow}_{signal}".format(**config["macd"])
+        self._mom_column = f"MOM_{config['mom']['length']}"
+
+        self.warmup_periods = max(
+            self._ema_lengths + [config["macd"]["slow"] + config["macd"]["signal"] - 1]
+        )
+        self.count = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.latest: Dict[str, float] = {}
+        self._history: deque = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether every indicator has seen enough candles to produce a value."""
+        return self.count >= self.warmup_periods
+
+    def update(self, close: float, volume: float, timestamp: Optional[pd.Timestamp] = None) -> Dict[str, float]:
+        """
+        Absorb one candle and return the latest value of every technical feature.
+
+        Args:
+            close: Closing price of the candle
+            volume: Traded volume of the candle
+            timestamp: Candle timestamp, used by ``append`` to skip already-seen candles
+
+        Returns:
+            Dictionary keyed by ``TECHNICAL_FEATURES`` (NaN while an indicator is warming up)
+        """
+        with self._lock:
+            return self._update(close, volume, timestamp)
+
+    def _update(self, close: float, volume: float, timestamp: Optional[pd.Timestamp]) -> Dict[str, float]:
+        macd = self._macd.update(close)
+        bbands = self._bbands.update(close)
+
+        row = {
+            "rsi": self._rsi.update(close),
+            f"MACD_{self._macd_suffix}": macd["macd"],
+            f"MACDs_{self._macd_suffix}": macd["signal"],
+            f"MACDh_{self._macd_suffix}": macd["histogram"],
+        }
+        for length, ema in zip(self._ema_lengths, self._emas):
+            row[f"EMA_{length}"] = ema.update(close)
+        row["bb_upper"] = bbands["upper"]
+        row["bb_middle"] = bbands["middle"]
+        row["bb_lower"] = bbands["lower"]
+        row["OBV"] = self._obv.update(close, volume)
+        row[self._mom_column] = self._mom.update(close)
+
+        self.count += 1
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+            if self._history.maxlen:
+                self._history.append((timestamp, [row[col] for col in TECHNICAL_FEATURES]))
+        self.latest = row
+        return row
+
+    def append(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed every candle of ``df`` newer than the last one seen.
+
+        Args:
+            df: DataFrame with at least ['timestamp', 'close', 'volume'], sorted by timestamp
+
+        Returns:
+            DataFrame of indicator rows for the newly absorbed candles only
+        """
+        with self._lock:
+            if self.last_timestamp is not None:
+                df = df[df["timestamp"] > self.last_timestamp]
+
+            rows: List[Dict[str, float]] = [
+                self._update(close, volume, timestamp)
+                for timestamp, close, volume in zip(
+                    df["timestamp"], df["close"].tolist(), df["volume"].tolist()
+                )
+            ]
+        return pd.DataFrame(rows, index=df.index, columns=TECHNICAL_FEATURES)
+
+    def seed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Initialise the running state from history.
+
+        Args:
+            df: DataFrame with columns ['timestamp', 'close', 'high', 'low', 'volume']
+
+        Returns:
+            Copy of ``df`` with the technical feature columns added and filled like the batch path
+        """
+        if self.count:
+            raise ValueError("Streaming indicators have already been seeded")
+
+        missing_cols = REQUIRED_PRICE_COLUMNS - set(df.columns)
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        if not df["timestamp"].is_monotonic_increasing:
+            df = df.sort_values("timestamp")
+
+        features = self.append(df).ffill().bfill()
+        return pd.concat([df, features], axis=1)
+
+    def history(self, periods: Optional[int] = None) -> pd.DataFrame:
+        """
+        Return the feature rows of the latest kept candles (at most ``history_size``).
+
+        Returns:
+            DataFrame with 'timestamp' and the ``TECHNICAL_FEATURES`` columns, oldest first
+        """
+        with self._lock:
+            rows = list(self._history)
+        if periods is not None:
+            rows = rows[len(rows) - min(periods, len(rows)):]
+        values = np.array([values for _, values in rows], dtype=np.float64).reshape(len(rows), len(TECHNICAL_FEATURES))
+        df = pd.DataFrame(values, columns=TECHNICAL_FEATURES)
+        df.insert(0, "timestamp", pd.to_datetime([timestamp for timestamp, _ in rows]))
+        return df
+
+    def latest_features(self) -> np.ndarray:
+        """Return the most recent feature row as an array ordered like ``TECHNICAL_FEATURES``."""
+        return np.array([self.latest.get(col, NaN) for col in TECHNICAL_FEATURES], dtype=np.float64)
@@ -1,3 +1,6 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 from loguru import logger
@@ -7,12 +10,13 @@ class TechnicalIndicators:
     """Class for calculating technical indicators for Bitcoin price data."""
     
     @staticmethod
-    def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_indicators(df: pd.DataFrame, dtype: Optional[np.dtype] = None) -> pd.DataFrame:
         """
         Calculate technical indicators for Bitcoin price data.
         
         Args:
             df: DataFrame with columns ['timestamp', 'close', 'high', 'low', 'volume']
+            dtype: Narrow the indicator columns to this float type (e.g. float32)
         
         Returns:
             DataFrame with additional technical indicator columns
@@ -28,6 +32,7 @@ class TechnicalIndicators:
             logger.info("DataFrame sorted by timestamp")
 
         # Apply indicators using pandas_ta strategy
+        price_columns = df.columns
         df.ta.strategy(TECHNICAL_INDICATORS_CONFIG)
 
         # Rename Bollinger Bands columns for consistency
@@ -38,8 +43,14 @@ class TechnicalIndicators:
         }, inplace=True)
 
         # Fill missing values using forward-fill and back-fill
-        df.fillna(method="ffill", inplace=True)
-        df.fillna(method="bfill", inplace=True)
+        if dtype is None:
+            df.fillna(method="ffill", inplace=True)
+            df.fillna(method="bfill", inplace=True)
+        else:
+            # Only indicator columns have gaps; filling and narrowing them one at a time
+            # never holds a second copy of the whole frame
+            for column in df.columns.difference(price_columns, sort=False):
+                df[column] = df[column].ffill().bfill().astype(dtype, copy=False)
 
         logger.info("Technical indicators calculated successfully")
         return df
@@ -0,0 +1,18 @@
+"""
+TensorFlow thread budget for worker processes.
+"""
+import os
+
+def limit_tensorflow_threads(num_threads: int) -> None:
+    """
+    Cap the intra- and inter-op thread pools of TensorFlow in this process.
+
+    Thread pools are sized when TensorFlow initializes, so this must run before anything
+    else in the process imports it; it doubles as a ``ProcessPoolExecutor`` initializer.
+    """
+    for variable in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[variable] = str(num_threads)
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(num_threads)
@@ -6,13 +6,27 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Optional
 
+# Starting prices of the mock series generated for each symbol (others start at 100)
+MOCK_START_PRICES = {
+    "BTC": 50000.0,
+    "ETH": 3000.0,
+    "BNB": 400.0,
+    "SOL": 150.0,
+    "XRP": 0.6,
+    "ADA": 0.5,
+    "DOGE": 0.1,
+    "LTC": 80.0,
+}
+
 def generate_mock_bitcoin_data(
     periods: int = 100,
     start_price: float = 50000,
     volatility: float = 0.02,
     volume_mean: float = 1_000_000,
     volume_std: float = 100_000,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    freq: str = "H",
+    dtype: np.dtype = np.float64,
 ) -> pd.DataFrame:
     """
     Generate mock Bitcoin price data for testing.
@@ -24,6 +38,8 @@ def generate_mock_bitcoin_data(
         volume_mean: Mean trading volume
         volume_std: Standard deviation of trading volume
         end_date: End date for the data (defaults to current time)
+        freq: Candle interval as a pandas frequency string (hourly by default)
+        dtype: Float type of the price and volume columns
         
     Returns:
         DataFrame with mock price data
@@ -32,30 +48,32 @@ def generate_mock_bitcoin_data(
         end_date = datetime.utcnow()
     
     # Generate timestamps
-    timestamps = pd.date_range(end=end_date, periods=periods, freq="H")
+    timestamps = pd.date_range(end=end_date, periods=periods, freq=freq)
     
     # Generate price movements using random walk
     returns = np.random.normal(0, volatility, periods)
     price_multipliers = np.exp(np.cumsum(returns))
     close_prices = start_price * price_multipliers
     
+    # Each candle opens at the previous close
+    open_prices = np.concatenate([[start_price], close_prices[:-1]])
+    
     # Generate high/low prices
     high_prices = close_prices * np.random.uniform(1, 1 + volatility, periods)
     low_prices = close_prices * np.random.uniform(1 - volatility, 1, periods)
     
-    # Ensure high is always higher than low
-    high_prices = np.maximum(high_prices, low_prices)
+    # Ensure high/low bound the open and close
+    high_prices = np.maximum(high_prices, np.maximum(open_prices, close_prices))
+    low_prices = np.minimum(low_prices, np.minimum(open_prices, close_prices))
     
     # Generate trading volumes
     volumes = np.abs(np.random.normal(volume_mean, volume_std, periods))
     
-    return pd.DataFrame({
-        "timestamp": timestamps,
-        "close": close_prices,
-        "high": high_prices,
-        "low": low_prices,
-        "volume": volumes
-    })
+    columns = {"open": open_prices, "close": close_prices, "high": high_prices, "low": low_prices, "volume": volumes}
+    return pd.DataFrame(
+        {"timestamp": timestamps, **{name: values.astype(dtype, copy=False) for name, values in columns.items()}},
+        copy=False,
+    )
 
 def generate_mock_news_data(num_articles: int = 10) -> list:
     """
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other from src/, as they do when the service runs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.constants import CANDLE_RESOLUTIONS
+from utils.candle_resampler import OHLCV_COLUMNS, CandleResampler
+
+AGGREGATIONS = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+def make_candles(base: str, periods: int, seed: int = 0, gap_fraction: float = 0.1) -> pd.DataFrame:
+    """Random base candles starting mid-day, with a fraction of them missing."""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-02-27 13:00", periods=periods, freq=f"{CANDLE_RESOLUTIONS[base]}min")
+    df = pd.DataFrame({"timestamp": timestamps})
+    for column in OHLCV_COLUMNS:
+        df[column] = rng.uniform(1, 100, periods)
+    return df[rng.random(periods) >= gap_fraction].reset_index(drop=True)
+
+def reference_bars(df: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """Bars built from the whole history at once with DataFrame.resample."""
+    bars = (
+        df.set_index("timestamp")
+        .resample(f"{CANDLE_RESOLUTIONS[resolution]}min")
+        .agg(AGGREGATIONS)
+        .dropna(subset=["open"])
+        .reset_index()
+    )
+    return bars[["timestamp", *OHLCV_COLUMNS]]
+
+def random_chunks(df: pd.DataFrame, rng: np.random.Generator, overlap: bool = False):
+    """Split a frame into random-sized chunks, optionally re-sending part of the previous chunk."""
+    start = 0
+    while start < len(df):
+        end = min(len(df), start + int(rng.integers(1, 50)))
+        lo = max(0, start - int(rng.integers(0, 20))) if overlap else start
+        yield df.iloc[lo:end]
+        start = end
+
+def assert_matches_reference(resampler: CandleResampler, df: pd.DataFrame, resolution: str) -> None:
+    expected = reference_bars(df, resolution)
+    bars = resampler.bars(resolution)
+    pd.testing.assert_frame_equal(bars, expected.iloc[-len(bars):].reset_index(drop=True), check_dtype=False)
+
+@pytest.mark.parametrize("base, periods", [("1m", 1440), ("1h", 60 * 24)])
+@pytest.mark.parametrize("overlap", [False, True])
+def test_chunked_feed_matches_resample(base, periods, overlap):
+    df = make_candles(base, periods)
+    resampler = CandleResampler(base, max_bars=10 ** 5)
+    rng = np.random.default_rng(1)
+    for chunk in random_chunks(df, rng, overlap=overlap):
+        resampler.append(chunk)
+        # The newest bar of every resolution follows each chunk, partial or not
+        seen = df[df["timestamp"] <= chunk["timestamp"].iloc[-1]]
+        for resolution in resampler.resolutions:
+            expected = reference_bars(seen, resolution).iloc[-1]
+            latest = resampler.bars(resolution, periods=1).iloc[0]
+            assert latest["timestamp"] == expected["timestamp"]
+            np.testing.assert_allclose(latest[OHLCV_COLUMNS].to_numpy(float), expected[OHLCV_COLUMNS].to_numpy(float))
+
+    assert resampler.last_timestamp == df["timestamp"].iloc[-1]
+    for resolution in resampler.resolutions:
+        assert len(resampler.bars(resolution)) == len(reference_bars(df, resolution))
+        assert_matches_reference(resampler, df, resolution)
+
+def test_partial_bar_is_excluded_on_request():
+    df = make_candles("1h", 24 * 10 + 5, gap_fraction=0)
+    resampler = CandleResampler("1h")
+    resampler.append(df)
+
+    closed = resampler.bars("1d", include_partial=False)
+    expected = reference_bars(df, "1d")
+    # The last day holds only 5 of its 24 candles
+    pd.testing.assert_frame_equal(closed, expected.iloc[:-1].reset_index(drop=True), check_dtype=False)
+    assert resampler.bars("1d", periods=3)["timestamp"].tolist() == expected["timestamp"].iloc[-3:].tolist()
+    assert resampler.stats()["1d"]["partial"]
+
+def test_buffer_wraps_around_past_max_bars():
+    max_bars = 7
+    df = make_candles("1h", 24 * 30)
+    resampler = CandleResampler("1h", max_bars=max_bars)
+    rng = np.random.default_rng(2)
+    for chunk in random_chunks(df, rng):
+        resampler.append(chunk)
+        seen = df[df["timestamp"] <= chunk["timestamp"].iloc[-1]]
+        for resolution in resampler.resolutions:
+            assert_matches_reference(resampler, seen, resolution)
+
+    for resolution in resampler.resolutions:
+        assert len(resampler.levels[resampler.resolutions.index(resolution)].closed) == max_bars
+        # max_bars closed bars plus the one still filling at most
+        assert max_bars <= len(resampler.bars(resolution)) <= max_bars + 1
+
+def test_single_chunk_larger_than_max_bars():
+    df = make_candles("1h", 500, gap_fraction=0)
+    resampler = CandleResampler("1h", resolutions=["1h", "4h"], max_bars=10)
+    resampler.append(df)
+    for resolution in resampler.resolutions:
+        assert_matches_reference(resampler, df, resolution)
+
+def test_rejects_unknown_and_unmaintained_resolutions():
+    with pytest.raises(ValueError):
+        CandleResampler("2h")
+    with pytest.raises(ValueError):
+        CandleResampler("1h").bars("5m")
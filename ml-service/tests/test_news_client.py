@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from services.sentiment_refresher import SentimentRefresher
+from utils import news_client
+from utils.news_client import AsyncNewsClient, CircuitBreaker, CircuitBreakerOpen
+
+ARTICLES = [{"title": "Bitcoin rallies", "description": "Markets are up"}]
+
+class StubUpstream:
+    """NewsAPI stand-in answering with a scripted sequence of responses (the last one repeats)."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return response() if callable(response) else response
+
+def ok(articles=ARTICLES):
+    return lambda: httpx.Response(200, json={"status": "ok", "articles": articles})
+
+def status(code):
+    return lambda: httpx.Response(code, json={"status": "error"})
+
+def make_client(upstream, **kwargs):
+    kwargs.setdefault("backoff_base", 0)
+    return AsyncNewsClient("test-key", transport=httpx.MockTransport(upstream), **kwargs)
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the backoff delays instead of waiting for them."""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(news_client.asyncio, "sleep", sleep)
+    return delays
+
+@pytest.mark.parametrize("code", [500, 503, 429])
+def test_retries_server_errors_and_rate_limits_with_backoff(sleeps, code):
+    upstream = StubUpstream(status(code), status(code), ok())
+    client = make_client(upstream, backoff_base=1.0)
+
+    assert asyncio.run(client.fetch_articles()) == ARTICLES
+    assert len(upstream.requests) == 3
+    # Exponential backoff with +-50% jitter: ~1s then ~2s
+    assert 0.5 <= sleeps[0] <= 1.5
+    assert 1.0 <= sleeps[1] <= 3.0
+    assert client.breaker.state == "closed"
+    assert upstream.requests[0].headers["X-Api-Key"] == "test-key"
+
+def test_gives_up_after_max_retries(sleeps):
+    upstream = StubUpstream(status(503))
+    client = make_client(upstream, max_retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.fetch_articles())
+    assert len(upstream.requests) == 3
+    assert client.breaker.failures == 1
+
+@pytest.mark.parametrize("code", [400, 401, 404])
+def test_does_not_retry_other_client_errors(sleeps, code):
+    upstream = StubUpstream(status(code), ok())
+    client = make_client(upstream)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.fetch_articles())
+    assert len(upstream.requests) == 1
+    assert sleeps == []
+    assert client.breaker.failures == 1
+
+def test_non_json_body_counts_as_a_failure():
+    upstream = StubUpstream(lambda: httpx.Response(200, text="<html>gateway</html>"))
+    client = make_client(upstream)
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.fetch_articles())
+    assert client.breaker.failures == 1
+
+def test_breaker_opens_then_half_opens_then_closes(sleeps):
+    upstream = StubUpstream(status(503), status(503), ok())
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    client = make_client(upstream, max_retries=0, breaker=breaker)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.fetch_articles()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitBreakerOpen):
+            await client.fetch_articles()
+        assert len(upstream.requests) == 2
+
+        time.sleep(0.06)
+        assert breaker.state == "half_open"
+        assert await client.fetch_articles() == ARTICLES
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+def test_failed_half_open_trial_reopens_the_breaker(sleeps):
+    upstream = StubUpstream(status(503))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = make_client(upstream, max_retries=0, breaker=breaker)
+
+    async def scenario():
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_articles()
+        time.sleep(0.06)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_articles()
+        assert breaker.state == "open"
+
+    asyncio.run(scenario())
+
+class StubAnalyzer:
+    """Scores every article with the same compound value."""
+
+    def score_articles(self, articles):
+        return [{**article, "sentiment_scores": {"compound": 0.5}} for article in articles]
+
+    def get_aggregated_sentiment(self, articles):
+        if not articles:
+            return {"compound": 0}
+        return {"compound": sum(a["sentiment_scores"]["compound"] for a in articles) / len(articles)}
+
+def test_refresher_serves_last_good_value_while_upstream_is_down(sleeps):
+    upstream = StubUpstream(ok(), status(503))
+    refresher = SentimentRefresher(StubAnalyzer(), make_client(upstream, max_retries=1))
+
+    async def scenario():
+        first = await refresher.refresh()
+        assert first == {"compound": 0.5}
+        assert refresher.last_error is None
+
+        assert await refresher.refresh() == first
+        assert refresher.last_error is not None
+        assert refresher.current() == first
+        await refresher.client.aclose()
+
+    asyncio.run(scenario())
+
+def test_refresher_is_neutral_before_any_good_value(sleeps):
+    refresher = SentimentRefresher(StubAnalyzer(), make_client(StubUpstream(status(503)), max_retries=0))
+
+    async def scenario():
+        assert await refresher.refresh() == {"compound": 0}
+        assert refresher.status()["age_seconds"] is None
+        await refresher.client.aclose()
+
+    asyncio.run(scenario())
+
+def test_only_the_first_refresh_is_waited_for():
+    upstream = StubUpstream(status(503))
+    refresher = SentimentRefresher(
+        StubAnalyzer(), make_client(upstream, max_retries=0), interval_seconds=300, initial_wait_seconds=1.0
+    )
+
+    async def scenario():
+        assert await refresher.get_sentiment() == {"compound": 0}
+        # Later requests neither wait nor hit the upstream again; retrying is the loop's job
+        for _ in range(5):
+            assert await refresher.get_sentiment() == {"compound": 0}
+        assert len(upstream.requests) == 1
+        await refresher.stop()
+
+    asyncio.run(scenario())
+
+def test_readers_stop_waiting_for_a_hung_first_refresh():
+    requests = []
+
+    async def hang(request):
+        requests.append(request)
+        await asyncio.Event().wait()
+
+    client = AsyncNewsClient("test-key", transport=httpx.MockTransport(hang))
+    refresher = SentimentRefresher(StubAnalyzer(), client, interval_seconds=300, initial_wait_seconds=0.1)
+
+    async def scenario():
+        started = time.monotonic()
+        first = await asyncio.gather(*(refresher.get_sentiment() for _ in range(3)))
+        assert first == [{"compound": 0}] * 3
+        assert time.monotonic() - started < 0.5
+
+        started = time.monotonic()
+        assert await refresher.get_sentiment() == {"compound": 0}
+        assert time.monotonic() - started < 0.05
+        assert len(requests) == 1
+        await refresher.stop()
+
+    asyncio.run(scenario())
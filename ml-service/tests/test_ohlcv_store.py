@@ -0,0 +1,84 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from utils.ohlcv_store import COLUMN_DTYPES, VALUE_COLUMNS, OHLCVStore
+
+def candles(start: str, periods: int, value: float = 1.0) -> pd.DataFrame:
+    """Hourly candles whose every value column holds ``value``."""
+    df = pd.DataFrame({"timestamp": pd.date_range(start, periods=periods, freq="H")})
+    for column in VALUE_COLUMNS:
+        df[column] = value
+    return df
+
+def append_overlapping_windows(root: str, writer: int) -> None:
+    # Like workers syncing the same hours, every writer appends the same growing windows
+    store = OHLCVStore(root)
+    for end in range(10, 500, 10):
+        store.append(candles("2024-01-31", end, value=writer))
+
+def test_concurrent_processes_append_each_candle_once(tmp_path):
+    root = str(tmp_path / "ohlcv")
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=append_overlapping_windows, args=(root, i)) for i in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert all(writer.exitcode == 0 for writer in writers)
+
+    store = OHLCVStore(root)
+    df = store.read()
+    pd.testing.assert_series_equal(
+        df["timestamp"], pd.Series(pd.date_range("2024-01-31", periods=490, freq="H"), name="timestamp")
+    )
+    # No row mixes the columns of different writers
+    values = df[VALUE_COLUMNS].to_numpy()
+    assert (values == values[:, :1]).all()
+    # Value columns hold exactly the committed rows, with no torn tail
+    for partition in store.partitions():
+        rows = store._length(partition)
+        for column in VALUE_COLUMNS:
+            assert (tmp_path / "ohlcv" / partition / f"{column}.bin").stat().st_size == rows * COLUMN_DTYPES[column].itemsize
+
+def test_uncommitted_rows_are_invisible_and_truncated_on_next_append(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append(candles("2024-03-01", 5))
+    # An append that died after writing a value column but before the timestamps
+    with open(tmp_path / "2024-03" / "close.bin", "ab") as f:
+        f.write(np.full(3, 99.0).tobytes())
+
+    assert len(store) == 5
+    assert (store.read()["close"] == 1.0).all()
+
+    assert store.append(candles("2024-03-01 05:00", 2, value=2.0)) == 2
+    assert store.read()["close"].tolist() == [1.0] * 5 + [2.0] * 2
+    assert (tmp_path / "2024-03" / "close.bin").stat().st_size == 7 * COLUMN_DTYPES["close"].itemsize
+
+def test_reads_span_partitions(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    df = candles("2024-01-15", 24 * 60)
+    df["close"] = np.arange(len(df), dtype=float)
+    store.append(df)
+    assert store.partitions() == ["2024-01", "2024-02", "2024-03"]
+
+    start, end = pd.Timestamp("2024-01-31 20:00"), pd.Timestamp("2024-03-01 02:00")
+    window = store.read(start, end)
+    expected = df[(df["timestamp"] >= start) & (df["timestamp"] < end)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(window, expected)
+
+    # Larger than the newest partition, which holds 14 days
+    tail = store.tail(24 * 20, columns=["close"], dtype=np.float32)
+    assert tail["timestamp"].tolist() == df["timestamp"].iloc[-24 * 20:].tolist()
+    assert tail["close"].dtype == np.float32
+    np.testing.assert_array_equal(tail["close"], df["close"].iloc[-24 * 20:])
+    assert len(store.tail(10 ** 6)) == len(df)
+
+def test_overlapping_and_stale_appends_are_skipped(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    assert store.append(candles("2024-01-01", 10)) == 10
+    assert store.append(candles("2024-01-01 05:00", 10, value=2.0)) == 5
+    assert store.append(candles("2024-01-01", 3, value=3.0)) == 0
+    assert store.read()["close"].tolist() == [1.0] * 10 + [2.0] * 5
+    assert store.last_timestamp() == pd.Timestamp("2024-01-01 14:00")
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from services.prediction_cache import LocalBackend, PredictionCache, RedisBackend
+
+@pytest.fixture
+def server():
+    """One fake Redis server shared by every client, like a Redis shared by several workers."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+def redis_client(server):
+    import fakeredis
+
+    return fakeredis.FakeAsyncRedis(server=server)
+
+class UnreachableRedis:
+    """Redis client whose every command fails to connect."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def _fail(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("Connection refused")
+
+    get = set = eval = _fail
+
+    async def aclose(self):
+        pass
+
+class CountingFactory:
+    """Slow computation recording how many times it ran."""
+
+    def __init__(self, delay: float = 0.05):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"price": 42.0}
+
+def test_concurrent_misses_in_one_worker_compute_once(server):
+    cache = PredictionCache(redis_client(server))
+    factory = CountingFactory()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_compute("v1:24h:t0", factory) for _ in range(20)))
+
+    assert asyncio.run(scenario()) == [{"price": 42.0}] * 20
+    assert factory.calls == 1
+    assert cache.stats()["coalesced"] == 19
+
+def test_concurrent_misses_across_workers_compute_once(server):
+    workers = [PredictionCache(redis_client(server), poll_interval_seconds=0.01) for _ in range(4)]
+    factory = CountingFactory()
+
+    async def scenario():
+        return await asyncio.gather(*(
+            worker.get_or_compute("v1:24h:t0", factory) for worker in workers for _ in range(5)
+        ))
+
+    assert asyncio.run(scenario()) == [{"price": 42.0}] * 20
+    assert factory.calls == 1
+    assert sum(worker.stats()["waited_for_other_worker"] for worker in workers) == 3
+
+def test_cached_result_is_served_without_computing(server):
+    factory = CountingFactory(delay=0)
+
+    async def scenario():
+        await PredictionCache(redis_client(server)).get_or_compute("key", factory)
+        return await PredictionCache(redis_client(server)).get_or_compute("key", factory)
+
+    assert asyncio.run(scenario()) == {"price": 42.0}
+    assert factory.calls == 1
+
+def test_release_script_keeps_another_holders_lock(server):
+    pytest.importorskip("lupa")
+    client = redis_client(server)
+    backend = RedisBackend(client)
+
+    async def scenario():
+        await backend.set("lock", "ours", px=10_000, nx=True)
+        # Our lock expired and another worker took it
+        await client.set("lock", "theirs", px=10_000)
+        await backend.release("lock", "ours")
+        assert await backend.get("lock") == "theirs"
+
+        await backend.release("lock", "theirs")
+        assert await backend.get("lock") is None
+
+    asyncio.run(scenario())
+
+def test_sub_second_ttl_expires(server):
+    client = redis_client(server)
+    backend = RedisBackend(client)
+
+    async def scenario():
+        await backend.set("key", "value", ex=0.25)
+        assert 0 < await client.pttl("key") <= 250
+        await asyncio.sleep(0.3)
+        assert await backend.get("key") is None
+
+    asyncio.run(scenario())
+
+def test_local_backend_release_keeps_another_holders_lock():
+    backend = LocalBackend()
+
+    async def scenario():
+        await backend.set("lock", "theirs", px=10_000, nx=True)
+        await backend.release("lock", "ours")
+        assert await backend.get("lock") == "theirs"
+
+    asyncio.run(scenario())
+
+def test_falls_back_to_local_backend_when_redis_is_unreachable():
+    client = UnreachableRedis()
+    cache = PredictionCache(client)
+    factory = CountingFactory(delay=0)
+
+    async def scenario():
+        results = [await cache.get_or_compute("key", factory) for _ in range(5)]
+        await cache.close()
+        return results
+
+    assert asyncio.run(scenario()) == [{"price": 42.0}] * 5
+    # Computed once and then served from the in-process backend
+    assert factory.calls == 1
+    stats = cache.stats()
+    assert stats["hits"] == 4
+    # The breaker opens after three failures, so later calls skip Redis entirely
+    assert stats["backend_errors"] == client.calls == 3
+    assert stats["circuit_breaker"] == "open"
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.constants import TECHNICAL_FEATURES
+from utils.streaming_indicators import StreamingIndicators
+from utils.test_data_generator import generate_mock_bitcoin_data
+
+def ema(close: pd.Series, length: int) -> pd.Series:
+    """pandas_ta EMA: the first value is the SMA of the first ``length`` prices."""
+    seeded = close.copy()
+    seeded.iloc[: length - 1] = np.nan
+    seeded.iloc[length - 1] = close.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean()
+
+def rma(series: pd.Series, length: int) -> pd.Series:
+    return series.ewm(alpha=1 / length, min_periods=length).mean()
+
+def reference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """The technical features computed over the whole series with pandas ewm/rolling."""
+    close, volume = df["close"], df["volume"]
+    change = close.diff()
+    gain = rma(change.clip(lower=0), 14)
+    loss = rma(change.clip(upper=0), 14).abs()
+    macd = ema(close, 12) - ema(close, 26)
+    signal = ema(macd.dropna(), 9).reindex(macd.index)
+    middle = close.rolling(20).mean()
+    deviation = close.rolling(20).std(ddof=0)
+
+    out = pd.DataFrame(index=df.index)
+    out["rsi"] = 100 * gain / (gain + loss)
+    out["MACD_12_26_9"] = macd
+    out["MACDs_12_26_9"] = signal
+    out["MACDh_12_26_9"] = macd - signal
+    for length in (9, 21, 50, 200):
+        out[f"EMA_{length}"] = ema(close, length)
+    out["bb_upper"] = middle + 2 * deviation
+    out["bb_middle"] = middle
+    out["bb_lower"] = middle - 2 * deviation
+    out["OBV"] = (np.sign(change).fillna(1) * volume).cumsum()
+    out["MOM_10"] = close.diff(10)
+    return out[TECHNICAL_FEATURES]
+
+@pytest.fixture(scope="module")
+def candles():
+    return generate_mock_bitcoin_data(periods=1000)
+
+@pytest.mark.parametrize("column", TECHNICAL_FEATURES)
+def test_streamed_features_match_reference(candles, column):
+    engine = StreamingIndicators()
+    streamed = engine.append(candles)
+    reference = reference_indicators(candles)
+
+    # Every indicator produces values from warm-up on, and before that only where the reference does
+    warm = slice(engine.warmup_periods, None)
+    np.testing.assert_allclose(streamed[column].to_numpy()[warm], reference[column].to_numpy()[warm], rtol=1e-9)
+    np.testing.assert_array_equal(streamed[column].isna(), reference[column].isna())
+
+def test_seeded_engine_matches_streaming_every_candle(candles):
+    history, ticks = candles.iloc[:800], candles.iloc[800:]
+    streamed = StreamingIndicators().append(candles)
+
+    engine = StreamingIndicators()
+    engine.seed(history)
+    for close, volume in zip(ticks["close"], ticks["volume"]):
+        engine.update(close, volume)
+
+    np.testing.assert_allclose(engine.latest_features(), streamed[TECHNICAL_FEATURES].to_numpy()[-1], rtol=1e-9)
+
+def test_history_keeps_the_latest_rows(candles):
+    engine = StreamingIndicators(history_size=50)
+    engine.append(candles.iloc[:600])
+    # Overlapping candles are skipped and do not enter the history twice
+    engine.append(candles.iloc[550:])
+    streamed = StreamingIndicators().append(candles)
+
+    history = engine.history()
+    assert history["timestamp"].tolist() == candles["timestamp"].iloc[-50:].tolist()
+    np.testing.assert_allclose(history[TECHNICAL_FEATURES].to_numpy(), streamed.to_numpy()[-50:], rtol=1e-9)
+    assert engine.history(10)["timestamp"].tolist() == candles["timestamp"].iloc[-10:].tolist()
+    assert engine.history(0).empty